@@ -0,0 +1,251 @@
+'''
+最大流相关代码的固定种子自检
+
+1. 随机小网络上，Gomory-Hu 割树及其增量更新（GomoryHuTree.updated）的每一对查询结果
+   与 Edmonds-Karp 逐对求解的结果一致；
+2. 62 节点系统上，可转移负荷表与逐对 Edmonds-Karp 一致；
+   update_node_power、apply_switching 增量更新后的结果与对修改后的数据重新构建的分析器一致；
+   只给端点、缺少边属性的新增线路被拒绝且分析器保持原状；原分析器修改节点负荷、做开关操作后，之前派生的场景不受影响；
+3. 62 节点系统上（随机设置分布式能源节点，含阻抗为0的线路），transferable_load_curves 在随机取值和拐点处
+   与把 dg_capacity 设为该值后 max_transferable_load 的结果一致。
+
+用法（在仓库根目录下运行，同 problem1~4）: python 深圳杯C题/check_maxflow.py [--seed 0] [--trials 100]，任一检查不通过时以非零状态退出
+'''
+import argparse
+import copy
+import random
+import sys
+
+import numpy as np
+from loguru import logger
+
+from utils.RiskAnalyzer import RiskAnalyzer
+from utils.maxflow import GomoryHuTree, ResidualNetwork
+from utils.topology import CSRTopology
+from utils.data_loder import edges_info, nodes_info
+
+
+def assert_close(actual, expected, what):
+    """比较两个数值、数组或字典（浮点误差范围内），不一致时抛出 AssertionError"""
+    if isinstance(expected, dict):
+        assert set(actual) == set(expected), f"{what}: 键不一致 {set(actual) ^ set(expected)}"
+        for key in expected:
+            assert_close(actual[key], expected[key], f"{what}[{key}]")
+        return
+    if not np.allclose(actual, expected, rtol=1e-9, atol=1e-9):
+        raise AssertionError(f"{what}: 得到 {actual}，应为 {expected}")
+
+
+# ==================== 割树 ====================
+
+def random_network(rng, n):
+    """随机生成 n 个节点的无向网络，约两成的边为联络线，返回 (拓扑, 各边容量)"""
+    edges = {}
+    for _ in range(rng.randint(1, 3 * n)):
+        u, v = rng.sample(range(n), 2)
+        edges.setdefault((min(u, v), max(u, v)), {'length': 1, 'type': '馈线间联络线' if rng.random() < 0.2 else '馈线'})
+    capacity = [float(rng.randint(1, 20)) if rng.random() < 0.5 else rng.uniform(0, 10) for _ in edges]
+    topology = CSRTopology({str(i): {} for i in range(n)}, [{edge: info} for edge, info in edges.items()])
+    return topology, capacity
+
+
+def available_capacities(topology, capacity, use_blocked):
+    """各对端点之间可用的总容量（同 RiskAnalyzer._available_capacities）"""
+    totals = {}
+    for u, v, tie, value in zip(topology.edge_u.tolist(), topology.edge_v.tolist(),
+                                topology.tie_line.tolist(), capacity):
+        if tie and not use_blocked:
+            continue
+        key = (u, v) if u <= v else (v, u)
+        totals[key] = totals.get(key, 0.0) + value
+    return totals
+
+
+def modify(rng, topology, capacity):
+    """随机删除、新增线路或改变容量，返回修改后的 (拓扑, 各边容量)，节点不变"""
+    n = topology.num_nodes
+    records = [{edge: {'length': 1, 'type': '馈线间联络线' if tie else '馈线'}}
+               for edge, tie in zip(topology.edge_keys, topology.tie_line.tolist())]
+    capacity = list(capacity)
+    for _ in range(rng.randint(1, 2)):
+        action = rng.choice(('remove', 'add', 'scale'))
+        if action == 'remove' and records:
+            position = rng.randrange(len(records))
+            del records[position], capacity[position]
+        elif action == 'add':
+            u, v = rng.sample(range(n), 2)
+            records.append({(u, v): {'length': 1, 'type': '馈线'}})
+            capacity.append(float(rng.randint(1, 20)))
+        elif records:
+            position = rng.randrange(len(records))
+            capacity[position] *= rng.choice((0.5, 2.0))
+    return CSRTopology({str(i): {} for i in range(n)}, records), capacity
+
+
+def assert_tree_matches(tree, network, use_blocked, what):
+    """割树对每一对节点的查询结果与 Edmonds-Karp 逐对求解一致"""
+    n = network.topology.num_nodes
+    for s in range(n):
+        for t in range(s + 1, n):
+            assert_close(tree.max_flow(s, t), network.edmonds_karp(s, t, use_blocked), f"{what} {s} -> {t}")
+
+
+def check_cut_trees(rng, trials):
+    """随机网络上检查割树的构建和增量更新"""
+    updates = 0
+    for trial in range(trials):
+        n = rng.randint(2, 12)
+        topology, capacity = random_network(rng, n)
+        network = ResidualNetwork(topology, capacity, blocked_edges=topology.tie_line,
+                                  method=ResidualNetwork.METHODS[trial % len(ResidualNetwork.METHODS)])
+        new_topology, new_capacity = modify(rng, topology, capacity)
+        new_network = ResidualNetwork(new_topology, new_capacity, blocked_edges=new_topology.tie_line,
+                                      method=network.method)
+        for use_blocked in (False, True):
+            tree = GomoryHuTree(network, use_blocked=use_blocked)
+            assert_tree_matches(tree, network, use_blocked, f"第 {trial} 个网络的割树")
+
+            old = available_capacities(topology, capacity, use_blocked)
+            new = available_capacities(new_topology, new_capacity, use_blocked)
+            changes = [(u, v, new.get((u, v), 0.0) - old.get((u, v), 0.0)) for u, v in sorted(set(old) | set(new))
+                       if new.get((u, v), 0.0) != old.get((u, v), 0.0)]
+            updated, _ = tree.updated(new_network, changes)
+            assert_tree_matches(updated, new_network, use_blocked, f"第 {trial} 个网络增量更新后的割树")
+            updates += 1
+    print(f"割树: {trials} 个随机网络，{updates} 次增量更新，与 Edmonds-Karp 一致")
+
+
+# ==================== 分析器 ====================
+
+def snapshot(analyzer):
+    """分析器中由最大流和潮流得到的结果"""
+    return {
+        'metrics': analyzer.comprehensive_risk_analysis(),
+        'power_flow': analyzer.calculate_power_flow_simple(),
+        'table': analyzer.transferable_load_table(),
+        'table_with_tie': analyzer.transferable_load_table((1, 1)),
+        # 只比较电流值：增量更新的浮点误差可能改变电流并列线路的先后
+        'critical_currents': np.array([value for _, value in analyzer.get_critical_lines(10)]),
+    }
+
+
+def assert_table_matches(analyzer):
+    """可转移负荷表与在残量网络上逐对 Edmonds-Karp 求解的结果一致"""
+    topology = analyzer.topology
+    network = analyzer.flow_network()
+    sources = [topology.index_of(substation) for substation in analyzer.substations]
+    for use_tie in ((0, 0), (1, 1)):
+        table = analyzer.transferable_load_table(use_tie)
+        for row in range(topology.num_nodes):
+            for column, s in enumerate(sources):
+                expected = 0.0 if s == row else network.edmonds_karp(s, row, use_tie != (0, 0))
+                assert_close(table[row, column], expected, f"可转移负荷表 {topology.node_ids[row]}/{column}")
+
+
+def check_analyzer(rng, steps):
+    """62 节点系统上检查可转移负荷表和增量更新"""
+    current_nodes = copy.deepcopy(nodes_info)
+    analyzer = RiskAnalyzer(copy.deepcopy(current_nodes), copy.deepcopy(edges_info))
+    assert_table_matches(analyzer)
+    snapshot(analyzer)
+
+    offline = {}
+    for step in range(steps):
+        if rng.random() < 0.5:
+            node_id = rng.choice(list(current_nodes))
+            power = rng.choice((0.0, rng.uniform(0, 2000), 5000.0))
+            analyzer.update_node_power(node_id, power)
+            current_nodes[node_id]['power'] = power
+            what = f"第 {step} 步 update_node_power({node_id}, {power:.1f})"
+        elif offline and rng.random() < 0.5:
+            edge = rng.choice(sorted(offline))
+            analyzer.apply_switching(add=[(*edge, offline.pop(edge))])
+            what = f"第 {step} 步合上线路 {edge}"
+        else:
+            edge = rng.choice([edge for record in analyzer.edges_info for edge in record])
+            offline.update(analyzer.apply_switching(remove=[edge])['removed'])
+            what = f"第 {step} 步断开线路 {edge}"
+        fresh = RiskAnalyzer(copy.deepcopy(current_nodes), copy.deepcopy(analyzer.edges_info))
+        assert_close(snapshot(analyzer), snapshot(fresh), what)
+    assert_table_matches(analyzer)
+
+    # 只给端点的新增线路缺少边属性，应在修改任何状态之前被拒绝
+    expected = snapshot(analyzer)
+    edges_before = list(analyzer.edges_info)
+    existing = {frozenset(map(int, edge)) for record in edges_before for edge in record}
+    nodes = sorted(int(node_id) for node_id in current_nodes)
+    edge = rng.choice([(u, v) for u in nodes for v in nodes if u < v and frozenset((u, v)) not in existing])
+    try:
+        analyzer.apply_switching(add=[edge])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError(f"新增线路 {edge} 缺少边属性却没有被拒绝")
+    assert analyzer.edges_info == edges_before, f"被拒绝的新增线路 {edge} 改变了边信息"
+    assert_close(snapshot(analyzer), expected, f"拒绝新增线路 {edge} 后的分析器")
+
+    # 原分析器修改节点负荷、做开关操作后，之前派生的场景不受影响
+    scenario = analyzer.with_overrides(nodes={rng.choice(list(current_nodes)): {'power': 800.0}})
+    expected = snapshot(scenario)
+    nodes_before = {node_id: dict(info) for node_id, info in scenario.nodes_info.items()}
+    edges_before = list(scenario.edges_info)
+    node_id = rng.choice(list(current_nodes))
+    analyzer.update_node_power(node_id, 1500.0)
+    assert dict(scenario.nodes_info) == nodes_before, "原分析器修改节点负荷改变了场景的节点信息"
+    assert_close(snapshot(scenario), expected, f"原分析器修改节点 {node_id} 的负荷后的场景")
+    edge = rng.choice([edge for record in analyzer.edges_info for edge in record])
+    analyzer.apply_switching(remove=[edge])
+    assert scenario.edges_info == edges_before, "原分析器的开关操作改变了场景的边信息"
+    assert_close(snapshot(scenario), expected, f"断开原分析器的线路 {edge} 后的场景")
+    print(f"分析器: {steps} 步增量更新与重新构建的分析器一致，缺少边属性的新增线路被拒绝，"
+          f"场景不受原分析器节点修改和开关操作影响")
+
+
+def check_parametric(rng, points):
+    """参数化最大流曲线与逐点直接计算的结果一致"""
+    current_nodes = copy.deepcopy(nodes_info)
+    current_edges = copy.deepcopy(edges_info)
+    for node_id in rng.sample(sorted(current_nodes), 8):
+        current_nodes[node_id]['DG'] = True
+    # 阻抗为0的线路 line_capacities 为0，端点含分布式能源时仍计入 dg_capacity
+    dg_nodes = {int(node_id) for node_id, info in current_nodes.items() if info.get('DG')}
+    records = [record for record in current_edges if any(dg_nodes & set(map(int, edge)) for edge in record)]
+    for info in rng.choice(records).values():
+        info['Resistor'] = info['Reactance'] = 0.0
+
+    lo, hi = 0.0, 1500.0
+    analyzer = RiskAnalyzer(copy.deepcopy(current_nodes), copy.deepcopy(current_edges))
+    for use_tie in ((0, 0), (1, 1)):
+        curves = analyzer.transferable_load_curves(lo, hi, use_tie)
+        values = {rng.uniform(lo, hi) for _ in range(points)}
+        values.update(x for curve in curves[:5] for x in curve.breakpoints.tolist())
+        for value in sorted(values):
+            direct = RiskAnalyzer(copy.deepcopy(current_nodes), copy.deepcopy(current_edges))
+            direct.dg_capacity = value
+            assert_close(np.array([curve(value) for curve in curves], dtype=float),
+                         direct.max_transferable_load(use_tie), f"dg_capacity = {value} 时的可转移负荷曲线")
+    print("参数化: 可转移负荷曲线与逐点直接计算一致")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="最大流相关代码的固定种子自检")
+    parser.add_argument('--seed', type=int, default=0, help="随机种子")
+    parser.add_argument('--trials', type=int, default=100, help="随机网络数")
+    parser.add_argument('--steps', type=int, default=30, help="62 节点系统上的增量更新步数")
+    parser.add_argument('--points', type=int, default=8, help="参数化曲线逐点比较的随机取值数")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    try:
+        check_cut_trees(rng, args.trials)
+        check_analyzer(rng, args.steps)
+        check_parametric(rng, args.points)
+    except AssertionError as e:
+        logger.error(f"自检失败: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    logger.remove()
+    logger.add(sys.stderr, level="ERROR")
+    main()
@@ -48,10 +48,9 @@ def visualized():
     edge_currents = {}
     added_edges_count = 0
 
-    for edge in edges_info:
-        begin, end = list(edge.keys())[0]
-        info = list(edge.values())[0]
-        
+    # 一次性取出所有线路的风险、容量和电流
+    metrics = analyzer.edge_metrics()
+    for i, (begin, end) in enumerate(metrics['edge']):
         # 确保节点ID类型一致
         begin_int = int(begin)
         end_int = int(end)
@@ -64,22 +63,16 @@ def visualized():
             print(f"警告：终止节点 {end_int} 不存在于图中")
             continue
 
-        try:
-            risk = analyzer.edge_risk(begin, end)
-            capacity = analyzer.calculate_capacity(begin, end)
-            current = analyzer.I_ij(begin, end)
-            current = max(current, 0.1)  # 避免为0不显示
-            
-            #label = f"风险:{risk:.3f}\n容量:{capacity:.1f}\n电流:{current:.1f}A\n{info['type']}"
-            label = f"风险：{risk:.3f}"
-            G.add_edge(begin_int, end_int)
-            edge_labels[(begin_int, end_int)] = label
-            edge_currents[(begin_int, end_int)] = current
-            added_edges_count += 1
-            
-        except Exception as e:
-            print(f"处理边 ({begin}, {end}) 时出错: {e}")
-            continue
+        risk = metrics['edge_risk'][i]
+        capacity = metrics['capacity'][i]
+        current = max(metrics['current'][i], 0.1)  # 避免为0不显示
+        
+        #label = f"风险:{risk:.3f}\n容量:{capacity:.1f}\n电流:{current:.1f}A"
+        label = f"风险：{risk:.3f}"
+        G.add_edge(begin_int, end_int)
+        edge_labels[(begin_int, end_int)] = label
+        edge_currents[(begin_int, end_int)] = current
+        added_edges_count += 1
 
     print(f"成功添加了 {added_edges_count} 条边")
     print(f"边列表: {list(G.edges())}")
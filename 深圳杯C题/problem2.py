@@ -1,11 +1,11 @@
 from utils.RiskAnalyzer import RiskAnalyzer
 from utils.data_loder import edges_info, nodes_info
+from utils.hot_log import enable_fast_logging
 
 import numpy as np  
 import matplotlib.pyplot as plt  
 from collections import deque 
 import json 
-from tqdm.rich import tqdm
 from loguru import logger
 import sys
 from prettytable import PrettyTable
@@ -15,13 +15,6 @@ step = 50
 def problem2():
     """问题2：分析 DG 容量从 300 至 900kW 的风险演变曲线，并绘制每个风险参数的导数变化线"""
     capacities = np.arange(300, 901,step)
-    risks = []
-    details = []
-    failure_probability = []
-    load_loss_consequence = []
-    load_loss_risk = []
-    overload_probability = []
-    overload_consequence = []
 
     # 设置中文和图像风格
     plt.rcParams['font.sans-serif'] = ['SimHei']
@@ -29,17 +22,21 @@ def problem2():
     plt.rcParams['axes.unicode_minus'] = False
     plt.rcParams['font.size'] = 8
 
-    for cap in tqdm(capacities, desc="问题2：容量模拟中"):
-        analyse = RiskAnalyzer(nodes_info=nodes_info, edges_info=edges_info)
-        analyse.dg_capacity = cap
-        result = analyse.comprehensive_risk_analysis()
-        risks.append(result['total_risk'])
-        details.append(result)
-        failure_probability.append(result['failure_probability'])
-        load_loss_consequence.append(result['load_loss_consequence'])
-        load_loss_risk.append(result['load_loss_risk'])
-        overload_probability.append(result['overload_probability'])
-        overload_consequence.append(result['overload_consequence'])
+    # 拓扑只构建一次，各容量分发到进程池中并行计算
+    analyse = RiskAnalyzer(nodes_info=nodes_info, edges_info=edges_info)
+    frame = analyse.sweep('dg_capacity', capacities, log_level="ERROR")
+    details = frame.to_dict('records')
+    risks = frame['total_risk'].to_numpy()
+    failure_probability = frame['failure_probability'].to_numpy()
+    load_loss_consequence = frame['load_loss_consequence'].to_numpy()
+    load_loss_risk = frame['load_loss_risk'].to_numpy()
+    overload_probability = frame['overload_probability'].to_numpy()
+    overload_consequence = frame['overload_consequence'].to_numpy()
+    # 失负荷指标是 DG 容量的分段线性函数，由参数化最大流给出精确导数（单位: 每 kW）
+    exact_derivatives = {
+        '失负荷后果': analyse.C_ll_curve(capacities[0], capacities[-1]).derivative(capacities),
+        '失负荷风险': analyse.load_loss_risk_curve(capacities[0], capacities[-1]).derivative(capacities),
+    }
 
     # 构建表格展示数据
     table = PrettyTable()
@@ -86,8 +83,10 @@ def problem2():
     
     # 绘制每个参数的原始值和导数
     for i, (param_name, data, main_color, diff_color) in enumerate(plot_params):
-        # 计算导数（差分）
-        data_diff = np.gradient(data)
+        # 导数：失负荷指标取精确导数，其余按容量做差分
+        data_diff = exact_derivatives.get(param_name)
+        if data_diff is None:
+            data_diff = np.gradient(data, capacities)
         
         # 左侧子图：原始值
         ax_main = axes[i, 0]
@@ -131,13 +130,6 @@ def problem2():
 def problem2_compact():
     """问题2的紧凑版本：只显示选定的几个重要参数"""
     capacities = np.arange(300, 901, step)
-    risks = []
-    details = []
-    failure_probability = []
-    load_loss_consequence = []
-    load_loss_risk = []
-    overload_probability = []
-    overload_consequence = []
 
     # 设置中文和图像风格
     plt.rcParams['font.sans-serif'] = ['SimHei']
@@ -145,17 +137,16 @@ def problem2_compact():
     plt.rcParams['axes.unicode_minus'] = False
     plt.rcParams['font.size'] = 10
 
-    for cap in tqdm(capacities, desc="问题2：容量模拟中"):
-        analyse = RiskAnalyzer(nodes_info=nodes_info, edges_info=edges_info)
-        analyse.dg_capacity = cap
-        result = analyse.comprehensive_risk_analysis()
-        risks.append(result['total_risk'])
-        details.append(result)
-        failure_probability.append(result['failure_probability'])
-        load_loss_consequence.append(result['load_loss_consequence'])
-        load_loss_risk.append(result['load_loss_risk'])
-        overload_probability.append(result['overload_probability'])
-        overload_consequence.append(result['overload_consequence'])
+    # 拓扑只构建一次，各容量分发到进程池中并行计算
+    analyse = RiskAnalyzer(nodes_info=nodes_info, edges_info=edges_info)
+    frame = analyse.sweep('dg_capacity', capacities, log_level="ERROR")
+    details = frame.to_dict('records')
+    risks = frame['total_risk'].to_numpy()
+    failure_probability = frame['failure_probability'].to_numpy()
+    load_loss_consequence = frame['load_loss_consequence'].to_numpy()
+    load_loss_risk = frame['load_loss_risk'].to_numpy()
+    overload_probability = frame['overload_probability'].to_numpy()
+    overload_consequence = frame['overload_consequence'].to_numpy()
 
     # ====== 紧凑版本的参数配置 ======
     # 只显示最重要的几个参数
@@ -170,7 +161,7 @@ def problem2_compact():
     
     # 绘制选定参数
     for i, (param_name, data, main_color, diff_color) in enumerate(plot_params):
-        data_diff = np.gradient(data)
+        data_diff = np.gradient(data, capacities)
         
         # 原始值（左列）
         ax_main = axes[i, 0]
@@ -196,6 +187,7 @@ def problem2_compact():
 if __name__ == '__main__':
     logger.remove()
     logger.add(sys.stderr, level="ERROR") 
+    enable_fast_logging("ERROR")
     
     # 选择运行哪个版本
     print("选择运行版本：")
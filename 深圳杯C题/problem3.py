@@ -3,7 +3,6 @@ from utils.data_loder import edges_info, nodes_info
 
 import numpy as np  
 import matplotlib.pyplot as plt  
-import json 
 from tqdm.rich import tqdm
 
 def problem3():
@@ -42,12 +41,13 @@ def problem3():
             neighbor = u
             break
 
-    for cap in tqdm(capacities, desc="问题3：PV容量仿真"):
-        # 深拷贝nodes_info，避免影响原始数据
-        nodes_info_sim = json.loads(json.dumps(nodes_info))
-        nodes_info_sim[node_id]["power"] = cap
+    # 基础分析器只构建一次，预先计算的拓扑、最大流等结果由各场景共享
+    base = RiskAnalyzer(nodes_info, edges_info)
+    base.comprehensive_risk_analysis()
 
-        analyzer = RiskAnalyzer(nodes_info_sim, edges_info)
+    for cap in tqdm(capacities, desc="问题3：PV容量仿真"):
+        # 场景只保存该节点的修改，不影响原始数据
+        analyzer = base.with_overrides(nodes={node_id: {"power": cap}})
         if neighbor is not None:
             line = (int(node_id), int(neighbor))
             risks.append(analyzer.overload_risk(line))
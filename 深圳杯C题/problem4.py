@@ -3,7 +3,6 @@ from utils.data_loder import edges_info, nodes_info
  
 import numpy as np  
 import matplotlib.pyplot as plt  
-import json 
 
 from tqdm.rich import tqdm
 
@@ -32,11 +31,13 @@ def problem4():
             neighbor = u
             break
 
+    # 基础分析器只构建一次，预先计算的拓扑、最大流等结果由各场景共享
+    base = RiskAnalyzer(nodes_info, edges_info)
+    base.comprehensive_risk_analysis()
+
     for cap in tqdm(capacities, desc="问题4：储能对比仿真"):
-        # 不带储能
-        nodes_info_sim = json.loads(json.dumps(nodes_info))
-        nodes_info_sim[node_id]["power"] = cap
-        analyzer = RiskAnalyzer(nodes_info_sim, edges_info)
+        # 不带储能（场景只保存该节点的修改，不影响原始数据）
+        analyzer = base.with_overrides(nodes={node_id: {"power": cap}})
         if neighbor is not None:
             line = (int(node_id), int(neighbor))
             risks_no_storage.append(analyzer.overload_risk(line))
@@ -44,10 +45,9 @@ def problem4():
             risks_no_storage.append(0)
 
         # 带储能
-        nodes_info_sim_storage = json.loads(json.dumps(nodes_info))
-        nodes_info_sim_storage[node_id]["power"] = cap
-        apply_storage(nodes_info_sim_storage[node_id])
-        analyzer_storage = RiskAnalyzer(nodes_info_sim_storage, edges_info)
+        storage_node = {"power": cap}
+        apply_storage(storage_node)
+        analyzer_storage = base.with_overrides(nodes={node_id: storage_node})
         if neighbor is not None:
             risks_with_storage.append(analyzer_storage.overload_risk(line))
         else:
@@ -6,13 +6,20 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from collections import deque, defaultdict
+from collections import ChainMap
 import json
 import copy
-from typing import Optional, Dict, List, Tuple, Set
+import heapq
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Dict, List, Tuple
 
 # 导入自定义的无向图类
 from utils.tool import UndirectedGraph
+from utils.topology import CSRTopology
+from utils.maxflow import ResidualNetwork, GomoryHuTree, parallel_max_flow_table
+from utils.memo import Param, DependencyMemo
+from utils.parametric import PiecewiseLinear, parametric_max_flow
+from utils.hot_log import hot_log, enable_fast_logging
 # 导入节点和边的数据
 from utils.data_loder import nodes_info, edges_info
 from loguru import logger
@@ -34,6 +41,23 @@ class RiskAnalyzer:
     版本：2025年6月3日
     """
 
+    # 可调参数：重新赋值时只清除依赖该参数的派生结果（见 _memoized）
+    node_risk = Param()
+    dg_risk = Param()
+    switch_risk = Param()
+    edge_each_length_risk = Param()
+    feeder_capacity = Param()
+    feeder_current_limit = Param()
+    voltage = Param()
+    dg_capacity = Param()
+    cos = Param()
+    max_flow_workers = Param()
+
+    # 节点属性到依赖名称的映射，其余属性不影响任何派生结果
+    _NODE_DEPENDENCIES = {'power': 'node:power', 'DG': 'node:DG', 'type': 'node:type'}
+    # apply_switching 新增线路必须给出的边属性
+    SWITCHING_EDGE_ATTRIBUTES = ('length', 'Resistor', 'Reactance', 'type')
+
     def __init__(self, nodes_info: Dict[str, Dict], edges_info: List[Dict[Tuple, Dict]], rated_current: float = 220.0):
         """
         初始化 RiskAnalyzer 实例
@@ -49,6 +73,12 @@ class RiskAnalyzer:
         self._edges_info = edges_info.copy()
         # 构建无向图对象
         self._graph = UndirectedGraph(self._nodes_info, self._edges_info)
+        # 是否已派生过场景（场景引用本对象当前的节点信息和图，见 with_overrides）
+        self._nodes_shared = False
+        # 派生结果缓存：每项结果登记其依赖的参数和数据，参数变化时只清除受影响的项
+        self._memo = DependencyMemo()
+        # 上次同步时的图版本号，图被直接修改（版本号变化）后清除全部依赖图数据的结果
+        self._graph_version = self._graph.version
         # 额定电流
         self._rated_current = rated_current
 
@@ -89,6 +119,11 @@ class RiskAnalyzer:
         self.dg_capacity = 3e4              # 分布式能源容量 (kW) - 300kW
         self.cos = 0.9                      # 功率因数
 
+        # 最大流求解设置
+        self.max_flow_method = 'auto'       # 求解算法: 'auto'、'edmonds_karp'、'dinic'、'push_relabel'
+        self.max_flow_parity = False        # 是否用 Edmonds-Karp 复核每次求解结果
+        self.max_flow_workers = 0           # 可转移负荷表的求解方式: 0 为 Gomory-Hu 树；N >= 1 为逐节点求解，N > 1 时用 N 个进程
+
         # 变电站映射表
         self._substation_map = {
             "CB1": '1',
@@ -96,9 +131,6 @@ class RiskAnalyzer:
             "CB3": '23'
         }
 
-        # 缓存潮流计算结果
-        self._power_flow_cache = {}
-
         # 初始化边-用户类型映射
         self._initialize_edge_user_types()
 
@@ -144,22 +176,478 @@ class RiskAnalyzer:
         """获取边信息"""
         return self._edges_info
 
+    @property
+    def topology(self) -> CSRTopology:
+        """获取CSR拓扑，图发生修改（版本号变化）后自动重建"""
+        return self._memoized('topology', ('graph',), self._graph.to_csr)
+
+    @property
+    def substation_map(self) -> Dict[str, str]:
+        """获取变电站映射表（变电站名 -> 节点ID）"""
+        return self._substation_map
+
+    @substation_map.setter
+    def substation_map(self, value: Dict[str, str]):
+        """设置变电站映射表"""
+        self._substation_map = dict(value)
+        # 清除依赖变电站配置的派生结果
+        self._memo.invalidate('substation_map')
+
+    @property
+    def substations(self) -> List[str]:
+        """所有变电站的节点ID"""
+        return list(self._substation_map.values())
+
     @property
     def rated_current(self) -> float:
         """获取额定电流"""
         return self._rated_current
 
-    @property
-    def dg_capacity(self) -> float:
-        """获取分布式能源容量"""
-        return self._dg_capacity
+    # ==================== 派生结果缓存 ====================
+
+    def _memoized(self, key, depends_on, compute):
+        """
+        获取带依赖追踪的派生结果
+
+        依赖名称可以是参数名（见类属性中的 Param）、'substation_map'、
+        数据名（'graph' 表示图的拓扑和边属性，'node:power'、'node:DG'、'node:type' 表示节点属性）
+        或其他派生结果的键。图被直接修改（版本号变化）时视为所有图数据都已变化。
+
+        Args:
+            key: 派生结果的键
+            depends_on: 依赖的名称
+            compute: 无参可调用对象，返回计算结果
+
+        Returns:
+            派生结果
+        """
+        if self._graph_version != self._graph.version:
+            self._graph_version = self._graph.version
+            self._memo.invalidate('graph', *self._NODE_DEPENDENCIES.values())
+        return self._memo.get(key, depends_on, compute)
+
+    def invalidate(self, *names):
+        """
+        手动清除派生结果，用于绕过 set_node_attribute 或图的更新方法直接修改了数据字典的情况
+
+        Args:
+            names: 依赖名称（如 'node:power'、'graph'），不传时清除全部派生结果
+        """
+        if names:
+            self._memo.invalidate(*names)
+        else:
+            self._memo.clear()
+
+    def set_node_attribute(self, node_id: str, attribute: str, value) -> bool:
+        """
+        修改节点属性，只清除依赖该属性的派生结果
+
+        例如修改 power 不会重建拓扑和最大流，修改 DG 会重新计算容量和最大流。
+
+        Args:
+            node_id: 节点 ID
+            attribute: 属性名
+            value: 新的属性值
+
+        Returns:
+            是否修改成功
+        """
+        if not self._write_node_attribute(node_id, attribute, value):
+            return False
+        self._memo.invalidate(self._NODE_DEPENDENCIES.get(attribute, f'node:{attribute}'))
+        if attribute == 'type':
+            self._initialize_edge_user_types()
+        return True
+
+    def _write_node_attribute(self, node_id: str, attribute: str, value) -> bool:
+        """
+        写入节点属性（不处理缓存），返回是否成功
+
+        派生过场景后第一次写入时，先把节点信息和图换成新的副本再修改（只复制这一次），
+        已派生的场景仍引用原来的节点信息和图，不受影响
+        """
+        in_sync = self._graph_version == self._graph.version
+        if self._nodes_shared and node_id in self._nodes_info:
+            self._nodes_info = {key: dict(info) for key, info in self._nodes_info.items()}
+            self._graph = UndirectedGraph(self._nodes_info, self._edges_info)
+            self._nodes_shared = False
+            if not in_sync:
+                # 原图被直接修改过，保持不同步，下次使用时清除依赖图数据的结果
+                self._graph_version = None
+        if not self._graph.update_node_attribute(node_id, attribute, value):
+            return False
+        # 节点属性不参与拓扑构建，图版本号的变化不必使依赖 'graph' 的结果失效
+        if in_sync:
+            self._graph_version = self._graph.version
+        return True
+
+    def update_node_power(self, node_id: str, power: float) -> bool:
+        """
+        修改单个节点的负荷，增量更新潮流和过载指标
+
+        负荷变化只影响该节点到其供电变电站路径上的线路：沿最短路径森林的前驱指针向上，
+        逐条调整线路功率、电流、过载程度和危害度，并同步更新过载线路数、过载危害度总和以及按电流排序的堆，
+        耗时 O(路径深度 · log E)（完整重新计算电流后的第一次增量更新另需 O(E) 建堆）。P_ol_all、C_ol、get_critical_lines 随之更新，
+        失负荷等其他依赖负荷的结果按依赖关系清除、下次使用时重新计算。
+        增量结果与完整重新计算在浮点舍入误差范围内一致。修改 DG 标记会改变容量和故障概率，请使用 set_node_attribute。
+
+        Args:
+            node_id: 节点 ID
+            power: 新的负荷 (kW)
+
+        Returns:
+            是否修改成功
+        """
+        key = node_id if node_id in self._nodes_info else str(node_id)
+        if key not in self._nodes_info:
+            hot_log.error("节点 {} 不存在", node_id)
+            return False
+        topo = self.topology
+        old_demand = self._effective_demand(self._nodes_info[key])
+        if not self._write_node_attribute(key, 'power', power):
+            return False
+        # 潮流及其下游结果由下面增量更新，其余依赖负荷的结果清除
+        self._memo.invalidate('node:power', keep=('power_flow',))
+        delta = self._effective_demand(self._nodes_info[key]) - old_demand
+        flow = self._memo.mutable('power_flow', lambda value: (dict(value[0]), value[1].copy()))
+        if flow is None or delta == 0:
+            return True
+
+        forest = self.substation_forest()
+        predecessor = forest['predecessor']
+        predecessor_edge = forest['predecessor_edge']
+        node = topo.index_of(key)
+        if node is None or predecessor[node] == -1:
+            hot_log.warning("节点 {} 无法找到到变电站的路径", key)
+            return True
+
+        # 沿供电路径逐条调整线路功率
+        edge_powers, edge_flow = flow
+        changed = []
+        while predecessor[node] != node:
+            edge = int(predecessor_edge[node])
+            parent = int(predecessor[node])
+            old = edge_flow[edge]
+            new = old + delta
+            # 负荷移除后消去舍入残差，与完整计算一样记为 0
+            if new <= 1e-9 * max(1.0, abs(old)):
+                new = 0.0
+            edge_flow[edge] = new
+            edge_key = self._get_edge_key(int(topo.node_ids[node]), int(topo.node_ids[parent]))
+            if new > 0:
+                edge_powers[edge_key] = float(new)
+            else:
+                edge_powers.pop(edge_key, None)
+            changed.append(edge)
+            node = parent
+        self._update_edge_rows(changed, edge_flow)
+        return True
+
+    def _update_edge_rows(self, edges: List[int], edge_flow: np.ndarray):
+        """按新的线路功率增量更新电流、过载指标、过载汇总和电流排序（只处理已缓存的结果）"""
+        positions = self._edge_positions()[edges]
+        positions = positions[positions >= 0].tolist()
+        current = self._memo.mutable('edge_currents', np.copy)
+        if current is None or not positions:
+            return
+        rows = self._edge_rows()
+        voltage_kv = self.voltage / 1000
+        old_current = current[positions].copy()
+        line_power = edge_flow[rows[positions]]
+        current[positions] = np.where(line_power > 0, line_power / (np.sqrt(3) * voltage_kv * self.cos), 0.0)
+
+        # 按电流排序的堆：已有时压入新的项（旧项惰性删除），否则按更新后的电流建堆
+        heap = self._memo.mutable('critical_heap', list)
+        if heap is None:
+            self._critical_heap()
+        elif len(heap) > 2 * len(current) + 64:
+            # 过期项过多时重建，压入的总代价均摊为 O(log E)
+            heap[:] = self._build_critical_heap(current)
+        else:
+            for position in positions:
+                heapq.heappush(heap, (-float(current[position]), position))
+
+        overload = self._memo.mutable('edge_overload', lambda value: {k: v.copy() for k, v in value.items()})
+        if overload is None:
+            return
+        dg_factor, avg_weight = self._edge_overload_weights()
+        threshold = 1.1 * self.feeder_current_limit
+        old_count = int(overload['overloaded'][positions].sum())
+        old_total = float(overload['consequence'][positions].sum())
+        overloaded = current[positions] > threshold
+        severity = np.where(overloaded, (current[positions] - threshold) * dg_factor[positions], 0.0)
+        overload['overloaded'][positions] = overloaded
+        overload['severity'][positions] = severity
+        overload['consequence'][positions] = avg_weight[positions] * severity
+
+        if 'overload_totals' in self._memo:
+            count, total = self._overload_totals()
+            self._memo.replace('overload_totals', (
+                count + int(overloaded.sum()) - old_count,
+                total + float(overload['consequence'][positions].sum()) - old_total))
+
+    # ==================== 开关操作 ====================
+
+    def apply_switching(self, add=(), remove=()) -> Dict:
+        """
+        开关操作（断开分段开关即删除线路，合上联络开关即新增线路）后增量重新分析
+
+        - 拓扑、变电站最短路径森林和潮流重新计算（线性时间），与操作前比较，
+          得到供电路径改变的节点（受影响的馈线子树）和功率改变的线路；
+        - 已缓存的 Gomory-Hu 割树按可用容量的变化增量更新（见 GomoryHuTree.updated）：
+          割容量可以直接确定的树边不再求解，其余树边在新网络上重新求解，原来的流仍可行时（容量只增不减）热启动；
+          可转移负荷表由更新后的割树查询得到。没有缓存割树时（如 max_flow_workers > 0）可转移负荷表完整重新计算；
+        - 其余指标按依赖关系重新计算，结果与对修改后的数据重新分析一致（浮点误差范围内）；
+        - 边信息列表和图整体换成新对象而不原地修改，之前派生的场景不受影响。
+
+        Args:
+            add: 新增的线路，元素为 (begin, end, 边属性字典)，端点须为已有节点且线路不存在；
+                 边属性须包含 SWITCHING_EDGE_ATTRIBUTES（长度、电阻、电抗为非负数），缺少时抛出 ValueError，不修改任何状态
+            remove: 删除的线路，元素为 (begin, end)，不区分方向
 
-    @dg_capacity.setter
-    def dg_capacity(self, value: float):
-        """设置分布式能源容量"""
-        self._dg_capacity = value
-        # 清空相关缓存，确保新值生效
-        self._power_flow_cache = {}
+        Returns:
+            字典:
+            metrics: 操作后的综合风险指标（同 comprehensive_risk_analysis）
+            metric_changes: {指标名: (原值, 新值)}，只包含变化的指标
+            added: 新增的线路列表
+            removed: {线路: 边属性字典}，被删除的线路及其属性，可用于之后重新合上
+            rerouted: {节点ID: (原供电变电站, 新供电变电站)}，供电路径改变的节点，不可达时变电站为 None
+            affected_feeders: 供电范围改变的变电站列表
+            edge_power_changes: {线路: (原功率, 新功率)}，功率改变的线路 (kW)
+            transferable_load_changes: {是否启用联络线: {(节点ID, 变电站名): (原值, 新值)}}，已缓存的可转移负荷表中改变的项
+            max_flow: {是否启用联络线: 统计字典}，割树增量更新的统计（见 GomoryHuTree.updated）
+        """
+        existing = {self._get_edge_key(int(begin), int(end)) for edge in self._edges_info for begin, end in edge}
+        removing = set()
+        for begin, end in remove:
+            key = self._get_edge_key(int(begin), int(end))
+            if key not in existing or key in removing:
+                raise ValueError(f"线路 ({begin}, {end}) 不存在")
+            removing.add(key)
+        adding = {}
+        for edge in add:
+            begin, end = edge[0], edge[1]
+            key = self._get_edge_key(int(begin), int(end))
+            for node in (begin, end):
+                if str(node) not in self._nodes_info:
+                    raise ValueError(f"节点 {node} 不存在")
+            if (key in existing and key not in removing) or key in adding:
+                raise ValueError(f"线路 ({begin}, {end}) 已存在")
+            attributes = dict(edge[2]) if len(edge) > 2 and edge[2] else {}
+            missing = [name for name in self.SWITCHING_EDGE_ATTRIBUTES if name not in attributes]
+            if missing:
+                raise ValueError(f"新增线路 ({begin}, {end}) 缺少边属性: {missing}")
+            for name in ('length', 'Resistor', 'Reactance'):
+                try:
+                    value = float(attributes[name])
+                except (TypeError, ValueError):
+                    value = np.nan
+                if not value >= 0:
+                    raise ValueError(f"新增线路 ({begin}, {end}) 的边属性 {name} 不是非负数: {attributes[name]}")
+            adding[key] = attributes
+
+        # 操作前的结果（通常已缓存）
+        before = self.comprehensive_risk_analysis()
+        old_topo = self.topology
+        old_forest = self.substation_forest()
+        old_powers = self.calculate_power_flow_simple()
+        old_tables, old_trees, old_capacities = {}, {}, {}
+        for use_blocked in (False, True):
+            use_tie = (1, 1) if use_blocked else (0, 0)
+            if ('transferable_load_table', use_blocked) in self._memo:
+                old_tables[use_blocked] = self.transferable_load_table(use_tie)
+            if ('gomory_hu_tree', use_blocked) in self._memo:
+                old_trees[use_blocked] = self.gomory_hu_tree(use_tie)
+                old_capacities[use_blocked] = self._available_capacities(use_blocked)
+
+        # 修改边信息：换成新的边信息列表和新图，不原地修改（已派生的场景仍引用原来的列表和图）
+        removed = {}
+        records = []
+        for record in self._edges_info:
+            rest = {}
+            for edge, info in record.items():
+                if self._get_edge_key(int(edge[0]), int(edge[1])) in removing:
+                    removed[edge] = info
+                else:
+                    rest[edge] = info
+            if rest:
+                records.append(record if len(rest) == len(record) else rest)
+        records.extend({key: attributes} for key, attributes in adding.items())
+        # 先在新图上算出拓扑、供电森林和潮流，失败时恢复原来的边信息、图和缓存，分析器保持操作前的状态
+        saved = (self._edges_info, self._graph, self._graph_version, self._memo, self.edge_user_types)
+        self._memo = self._memo.copy()
+        try:
+            self._edges_info = records
+            self._graph = UndirectedGraph(self._nodes_info, self._edges_info)
+            self._graph_version = self._graph.version
+            self._memo.invalidate('graph')
+            self._initialize_edge_user_types()
+            self.substation_forest()
+            self.calculate_power_flow_simple()
+        except Exception:
+            self._edges_info, self._graph, self._graph_version, self._memo, self.edge_user_types = saved
+            logger.error("开关操作后无法重新计算拓扑和潮流，已恢复操作前的状态")
+            raise
+        logger.info(f"开关操作: 新增线路 {list(adding)}，删除线路 {list(removed)}")
+
+        # 增量更新割树
+        topo = self.topology
+        if old_trees and topo.node_ids != old_topo.node_ids:
+            logger.warning("开关操作后节点集合改变，最大流结果完整重新计算")
+            old_trees = {}
+        max_flow_stats = {}
+        for use_blocked, tree in old_trees.items():
+            old = old_capacities[use_blocked]
+            new = self._available_capacities(use_blocked)
+            changes = [(u, v, new.get((u, v), 0.0) - old.get((u, v), 0.0)) for u, v in sorted(set(old) | set(new))
+                       if new.get((u, v), 0.0) != old.get((u, v), 0.0)]
+            updated, max_flow_stats[use_blocked] = tree.updated(self.flow_network(), changes)
+            self._memoized(('gomory_hu_tree', use_blocked), ('flow_network',), lambda: updated)
+            logger.info(f"增量更新 Gomory-Hu 树，启用联络线: {use_blocked}，{max_flow_stats[use_blocked]}")
+
+        after = self.comprehensive_risk_analysis()
+
+        # 变化报告
+        names = {node_id: name for name, node_id in self._substation_map.items()}
+        forest = self.substation_forest()
+
+        def supply(topology, forest, node_id):
+            """节点的 (前驱节点ID, 供电变电站名)，不可达时为 (None, None)"""
+            index = topology.index_of(node_id)
+            if index is None or forest['nearest'][index] < 0:
+                return None, None
+            nearest = topology.node_ids[forest['nearest'][index]]
+            return topology.node_ids[forest['predecessor'][index]], names.get(nearest, nearest)
+
+        rerouted = {}
+        for node_id in topo.node_ids:
+            old_predecessor, old_feeder = supply(old_topo, old_forest, node_id)
+            new_predecessor, new_feeder = supply(topo, forest, node_id)
+            if old_predecessor != new_predecessor:
+                rerouted[node_id] = (old_feeder, new_feeder)
+        affected_feeders = sorted({feeder for pair in rerouted.values() for feeder in pair if feeder is not None})
+
+        new_powers = self.calculate_power_flow_simple()
+        edge_power_changes = {}
+        for key in sorted(set(old_powers) | set(new_powers)):
+            old_power, new_power = old_powers.get(key, 0.0), new_powers.get(key, 0.0)
+            if not np.isclose(old_power, new_power, rtol=1e-9, atol=1e-9):
+                edge_power_changes[key] = (old_power, new_power)
+
+        transferable_load_changes = {}
+        substation_names = list(self._substation_map)
+        for use_blocked, old_table in old_tables.items():
+            table = self.transferable_load_table((1, 1) if use_blocked else (0, 0))
+            changes = {}
+            for row, node_id in enumerate(topo.node_ids):
+                old_row = old_topo.index_of(node_id)
+                for column, name in enumerate(substation_names):
+                    old_value = old_table[old_row, column] if old_row is not None else 0.0
+                    if not np.isclose(old_value, table[row, column], rtol=1e-9, atol=1e-9):
+                        changes[(node_id, name)] = (float(old_value), float(table[row, column]))
+            transferable_load_changes[use_blocked] = changes
+
+        metric_changes = {name: (before.get(name), value) for name, value in after.items()
+                          if name not in before or not np.isclose(before[name], value, rtol=1e-9, atol=1e-12)}
+        return {
+            'metrics': after,
+            'metric_changes': metric_changes,
+            'added': list(adding),
+            'removed': removed,
+            'rerouted': rerouted,
+            'affected_feeders': affected_feeders,
+            'edge_power_changes': edge_power_changes,
+            'transferable_load_changes': transferable_load_changes,
+            'max_flow': max_flow_stats,
+        }
+
+    def _available_capacities(self, use_blocked: bool) -> Dict[Tuple[int, int], float]:
+        """最大流可用的线路容量，按端点节点索引 (较小, 较大) 汇总（重复边相加），被屏蔽的边不计入"""
+        topo = self.topology
+        capacity = self.edge_capacities()
+        if not use_blocked:
+            capacity = np.where(topo.tie_line, 0.0, capacity)
+        totals = {}
+        for u, v, value in zip(topo.edge_u.tolist(), topo.edge_v.tolist(), capacity.tolist()):
+            if u != v and value != 0:
+                key = (u, v) if u <= v else (v, u)
+                totals[key] = totals.get(key, 0.0) + value
+        return totals
+
+    # ==================== 场景 ====================
+
+    def with_overrides(self, nodes: Optional[Dict[str, Dict]] = None, edges: Optional[Dict[Tuple, Dict]] = None,
+                       params: Optional[Dict] = None) -> 'RiskScenario':
+        """
+        派生一个只修改部分数据的场景（写时复制），本分析器不受影响
+
+        场景与本分析器共享拓扑、节点/边信息和已缓存的派生结果，只保存修改的部分：
+        修改过的节点在覆盖层中保存一份合并后的属性字典，未修改的节点直接引用原字典；
+        缓存按依赖关系只清除受修改影响的结果，例如只修改负荷时不会重建拓扑和最大流。
+        修改边属性会为场景单独构建图和拓扑。
+        之后本分析器的 set_node_attribute、update_node_power、apply_switching 写入副本，不影响场景；
+        绕过这些方法的原地修改会反映到场景中，详见 RiskScenario。
+
+        Args:
+            nodes: {节点ID: {属性名: 新值}}，只能修改已有节点
+            edges: {(begin, end): {属性名: 新值}}，只能修改已有边（不区分方向）
+            params: {参数名: 新值}，参数名为可调参数（如 'dg_capacity'）或 'substation_map'
+
+        Returns:
+            RiskScenario 对象，用法与 RiskAnalyzer 相同，也可以继续派生场景
+        """
+        scenario = RiskScenario.__new__(RiskScenario)
+        scenario.__dict__.update(self.__dict__)
+        scenario._memo = self._memo.copy()
+        scenario._graph_version = self._graph_version
+        # 场景引用本对象当前的节点信息和图，本对象之后修改节点属性前先换成副本
+        self._nodes_shared = True
+
+        base_nodes = self._nodes_info
+        layer = {}
+        if isinstance(base_nodes, ChainMap):
+            layer = dict(base_nodes.maps[0])
+            base_nodes = base_nodes.maps[-1]
+        changed = set()
+        for node_id, attributes in (nodes or {}).items():
+            key = node_id if node_id in self._nodes_info else str(node_id)
+            if key not in self._nodes_info:
+                raise ValueError(f"节点 {node_id} 不存在，场景只能修改已有节点")
+            merged = dict(self._nodes_info[key])
+            for attribute, value in attributes.items():
+                if attribute not in merged or merged[attribute] != value:
+                    changed.add(attribute)
+                merged[attribute] = value
+            layer[key] = merged
+        scenario._nodes_info = ChainMap(layer, base_nodes)
+        if changed:
+            scenario._memo.invalidate(*(self._NODE_DEPENDENCIES.get(a, f'node:{a}') for a in changed))
+
+        if edges:
+            edges_info = list(self._edges_info)
+            positions = {}
+            for position, edge in enumerate(edges_info):
+                for begin, end in edge:
+                    positions.setdefault(self._get_edge_key(int(begin), int(end)), position)
+            for (begin, end), attributes in edges.items():
+                position = positions.get(self._get_edge_key(int(begin), int(end)))
+                if position is None:
+                    raise ValueError(f"边 ({begin}, {end}) 不存在，场景只能修改已有边")
+                edge_id, info = list(edges_info[position].items())[0]
+                edges_info[position] = {edge_id: {**info, **attributes}}
+            scenario._edges_info = edges_info
+            scenario._graph = UndirectedGraph(scenario._nodes_info, edges_info)
+            scenario._graph_version = scenario._graph.version
+            scenario._memo.invalidate('graph')
+
+        if edges or 'type' in changed:
+            scenario._initialize_edge_user_types()
+
+        for name, value in (params or {}).items():
+            if name != 'substation_map' and not isinstance(getattr(type(self), name, None), Param):
+                raise ValueError(f"不支持修改的参数: {name}")
+            setattr(scenario, name, value)
+        return scenario
 
     # ==================== 基础计算方法 ====================
 
@@ -180,7 +668,7 @@ class RiskAnalyzer:
             # 故障概率 = 长度 * 单位长度故障率
             return float(length) * self.edge_each_length_risk
         except Exception as e:
-            logger.error(f"计算边({begin}, {end})故障概率时出错: {e}")
+            hot_log.error("计算边({}, {})故障概率时出错: {}", begin, end, e)
             return 0.0
 
     def calculate_capacity(self, begin: int, end: int) -> float:
@@ -203,22 +691,22 @@ class RiskAnalyzer:
             Z_abs = np.abs(Z)
 
             if Z_abs == 0:
-                logger.warning(f"边({begin}, {end})阻抗为0")
+                hot_log.warning("边({}, {})阻抗为0", begin, end)
                 return 0.0
 
             # 计算容量（kW）
             capacity = np.square(self.voltage) / (Z_abs * self.cos) / 10e2
 
             # 如果有分布式能源，增加容量
-            begin_is_dg = self._graph.get_node_attribute(str(begin), 'DG')
-            end_is_dg = self._graph.get_node_attribute(str(end), 'DG')
+            begin_is_dg = self._nodes_info.get(str(begin), {}).get('DG')
+            end_is_dg = self._nodes_info.get(str(end), {}).get('DG')
             if begin_is_dg or end_is_dg:
                 capacity += self.dg_capacity
 
             # 不超过馈线额定容量
             return min(capacity, self.feeder_capacity)
         except Exception as e:
-            logger.error(f"计算边({begin}, {end})容量时出错: {e}")
+            hot_log.error("计算边({}, {})容量时出错: {}", begin, end, e)
             return 0.0
 
     # ==================== 潮流分析相关方法 ====================
@@ -236,9 +724,38 @@ class RiskAnalyzer:
         """
         return (min(begin, end), max(begin, end))
 
+    def substation_forest(self) -> Dict[str, np.ndarray]:
+        """
+        从所有变电站同时出发进行一次多源 Dijkstra 搜索（按线路长度），
+        得到每个节点的最近变电站、距离和最短路径上的前驱
+
+        结果依赖拓扑和变电站配置，二者不变时直接返回缓存。
+
+        Returns:
+            字典，各数组均按 topology.node_ids 的节点索引对齐：
+            nearest: 最近变电站的节点索引（不可达为 -1）
+            distance: 到最近变电站的线路长度（不可达为 inf）
+            predecessor: 朝向变电站方向的下一个节点索引（变电站为其自身，不可达为 -1）
+            predecessor_edge: 连接 predecessor 的边编号（变电站和不可达节点为 -1）
+        """
+        return self._memoized('substation_forest', ('topology', 'substation_map'), self._compute_substation_forest)
+
+    def _compute_substation_forest(self) -> Dict[str, np.ndarray]:
+        """计算变电站最短路径森林（见 substation_forest）"""
+        nearest, distance, predecessor, predecessor_edge = self.topology.multi_source_dijkstra(
+            self.substations, weight='length')
+        forest = {
+            'nearest': nearest,
+            'distance': distance,
+            'predecessor': predecessor,
+            'predecessor_edge': predecessor_edge,
+        }
+        logger.info(f"计算变电站最短路径森林，可达节点数: {int((nearest >= 0).sum())}")
+        return forest
+
     def _find_shortest_path_to_substation(self, start_node: str) -> Tuple[Optional[List[str]], float]:
         """
-        使用 BFS 找到从指定节点到最近变电站的最短路径
+        找到从指定节点到最近变电站的最短路径（按线路长度）
 
         Args:
             start_node: 起始节点 ID
@@ -246,74 +763,89 @@ class RiskAnalyzer:
         Returns:
             (路径列表, 总距离) 或 (None, inf)
         """
-        substations = ['1', '23', '43']
-        if start_node in substations:
-            return [start_node], 0.0
-
-        # 队列用于BFS，元素为(当前节点, 路径, 距离)
-        queue = deque([(start_node, [start_node], 0.0)])
-        visited = set()
-
-        while queue:
-            current, path, distance = queue.popleft()
-            if current in visited:
-                continue
-            visited.add(current)
-
-            if current in substations:
-                return path, distance
-
-            try:
-                # 遍历邻居节点
-                for neighbor in self._graph.neighbors(int(current)):
-                    neighbor_str = str(neighbor)
-                    if neighbor_str not in visited:
-                        edge_length = self._graph.get_edge_attribute(int(current), neighbor, 'length')
-                        new_path = path + [neighbor_str]
-                        new_distance = distance + edge_length
-                        queue.append((neighbor_str, new_path, new_distance))
-            except Exception as e:
-                logger.error(f"搜索节点 {current} 的邻居时出错: {e}")
-                continue
-
-        return None, float('inf')
+        topo = self.topology
+        start = topo.index_of(start_node)
+        if start is None:
+            hot_log.error("节点 {} 不存在", start_node)
+            return None, float('inf')
+
+        # 沿最短路径森林的前驱指针回溯到树根（最近的变电站）
+        forest = self.substation_forest()
+        predecessor = forest['predecessor']
+        if predecessor[start] == -1:
+            return None, float('inf')
+        path = [start]
+        while predecessor[path[-1]] != path[-1]:
+            path.append(int(predecessor[path[-1]]))
+        return [str(topo.node_ids[i]) for i in path], float(forest['distance'][start])
 
     def calculate_power_flow_simple(self) -> Dict[Tuple[int, int], float]:
         """
         简化的潮流计算方法，考虑分布式能源的供电能力
 
+        每个负荷由最近变电站沿最短路径供电，因此一条边的功率等于
+        变电站最短路径森林中该边下游子树的有效负荷之和，一次逆拓扑序累加即可求出全部边功率。
+
         Returns:
             字典，键为边的标准化元组，值为该边承载的功率 (kW)
         """
-        # 如果有缓存，直接返回
-        if self._power_flow_cache:
-            return self._power_flow_cache
-
-        edge_powers = defaultdict(float)
-
-        # 遍历所有节点
+        return self._power_flow()[0]
+
+    def _power_flow(self) -> Tuple[Dict[Tuple[int, int], float], np.ndarray]:
+        """潮流结果（字典形式和按边编号对齐的数组形式），依赖供电森林、节点负荷和DG容量"""
+        return self._memoized('power_flow',
+                              ('substation_forest', 'topology', 'node:power', 'node:DG', 'dg_capacity'),
+                              self._compute_power_flow)
+
+    def _compute_power_flow(self) -> Tuple[Dict[Tuple[int, int], float], np.ndarray]:
+        """按供电森林的子树负荷和计算潮流（见 calculate_power_flow_simple）"""
+        topo = self.topology
+        forest = self.substation_forest()
+        predecessor = forest['predecessor']
+        predecessor_edge = forest['predecessor_edge']
+
+        # 节点的有效负荷：分布式能源节点减去DG出力
+        demand = np.zeros(topo.num_nodes)
         for node_id, node_info in self._nodes_info.items():
-            power_demand = node_info.get('power', 0)
-            is_dg = node_info.get('DG', False)
-
-            # 如果是分布式能源节点，减少需求
-            if is_dg and power_demand > 0:
-                power_demand = max(power_demand - self.dg_capacity, 0)
-
+            power_demand = self._effective_demand(node_info)
             if power_demand > 0:
-                # 找到到最近变电站的最短路径
-                path, min_distance = self._find_shortest_path_to_substation(node_id)
-                if path and len(path) > 1:
-                    # 路径上的每条边都加上该节点的需求
-                    for i in range(len(path) - 1):
-                        edge_key = self._get_edge_key(int(path[i]), int(path[i+1]))
-                        edge_powers[edge_key] += power_demand
-                else:
-                    logger.warning(f"节点 {node_id} 无法找到到变电站的路径")
+                index = topo.index_of(node_id)
+                if index is None or predecessor[index] == -1:
+                    hot_log.warning("节点 {} 无法找到到变电站的路径", node_id)
+                    continue
+                demand[index] = power_demand
+
+        # 子树负荷和即为节点与其前驱之间那条边的功率
+        subtree = topo.subtree_sums(predecessor, demand)
+        edge_flow = np.zeros(topo.num_edges)
+        children = np.flatnonzero(predecessor_edge >= 0)
+        edge_flow[predecessor_edge[children]] = subtree[children]
+
+        edge_powers = {}
+        for child in children[subtree[children] > 0].tolist():
+            node1 = int(topo.node_ids[child])
+            node2 = int(topo.node_ids[predecessor[child]])
+            edge_powers[self._get_edge_key(node1, node2)] = float(subtree[child])
+
+        return edge_powers, edge_flow
+
+    def _effective_demand(self, node_info: Dict) -> float:
+        """节点参与潮流计算的有效负荷：分布式能源节点减去DG出力，非正负荷记为 0"""
+        power_demand = node_info.get('power', 0)
+        # 如果是分布式能源节点，减少需求
+        if node_info.get('DG', False) and power_demand > 0:
+            power_demand = max(power_demand - self.dg_capacity, 0)
+        return power_demand if power_demand > 0 else 0.0
+
+    def edge_power_flow(self) -> np.ndarray:
+        """
+        按边编号对齐的潮流结果
 
-        # 缓存结果
-        self._power_flow_cache = dict(edge_powers)
-        return self._power_flow_cache
+        Returns:
+            NumPy 数组，第 k 个元素为 topology.edge_keys[k] 对应线路承载的功率 (kW)，
+            不在供电路径上的线路为 0
+        """
+        return self._power_flow()[1]
 
     # ==================== 最大流算法 ====================
 
@@ -334,79 +866,371 @@ class RiskAnalyzer:
         sink = self._substation_map.get(sink, sink)
 
         if source == sink:
-            logger.warning(f"源点 {source} 和汇点 {sink} 相同，返回 0")
+            hot_log.warning("源点 {} 和汇点 {} 相同，返回 0", source, sink)
             return 0.0
 
-        # 构建残量网络
-        residual_capacity = {}
-        for edge in self._edges_info:
-            edge_id, edge_info = list(edge.items())[0]
-            begin, end = edge_id
-            capacity = self.calculate_capacity(begin, end)
-
-            # 如果有分布式能源，增加容量
-            begin_is_dg = self._graph.get_node_attribute(str(begin), 'DG')
-            end_is_dg = self._graph.get_node_attribute(str(end), 'DG')
-            if begin_is_dg or end_is_dg:
-                capacity += self.dg_capacity
+        topo = self.topology
+        s, t = topo.index_of(source), topo.index_of(sink)
+        if s is None or t is None:
+            hot_log.error("节点 {} 或节点 {} 不存在", source, sink)
+            return 0.0
 
-            residual_capacity[(begin, end)] = capacity
-            residual_capacity[(end, begin)] = capacity
-
-        def bfs_find_path() -> Optional[List[str]]:
-            # BFS 寻找增广路径
-            parents = {}
-            visited = set([source])
-            queue = deque([source])
-            while queue:
-                u = queue.popleft()
-                for v in self._graph.neighbors(int(u)):
-                    v_str = str(v)
-                    # 只考虑有剩余容量的边
-                    if v_str not in visited and residual_capacity.get((int(u), v), 0) > 0:
-                        # 不使用联络线时跳过联络线
-                        if (use_tie == (0, 0) and
-                                self._graph.get_edge_attribute(int(u), v, "type") == "馈线间联络线"):
-                            continue
-                        parents[v_str] = u
-                        visited.add(v_str)
-                        queue.append(v_str)
-                        if v_str == sink:
-                            # 回溯得到路径
-                            path = []
-                            current = sink
-                            while current is not None:
-                                path.append(current)
-                                current = parents.get(current)
-                            return path[::-1]
-            return None
-
-        max_flow = 0.0
         try:
-            while True:
-                path = bfs_find_path()
-                if not path:
-                    break
-                # 找到路径上的最小剩余容量
-                path_flow = float("inf")
-                for i in range(len(path) - 1):
-                    u, v = int(path[i]), int(path[i + 1])
-                    path_flow = min(path_flow, residual_capacity.get((u, v), 0))
-                if path_flow == 0:
-                    break
-                # 更新残量网络
-                for i in range(len(path) - 1):
-                    u, v = int(path[i]), int(path[i + 1])
-                    residual_capacity[(u, v)] -= path_flow
-                    residual_capacity[(v, u)] += path_flow
-                max_flow += path_flow
-            return max_flow
+            # 不使用联络线时屏蔽联络线
+            return self.flow_network().edmonds_karp(s, t, use_blocked=use_tie != (0, 0))
         except Exception as e:
-            logger.error(f"最大流计算异常: {e}")
+            hot_log.error("最大流计算异常: {}", e)
             return 0.0
 
+    def _node_dg_mask(self) -> np.ndarray:
+        """按 topology 节点索引对齐的分布式能源标记"""
+        return self._memoized('node_dg_mask', ('topology', 'node:DG'), self._compute_node_dg_mask)
+
+    def _compute_node_dg_mask(self) -> np.ndarray:
+        topo = self.topology
+        is_dg = np.zeros(topo.num_nodes, dtype=bool)
+        for node_id, info in self._nodes_info.items():
+            index = topo.index_of(node_id)
+            if index is not None and info.get('DG'):
+                is_dg[index] = True
+        return is_dg
+
+    def line_capacities(self) -> np.ndarray:
+        """
+        按边编号（topology.edge_keys）批量计算线路传输容量，与逐条调用 calculate_capacity 的结果一致：
+        阻抗为0或缺失时容量为0；端点含分布式能源时计入DG容量，并受馈线容量上限约束
+
+        Returns:
+            NumPy 数组，每条边的容量 (kW)
+        """
+        return self._memoized('line_capacities',
+                              ('topology', 'node_dg_mask', 'voltage', 'cos', 'feeder_capacity', 'dg_capacity'),
+                              self._compute_line_capacities)
+
+    def _compute_line_capacities(self) -> np.ndarray:
+        topo = self.topology
+        base, valid = self._line_base_capacity()
+        is_dg = self._node_dg_mask()
+        dg_edge = is_dg[topo.edge_u] | is_dg[topo.edge_v]
+        capacity = np.minimum(base + np.where(dg_edge, self.dg_capacity, 0.0), self.feeder_capacity)
+        # 阻抗为0或缺失（calculate_capacity 返回0）
+        capacity[~valid] = 0.0
+        return capacity
+
+    def _line_base_capacity(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        不计分布式能源、不受馈线容量约束的线路容量 V^2 / (|Z| * cos) / 1000
+
+        Returns:
+            (容量数组, 阻抗有效标记)，阻抗为0或缺失的线路容量记为0、标记为 False
+        """
+        def compute():
+            topo = self.topology
+            with np.errstate(divide='ignore', invalid='ignore'):
+                z_abs = np.abs(topo.resistor + 1j * topo.reactance)
+                base = np.square(self.voltage) / (z_abs * self.cos) / 10e2
+            valid = z_abs > 0
+            return np.where(valid, base, 0.0), valid
+
+        return self._memoized('line_base_capacity', ('topology', 'voltage', 'cos'), compute)
+
+    def edge_capacities(self) -> np.ndarray:
+        """
+        按边编号（topology.edge_keys）批量计算最大流所用的线路容量
+
+        在 line_capacities 的基础上，端点含分布式能源的线路再额外叠加一次DG容量（不受上限约束），
+        与原逐条构建残量网络时的做法一致。
+
+        Returns:
+            NumPy 数组，每条边的容量 (kW)
+        """
+        return self._memoized('edge_capacities', ('line_capacities', 'node_dg_mask', 'dg_capacity'),
+                              self._compute_edge_capacities)
+
+    def _compute_edge_capacities(self) -> np.ndarray:
+        topo = self.topology
+        is_dg = self._node_dg_mask()
+        dg_edge = is_dg[topo.edge_u] | is_dg[topo.edge_v]
+        return self.line_capacities() + np.where(dg_edge, self.dg_capacity, 0.0)
+
+    def flow_network(self) -> ResidualNetwork:
+        """
+        获取编译好的最大流残量网络（容量数组和联络线屏蔽标记），
+        拓扑或容量相关参数不变时直接复用，各次求解之间只原地重置剩余容量。
+        求解算法和复核模式取自 max_flow_method、max_flow_parity（用于构建 Gomory-Hu 树等）
+
+        Returns:
+            ResidualNetwork 对象
+        """
+        network = self._memoized('flow_network', ('topology', 'edge_capacities'), self._compile_flow_network)
+        network.method = self.max_flow_method
+        network.parity = self.max_flow_parity
+        return network
+
+    def _compile_flow_network(self) -> ResidualNetwork:
+        topo = self.topology
+        network = ResidualNetwork(topo, self.edge_capacities(), blocked_edges=topo.tie_line)
+        logger.info("编译最大流残量网络")
+        return network
+
+    def gomory_hu_tree(self, use_tie: Tuple = (0, 0)) -> GomoryHuTree:
+        """
+        获取 Gomory-Hu 等价流树，用于快速查询任意两点间的最大流
+
+        只依赖残量网络（拓扑、节点DG标记和容量相关参数），故障率等参数变化时不会重新构建。
+
+        Args:
+            use_tie: 是否启用联络线，默认 (0,0) 表示不启用
+
+        Returns:
+            GomoryHuTree 对象
+        """
+        use_blocked = use_tie != (0, 0)
+
+        def build():
+            tree = GomoryHuTree(self.flow_network(), use_blocked=use_blocked)
+            logger.info(f"构建 Gomory-Hu 树，启用联络线: {use_blocked}")
+            return tree
+
+        return self._memoized(('gomory_hu_tree', use_blocked), ('flow_network',), build)
+
+    def max_flow(self, source: str, sink: str, use_tie: Tuple = (0, 0)) -> float:
+        """
+        通过 Gomory-Hu 树查询最大流，结果与 edmons_krap 相同（浮点误差范围内），
+        构建树之后每次查询只需 O(树深度)
+
+        Args:
+            source: 源点（变电站代码或节点 ID）
+            sink: 汇点（节点 ID）
+            use_tie: 是否启用联络线，默认 (0,0) 表示不启用
+
+        Returns:
+            最大流值 (kW)
+        """
+        source = self._substation_map.get(source, source)
+        sink = self._substation_map.get(sink, sink)
+
+        if source == sink:
+            hot_log.warning("源点 {} 和汇点 {} 相同，返回 0", source, sink)
+            return 0.0
+
+        topo = self.topology
+        s, t = topo.index_of(source), topo.index_of(sink)
+        if s is None or t is None:
+            hot_log.error("节点 {} 或节点 {} 不存在", source, sink)
+            return 0.0
+        return self.gomory_hu_tree(use_tie).max_flow(s, t)
+
+    def transferable_load_table(self, use_tie: Tuple = (0, 0)) -> np.ndarray:
+        """
+        可转移负荷表：每个节点从每个变电站可获得的最大转移负荷（最大流）
+
+        C_ll、load_loss_risk 等失负荷指标共用此表，每个节点每个变电站只求解一次；
+        只在残量网络或变电站配置变化时重新计算。
+
+        max_flow_workers 为 0 时通过 Gomory-Hu 树查询；为 N >= 1 时逐节点直接求解最大流，
+        N > 1 时按节点分块分发到 N 个进程，结果与 N = 1 逐位相同（见 parallel_max_flow_table）。
+
+        Args:
+            use_tie: 是否启用联络线，默认 (0,0) 表示不启用
+
+        Returns:
+            NumPy 数组，形状为 (节点数, 变电站数)，行按 topology.node_ids 的节点索引对齐，
+            列按 substation_map 的顺序对齐；节点本身就是该变电站时为 0
+        """
+        use_blocked = use_tie != (0, 0)
+        return self._memoized(('transferable_load_table', use_blocked),
+                              ('flow_network', ('gomory_hu_tree', use_blocked), 'substation_map', 'max_flow_workers'),
+                              lambda: self._compute_transferable_load_table(use_tie))
+
+    def _compute_transferable_load_table(self, use_tie: Tuple) -> np.ndarray:
+        topo = self.topology
+        if self.max_flow_workers:
+            sources = []
+            for substation in self.substations:
+                s = topo.index_of(substation)
+                if s is None:
+                    hot_log.error("变电站节点 {} 不存在", substation)
+                sources.append(s)
+            table = parallel_max_flow_table(self.flow_network(), sources, use_blocked=use_tie != (0, 0),
+                                            workers=self.max_flow_workers)
+            logger.info(f"逐节点计算可转移负荷表，进程数: {self.max_flow_workers}")
+            return table
+
+        tree = self.gomory_hu_tree(use_tie)
+        table = np.zeros((topo.num_nodes, len(self._substation_map)))
+        for column, substation in enumerate(self.substations):
+            s = topo.index_of(substation)
+            if s is None:
+                hot_log.error("变电站节点 {} 不存在", substation)
+                continue
+            for t in range(topo.num_nodes):
+                table[t, column] = tree.max_flow(s, t)
+        logger.info("计算可转移负荷表")
+        return table
+
+    def max_transferable_load(self, use_tie: Tuple = (0, 0)) -> np.ndarray:
+        """
+        每个节点从所有变电站中可获得的最大转移负荷
+
+        Args:
+            use_tie: 是否启用联络线，默认 (0,0) 表示不启用
+
+        Returns:
+            NumPy 数组，按 topology.node_ids 的节点索引对齐 (kW)
+        """
+        table = self.transferable_load_table(use_tie)
+        if table.shape[1] == 0:
+            return np.zeros(table.shape[0])
+        return np.maximum(table.max(axis=1), 0.0)
+
     # ==================== 故障概率计算 ====================
 
+    def _edge_rows(self) -> np.ndarray:
+        """
+        edges_info 中每条记录对应的拓扑边编号
+
+        与原先逐条遍历 edges_info 时一样，每条记录只取其第一条边
+        """
+        return self._memoized('edge_rows', ('topology',), self._compute_edge_rows)
+
+    def _compute_edge_rows(self) -> np.ndarray:
+        rows = []
+        offset = 0
+        for edge in self._edges_info:
+            if edge:
+                rows.append(offset)
+            offset += len(edge)
+        return np.asarray(rows, dtype=np.int64)
+
+    def _line_length_risk(self) -> np.ndarray:
+        """各线路本身的故障概率（长度 * 单位长度故障率），只依赖线路长度和 edge_each_length_risk"""
+        def compute():
+            rows = self._edge_rows()
+            return np.nan_to_num(self.topology.length[rows]) * self.edge_each_length_risk
+
+        return self._memoized('line_length_risk', ('edge_rows', 'edge_each_length_risk'), compute)
+
+    def _failure_probability(self) -> np.ndarray:
+        """计入分段开关和分布式能源后的各线路故障概率，与 dg_capacity 等潮流参数无关"""
+        def compute():
+            topo = self.topology
+            rows = self._edge_rows()
+            is_dg = self._node_dg_mask()
+            dg_edge = is_dg[topo.edge_u[rows]] | is_dg[topo.edge_v[rows]]
+            return (self._line_length_risk() + np.where(topo.sectional_switch[rows], self.switch_risk, 0.0)
+                    + np.where(dg_edge, self.dg_risk, 0.0))
+
+        return self._memoized('failure_probability',
+                              ('line_length_risk', 'node_dg_mask', 'switch_risk', 'dg_risk'), compute)
+
+    def _edge_currents(self) -> np.ndarray:
+        """各线路电流 (A)，依赖潮流、电压和功率因数"""
+        def compute():
+            topo = self.topology
+            edge_powers = self.calculate_power_flow_simple()
+            line_power = np.array([edge_powers.get(self._get_edge_key(*topo.edge_keys[row]), 0.0)
+                                   for row in self._edge_rows().tolist()])
+            voltage_kv = self.voltage / 1000
+            return np.where(line_power > 0, line_power / (np.sqrt(3) * voltage_kv * self.cos), 0.0)
+
+        return self._memoized('edge_currents', ('power_flow', 'edge_rows', 'voltage', 'cos'), compute)
+
+    def _edge_positions(self) -> np.ndarray:
+        """按边编号对齐的指标表行号（edge_metrics 中的位置），不在表中的边为 -1"""
+        def compute():
+            positions = np.full(self.topology.num_edges, -1, dtype=np.int64)
+            rows = self._edge_rows()
+            positions[rows] = np.arange(len(rows))
+            return positions
+
+        return self._memoized('edge_positions', ('edge_rows',), compute)
+
+    def _edge_overload_weights(self) -> Tuple[np.ndarray, np.ndarray]:
+        """各线路过载程度的折算系数（含分布式能源的线路为 0.8）和两端用户类型危害度权重的平均值"""
+        def compute():
+            topo = self.topology
+            rows = self._edge_rows()
+            edge_u = topo.edge_u[rows]
+            edge_v = topo.edge_v[rows]
+            is_dg = self._node_dg_mask()
+            dg_edge = is_dg[edge_u] | is_dg[edge_v]
+            node_weight = np.full(topo.num_nodes, self._damage_weights.get('居民', 1.0))
+            for node_id, info in self._nodes_info.items():
+                index = topo.index_of(node_id)
+                if index is not None:
+                    node_weight[index] = self._damage_weights.get(info.get('type') or '居民', 1.0)
+            return np.where(dg_edge, 0.8, 1.0), (node_weight[edge_u] + node_weight[edge_v]) / 2
+
+        return self._memoized('edge_overload_weights', ('edge_rows', 'node_dg_mask', 'node:type'), compute)
+
+    def _edge_overload(self) -> Dict[str, np.ndarray]:
+        """各线路的过载标记、过载程度和过载危害度"""
+        def compute():
+            dg_factor, avg_weight = self._edge_overload_weights()
+            current = self._edge_currents()
+            threshold = 1.1 * self.feeder_current_limit
+            overloaded = current > threshold
+            severity = np.where(overloaded, (current - threshold) * dg_factor, 0.0)
+            return {'overloaded': overloaded, 'severity': severity, 'consequence': avg_weight * severity}
+
+        return self._memoized('edge_overload',
+                              ('edge_currents', 'edge_overload_weights', 'feeder_current_limit'), compute)
+
+    def _overload_totals(self) -> Tuple[int, float]:
+        """过载线路数和过载危害度总和"""
+        def compute():
+            overload = self._edge_overload()
+            return int(overload['overloaded'].sum()), float(overload['consequence'].sum())
+
+        return self._memoized('overload_totals', ('edge_overload',), compute)
+
+    def _critical_heap(self) -> List[Tuple[float, int]]:
+        """
+        (-电流, 行号) 的最小堆，由 update_node_power 增量维护，供 get_critical_lines 取前 N 条
+
+        电流改变时只压入新的项，旧项留在堆中（惰性删除）：取出时电流与当前值不符的项、
+        以及同一行号的重复项直接丢弃
+        """
+        return self._memoized('critical_heap', ('edge_currents',),
+                              lambda: self._build_critical_heap(self._edge_currents()))
+
+    @staticmethod
+    def _build_critical_heap(current: np.ndarray) -> List[Tuple[float, int]]:
+        heap = list(zip((-current).tolist(), range(len(current))))
+        heapq.heapify(heap)
+        return heap
+
+    def edge_metrics(self) -> Dict[str, np.ndarray]:
+        """
+        所有线路的指标表，P_f、P_ol_all、C_ol、get_critical_lines 都是在此表上的归约
+
+        各列分别缓存并登记各自的依赖：例如修改故障率只重新计算故障概率列，
+        修改 dg_capacity 不会重新计算线路长度对应的故障概率项。
+
+        Returns:
+            字典，各列按 edges_info 的记录顺序对齐：
+            edge: 线路 (begin, end) 列表
+            edge_risk: 线路本身的故障概率（长度 * 单位长度故障率，同 edge_risk）
+            failure_probability: 计入分段开关和分布式能源后的线路故障概率（同 P_f 中的逐线路项）
+            capacity: 线路传输容量 (kW)（同 calculate_capacity）
+            current: 线路电流 (A)（同 I_ij）
+            overloaded: 是否过载（电流超过 1.1 倍馈线额定电流）
+            severity: 过载程度（超出阈值的电流，含分布式能源的线路乘以 0.8），未过载为 0
+            consequence: 过载危害度（两端用户类型权重的平均值 * 过载程度），未过载为 0
+        """
+        topo = self.topology
+        rows = self._edge_rows()
+        metrics = {
+            'edge': [topo.edge_keys[row] for row in rows.tolist()],
+            'edge_risk': self._line_length_risk(),
+            'failure_probability': self._failure_probability(),
+            'capacity': self.line_capacities()[rows],
+            'current': self._edge_currents(),
+        }
+        metrics.update(self._edge_overload())
+        return metrics
+
     def P_f(self) -> float:
         """
         计算全网故障概率
@@ -414,22 +1238,8 @@ class RiskAnalyzer:
         Returns:
             全网故障概率
         """
-        total_failure_prob = 0.0
-        for edge in self.edges_info:
-            edge_id, edge_info = list(edge.items())[0]
-            begin, end = edge_id
-            # 基础故障概率 = 长度 * 单位长度故障率
-            line_prob = edge_info['length'] * self.edge_each_length_risk
-            # 有分段开关则加上开关故障率
-            if edge_info.get('分段开关') not in [None, 'None', '']:
-                line_prob += self.switch_risk
-            # 有分布式能源则加上DG故障率
-            begin_has_dg = self._graph.get_node_attribute(str(begin), 'DG')
-            end_has_dg = self._graph.get_node_attribute(str(end), 'DG')
-            if begin_has_dg or end_has_dg:
-                line_prob += self.dg_risk
-            total_failure_prob += line_prob
-        return total_failure_prob
+        # 各线路故障概率 = 长度 * 单位长度故障率 + 分段开关故障率 + 分布式能源故障率
+        return float(self._failure_probability().sum())
 
     # ==================== 失负荷风险计算 ====================
 
@@ -440,6 +1250,13 @@ class RiskAnalyzer:
         Returns:
             失负荷危害度
         """
+        return self._memoized('C_ll', (('transferable_load_table', False), 'node:power', 'node:DG', 'node:type'),
+                              self._compute_C_ll)
+
+    def _compute_C_ll(self) -> float:
+        topo = self.topology
+        # 每个节点到所有变电站的最大流取最大值，各节点共用同一张可转移负荷表
+        transferable = self.max_transferable_load()
         total_consequence = 0.0
         for node_id, node_data in self.nodes_info.items():
             node_type = node_data.get('type', '居民')
@@ -447,15 +1264,8 @@ class RiskAnalyzer:
             load_demand = node_data.get('power', 0)
             # 只考虑没有分布式能源且有负荷的节点
             if not node_data.get('DG', False) and load_demand > 0:
-                max_transferable = 0.0
-                # 计算到所有变电站的最大流，取最大值
-                for substation in ['CB1', 'CB2', 'CB3']:
-                    try:
-                        flow = self.edmons_krap(source=substation, sink=node_id)
-                        max_transferable = max(max_transferable, flow)
-                    except Exception as e:
-                        logger.error(f"计算节点 {node_id} 到 {substation} 最大流时出错: {e}")
-                        continue
+                index = topo.index_of(node_id)
+                max_transferable = float(transferable[index]) if index is not None else 0.0
                 # 失负荷 = 需求 - 最大可转移
                 load_loss = max(load_demand - max_transferable, 0)
                 consequence = weight * load_loss
@@ -469,6 +1279,14 @@ class RiskAnalyzer:
         Returns:
             失负荷风险值
         """
+        return self._memoized('load_loss_risk',
+                              (('transferable_load_table', False), 'node:power', 'node:DG',
+                               'node_risk', 'dg_risk', 'dg_capacity'),
+                              self._compute_load_loss_risk)
+
+    def _compute_load_loss_risk(self) -> float:
+        topo = self.topology
+        transferable = self.max_transferable_load()
         total_risk = 0.0
         for node_id, node_data in self._nodes_info.items():
             power_demand = node_data.get('power', 0)
@@ -480,21 +1298,169 @@ class RiskAnalyzer:
             effective_demand = power_demand
             if node_data.get('DG', False):
                 effective_demand = max(power_demand - self.dg_capacity, 0)
-            max_transfer = 0.0
-            # 计算到所有变电站的最大流
-            for substation in ['CB1', 'CB2', 'CB3']:
-                try:
-                    flow = self.edmons_krap(source=substation, sink=node_id)
-                    max_transfer = max(max_transfer, flow)
-                except Exception as e:
-                    logger.error(f"计算节点 {node_id} 最大转移负荷时出错: {e}")
-                    continue
+            # 到所有变电站的最大流中的最大值
+            index = topo.index_of(node_id)
+            max_transfer = float(transferable[index]) if index is not None else 0.0
             # 失负荷
             load_loss = max(effective_demand - max_transfer, 0)
             node_risk = failure_prob * load_loss
             total_risk += node_risk
         return total_risk
 
+    # ==================== 参数化分析 ====================
+
+    def _capacity_segments(self, lo: float, hi: float) -> List[Tuple[float, float, np.ndarray, np.ndarray]]:
+        """
+        把 dg_capacity 的区间 [lo, hi] 按线路容量的拐点分段，每段内 edge_capacities 是 dg_capacity 的仿射函数
+
+        不含分布式能源的线路容量为常数 min(基础容量, 馈线容量)；
+        含分布式能源的线路容量为 min(基础容量 + λ, 馈线容量) + λ，在 λ = 馈线容量 - 基础容量 处斜率由 2 变为 1；
+        阻抗为0或缺失的线路 line_capacities 为0，含分布式能源时 edge_capacities 仍计入 λ，容量为 λ。
+
+        Returns:
+            列表，元素为 (段起点, 段终点, alpha, beta)，段内边容量为 alpha + beta * dg_capacity
+        """
+        topo = self.topology
+        base, valid = self._line_base_capacity()
+        is_dg = self._node_dg_mask()
+        dg_any = is_dg[topo.edge_u] | is_dg[topo.edge_v]
+        # 只有阻抗有效的含分布式能源线路才有拐点
+        dg_edge = dg_any & valid
+        feeder = self.feeder_capacity
+
+        knots = feeder - base[dg_edge]
+        knots = np.unique(knots[(knots > lo) & (knots < hi)])
+        bounds = [lo, *knots.tolist(), hi]
+        segments = []
+        for a, b in zip(bounds[:-1], bounds[1:]):
+            # 段内各线路是否受馈线容量约束保持不变，用段中点判断
+            below = dg_edge & (base + (a + b) / 2 < feeder)
+            alpha = np.where(dg_edge, np.where(below, base, feeder), np.minimum(base, feeder))
+            alpha[~valid] = 0.0
+            beta = np.where(below, 2.0, np.where(dg_any, 1.0, 0.0))
+            segments.append((a, b, alpha, beta))
+        return segments
+
+    def transferable_load_curves(self, lo: float, hi: float, use_tie: Tuple = (0, 0)) -> List[PiecewiseLinear]:
+        """
+        参数化最大流：各节点最大可转移负荷关于 dg_capacity 的精确分段线性函数
+
+        对每个节点和每个变电站求最大流关于 dg_capacity 的分段线性函数（见 parametric_max_flow），
+        再逐点取最大值，在 [lo, hi] 内任一点的取值与把 dg_capacity 设为该值后 max_transferable_load 的结果一致。
+        结果不依赖当前的 dg_capacity。
+
+        Args:
+            lo: dg_capacity 区间下限 (kW)
+            hi: dg_capacity 区间上限 (kW)，须大于 lo
+            use_tie: 是否启用联络线，默认 (0,0) 表示不启用
+
+        Returns:
+            列表，按 topology.node_ids 的节点索引对齐，元素为 PiecewiseLinear
+        """
+        lo, hi = float(lo), float(hi)
+        if not lo < hi:
+            raise ValueError(f"dg_capacity 区间无效: [{lo}, {hi}]")
+        use_blocked = use_tie != (0, 0)
+        return self._memoized(('transferable_load_curves', use_blocked, lo, hi),
+                              ('topology', 'node_dg_mask', 'line_base_capacity', 'feeder_capacity', 'substation_map'),
+                              lambda: self._compute_transferable_load_curves(lo, hi, use_blocked))
+
+    def _compute_transferable_load_curves(self, lo: float, hi: float, use_blocked: bool) -> List[PiecewiseLinear]:
+        topo = self.topology
+        segments = self._capacity_segments(lo, hi)
+        # 独立的残量网络，求解时改写容量不影响 flow_network 的缓存
+        network = ResidualNetwork(topo, segments[0][2], blocked_edges=topo.tie_line, method=self.max_flow_method)
+        sources = []
+        for substation in self.substations:
+            s = topo.index_of(substation)
+            if s is None:
+                hot_log.error("变电站节点 {} 不存在", substation)
+            else:
+                sources.append(s)
+
+        zero = PiecewiseLinear.constant(lo, hi, 0.0)
+        curves = []
+        for t in range(topo.num_nodes):
+            curve = zero
+            for s in sources:
+                if s != t:
+                    curve = curve.maximum(parametric_max_flow(network, s, t, segments, use_blocked))
+            curves.append(curve)
+        logger.info(f"参数化最大流: dg_capacity ∈ [{lo}, {hi}]，容量分段数: {len(segments)}")
+        return curves
+
+    def C_ll_curve(self, lo: float, hi: float) -> PiecewiseLinear:
+        """
+        失负荷危害度关于 dg_capacity 的精确分段线性函数
+
+        在 [lo, hi] 内任一点的取值与把 dg_capacity 设为该值后 C_ll 的结果一致，
+        导数由 derivative 精确给出，拐点见 breakpoints。
+
+        Args:
+            lo: dg_capacity 区间下限 (kW)
+            hi: dg_capacity 区间上限 (kW)
+
+        Returns:
+            PiecewiseLinear
+        """
+        def compute():
+            topo = self.topology
+            curves = self.transferable_load_curves(lo, hi)
+            total = PiecewiseLinear.constant(lo, hi, 0.0)
+            for node_id, node_data in self._nodes_info.items():
+                load_demand = node_data.get('power', 0)
+                if node_data.get('DG', False) or load_demand <= 0:
+                    continue
+                weight = self._damage_weights.get(node_data.get('type', '居民'), 1.0)
+                index = topo.index_of(node_id)
+                transferable = curves[index] if index is not None else PiecewiseLinear.constant(lo, hi, 0.0)
+                total = total + weight * (load_demand - transferable).maximum(0.0)
+            return total
+
+        lo, hi = float(lo), float(hi)
+        return self._memoized(('C_ll_curve', lo, hi),
+                              (('transferable_load_curves', False, lo, hi), 'node:power', 'node:DG', 'node:type'),
+                              compute)
+
+    def load_loss_risk_curve(self, lo: float, hi: float) -> PiecewiseLinear:
+        """
+        失负荷风险关于 dg_capacity 的精确分段线性函数
+
+        可转移负荷和分布式能源节点的有效负荷 max(负荷 - dg_capacity, 0) 都是 dg_capacity 的分段线性函数，
+        在 [lo, hi] 内任一点的取值与把 dg_capacity 设为该值后 load_loss_risk 的结果一致。
+
+        Args:
+            lo: dg_capacity 区间下限 (kW)
+            hi: dg_capacity 区间上限 (kW)
+
+        Returns:
+            PiecewiseLinear
+        """
+        def compute():
+            topo = self.topology
+            curves = self.transferable_load_curves(lo, hi)
+            total = PiecewiseLinear.constant(lo, hi, 0.0)
+            for node_id, node_data in self._nodes_info.items():
+                power_demand = node_data.get('power', 0)
+                if power_demand <= 0:
+                    continue
+                if node_data.get('DG', False):
+                    failure_prob = self.dg_risk
+                    effective_demand = PiecewiseLinear.linear(lo, hi, -1.0, power_demand).maximum(0.0)
+                else:
+                    failure_prob = self.node_risk
+                    effective_demand = power_demand
+                index = topo.index_of(node_id)
+                transferable = curves[index] if index is not None else PiecewiseLinear.constant(lo, hi, 0.0)
+                total = total + failure_prob * (effective_demand - transferable).maximum(0.0)
+            return total
+
+        lo, hi = float(lo), float(hi)
+        return self._memoized(('load_loss_risk_curve', lo, hi),
+                              (('transferable_load_curves', False, lo, hi), 'node:power', 'node:DG',
+                               'node_risk', 'dg_risk'),
+                              compute)
+
     # ==================== 过载风险计算 ====================
 
     def I_ij(self, begin: int, end: int) -> float:
@@ -520,7 +1486,7 @@ class RiskAnalyzer:
             current = line_power / (np.sqrt(3) * voltage_kv * self.cos)
             return current
         except Exception as e:
-            logger.error(f"计算线路 ({begin}, {end}) 电流时出错: {e}")
+            hot_log.error("计算线路 ({}, {}) 电流时出错: {}", begin, end, e)
             return 0.0
 
     def P_ol_all(self) -> float:
@@ -530,20 +1496,9 @@ class RiskAnalyzer:
         Returns:
             过载线路比例 (0-1 之间)
         """
-        total_lines = 0
-        overloaded_lines = 0
-        threshold = 1.1 * self.feeder_current_limit
-        for edge in self._edges_info:
-            begin, end = list(edge.keys())[0]
-            try:
-                current = self.I_ij(begin, end)
-                if current > threshold:
-                    overloaded_lines += 1
-                total_lines += 1
-            except Exception as e:
-                logger.error(f"检查线路 ({begin}, {end}) 过载状态时出错: {e}")
-                continue
-        return overloaded_lines / total_lines if total_lines > 0 else 0.0
+        count, _ = self._overload_totals()
+        lines = len(self._edge_rows())
+        return count / lines if lines > 0 else 0.0
 
     def C_ol(self) -> float:
         """
@@ -552,30 +1507,7 @@ class RiskAnalyzer:
         Returns:
             过载危害度
         """
-        total_consequence = 0.0
-        threshold = 1.1 * self.feeder_current_limit
-        for edge in self._edges_info:
-            begin, end = list(edge.keys())[0]
-            try:
-                current = self.I_ij(begin, end)
-                if current > threshold:
-                    # 获取两端节点类型
-                    begin_type = self._graph.get_node_attribute(str(begin), 'type') or '居民'
-                    end_type = self._graph.get_node_attribute(str(end), 'type') or '居民'
-                    begin_weight = self._damage_weights.get(begin_type, 1.0)
-                    end_weight = self._damage_weights.get(end_type, 1.0)
-                    avg_weight = (begin_weight + end_weight) / 2
-                    # 有分布式能源则危害度降低
-                    begin_is_dg = self._graph.get_node_attribute(str(begin), 'DG')
-                    end_is_dg = self._graph.get_node_attribute(str(end), 'DG')
-                    dg_factor = 0.8 if (begin_is_dg or end_is_dg) else 1.0
-                    overload_severity = (current - threshold) * dg_factor
-                    consequence = avg_weight * overload_severity
-                    total_consequence += consequence
-            except Exception as e:
-                logger.error(f"计算线路 ({begin}, {end}) 过载危害度时出错: {e}")
-                continue
-        return total_consequence
+        return self._overload_totals()[1]
 
     # ==================== 综合分析方法 ====================
 
@@ -602,6 +1534,49 @@ class RiskAnalyzer:
             logger.error(f"综合风险分析时出错: {e}")
             return {}
 
+    # 参数扫描结果表的指标列（与 comprehensive_risk_analysis 的键一致）
+    SWEEP_METRICS = ('failure_probability', 'load_loss_consequence', 'load_loss_risk',
+                     'overload_probability', 'overload_consequence', 'total_risk')
+
+    def sweep(self, param: str = 'dg_capacity', values=(), workers: Optional[int] = None,
+              log_level: str = 'WARNING') -> pd.DataFrame:
+        """
+        参数扫描：对参数的每个取值做一次综合风险分析
+
+        拓扑和不依赖该参数的派生结果只计算一次，随分析器一起发送给每个工作进程（每个进程一份），
+        各取值分块分发到进程池中并行计算。本分析器自身的参数不会被修改。
+
+        Args:
+            param: 参数名，须为可调参数（如 'dg_capacity'、'voltage'、'node_risk'）
+            values: 参数取值序列
+            workers: 进程数，默认为 CPU 核数；为 1 或取值很少时在当前进程中顺序计算
+            log_level: 工作进程中 loguru 和热路径日志的输出级别
+
+        Returns:
+            DataFrame，每个取值一行，第一列为参数值，其余列为 SWEEP_METRICS 中的各项指标，按 values 的顺序排列
+        """
+        if not isinstance(getattr(type(self), param, None), Param):
+            raise ValueError(f"不支持扫描的参数: {param}")
+        values = list(values)
+        workers = workers or os.cpu_count() or 1
+        workers = min(workers, len(values))
+
+        # 预先计算与扫描参数无关的结果，工作进程直接复用
+        self.topology
+        self.substation_forest()
+        logger.info(f"参数扫描 {param}，取值数: {len(values)}，进程数: {max(workers, 1)}")
+
+        if workers <= 1:
+            # 串行时使用局部副本，计算结束后即可释放；模块级全局变量只供进程池的工作进程使用
+            worker = copy.deepcopy(self)
+            rows = [_sweep_row(worker, param, value) for value in values]
+        else:
+            chunksize = max(1, len(values) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_sweep_worker,
+                                     initargs=(self, param, log_level)) as executor:
+                rows = list(executor.map(_run_sweep_value, values, chunksize=chunksize))
+        return pd.DataFrame(rows, columns=[param, *self.SWEEP_METRICS])
+
     def get_critical_lines(self, top_n: int = 5) -> List[Tuple[Tuple[int, int], float]]:
         """
         获取最关键的线路（基于电流负载）
@@ -610,20 +1585,38 @@ class RiskAnalyzer:
             top_n: 返回前 N 条关键线路
 
         Returns:
-            [(边, 电流值), ...] 按电流从大到小排序
+            [(边, 电流值), ...] 按电流从大到小排序，电流相同时保持 edges_info 中的顺序
         """
-        line_currents = []
-        for edge in self._edges_info:
-            begin, end = list(edge.keys())[0]
-            try:
-                current = self.I_ij(begin, end)
-                line_currents.append(((begin, end), current))
-            except Exception as e:
-                logger.error(f"获取线路 ({begin}, {end}) 电流时出错: {e}")
+        topo = self.topology
+        rows = self._edge_rows()
+        if top_n <= 0:
+            return []
+        current = self._edge_currents()
+        heap = self._memo.mutable('critical_heap', list)
+        if heap is None:
+            # 没有增量维护的堆时直接在电流列上选出前 top_n 条：先用 argpartition 找到第 top_n 大的电流值，
+            # 再取所有不小于它的线路（含并列的），按电流降序、原顺序升序排序
+            n = len(current)
+            if top_n < n:
+                kth = current[np.argpartition(-current, top_n - 1)[top_n - 1]]
+                candidates = np.flatnonzero(current >= kth)
+            else:
+                candidates = np.arange(n)
+            order = candidates[np.lexsort((candidates, -current[candidates]))][:top_n]
+            return [(topo.edge_keys[rows[i]], float(current[i])) for i in order.tolist()]
+
+        # 从堆中依次取出有效项，耗时 O((top_n + 丢弃的过期项) · log E)，取出的有效项再放回
+        top = []
+        seen = set()
+        while heap and len(top) < top_n:
+            value, i = heapq.heappop(heap)
+            if i in seen or -value != current[i]:
                 continue
-        # 按电流降序排序
-        line_currents.sort(key=lambda x: x[1], reverse=True)
-        return line_currents[:top_n]
+            seen.add(i)
+            top.append((value, i))
+        for item in top:
+            heapq.heappush(heap, item)
+        return [(topo.edge_keys[rows[i]], -value) for value, i in top]
 
     # ==================== 调试和测试方法 ====================
 
@@ -653,6 +1646,63 @@ class RiskAnalyzer:
         except Exception as e:
             logger.error(f"打印分析摘要时出错: {e}")
 
+class RiskScenario(RiskAnalyzer):
+    """
+    由 RiskAnalyzer.with_overrides 派生的场景
+
+    节点信息是覆盖层（修改过的节点）叠加在原节点信息上的 ChainMap，拓扑和缓存与原分析器共享，
+    所有分析方法与 RiskAnalyzer 相同。set_node_attribute、update_node_power 只写入场景自己的覆盖层，
+    与原分析器共享的缓存结果在增量更新前先复制；apply_switching 为场景换上新的边信息列表和图，
+    均不影响原分析器。
+
+    反过来，原分析器通过 set_node_attribute、update_node_power 修改节点时，第一次修改前先换成节点信息和图的副本，
+    apply_switching 换用新的边信息列表和图，已派生的场景都不受影响。
+    绕过这些方法的原地修改（通过图修改节点或边属性、直接修改 nodes_info 或 edges_info）仍会反映到已派生的场景中，
+    而场景已缓存的结果不会随之失效；需要这样修改时，应在修改后重新派生场景。
+    """
+
+    def _write_node_attribute(self, node_id: str, attribute: str, value) -> bool:
+        """
+        写入节点属性：修改过的节点在场景的覆盖层中换成合并后的新字典，原节点信息不受影响；
+        覆盖层中已有的字典可能与由本场景派生的场景共享，同样不原地修改
+        """
+        if node_id not in self._nodes_info:
+            hot_log.error("节点 {} 不存在", node_id)
+            return False
+        self._nodes_info.maps[0][node_id] = {**self._nodes_info[node_id], attribute: value}
+        return True
+
+
+# ==================== 参数扫描的工作进程 ====================
+
+# 每个工作进程持有的分析器副本和扫描的参数名，由进程池的初始化函数设置
+_sweep_analyzer = None
+_sweep_param = None
+
+
+def _init_sweep_worker(analyzer: RiskAnalyzer, param: str, log_level: Optional[str]):
+    """进程池初始化函数：保存分析器副本，按需设置工作进程的日志级别"""
+    global _sweep_analyzer, _sweep_param
+    _sweep_analyzer = analyzer
+    _sweep_param = param
+    if log_level is not None:
+        logger.remove()
+        logger.add(sys.stderr, level=log_level)
+        enable_fast_logging(log_level)
+
+
+def _sweep_row(analyzer: RiskAnalyzer, param: str, value) -> tuple:
+    """在分析器副本上设置参数并计算各项指标，返回结果表的一行"""
+    setattr(analyzer, param, value)
+    results = analyzer.comprehensive_risk_analysis()
+    return (value, *(results.get(name, np.nan) for name in RiskAnalyzer.SWEEP_METRICS))
+
+
+def _run_sweep_value(value) -> tuple:
+    """工作进程中计算一个参数取值下的各项指标"""
+    return _sweep_row(_sweep_analyzer, _sweep_param, value)
+
+
 def main():
     """主函数 - 演示分析器的使用"""
     try:
@@ -672,4 +1722,6 @@ if __name__ == "__main__":
     # 设置日志等级为WARNING
     logger.remove()
     logger.add(sys.stderr, level="WARNING")
+    # 低于WARNING的热路径日志直接跳过，不再格式化消息
+    enable_fast_logging("WARNING")
     main()
\ No newline at end of file
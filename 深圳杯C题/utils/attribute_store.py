@@ -0,0 +1,263 @@
+import numpy as np
+from collections import Counter
+from loguru import logger
+
+
+def _is_number(value) -> bool:
+    """判断是否为数值（与原统计逻辑一致，bool 也视为数值）"""
+    return isinstance(value, (int, float, np.integer, np.floating))
+
+
+class _Column:
+    """
+    单个属性的列存储
+
+    kind 为 'numeric' 时，值存放在 NumPy 数组 values 中（全部为整数时为 int64，否则为 float64），
+    present 标记该行是否有此属性；
+    kind 为 'category' 时，值编码为整数 codes（-1 表示无此属性），categories 为编码到原值的列表；
+    kind 为 'object' 时（出现列表等不可哈希的值），按行保存原值，查询退化为扫描。
+    """
+
+    def __init__(self, values, present):
+        """
+        参数:
+            values: 列表，每行的属性值（无此属性的行为 None）
+            present: 列表，每行是否有此属性
+        """
+        observed = [value for value, has in zip(values, present) if has]
+        self.index = None
+        if observed and all(_is_number(v) and not isinstance(v, (bool, np.bool_)) for v in observed):
+            self.kind = 'numeric'
+            integral = all(isinstance(v, (int, np.integer)) for v in observed)
+            dtype = np.int64 if integral else np.float64
+            self.values = np.array([v if has else 0 for v, has in zip(values, present)], dtype=dtype)
+            self.present = np.asarray(present, dtype=bool)
+            return
+
+        try:
+            self.categories = []
+            self.category_codes = {}
+            codes = [self._encode(v) if has else -1 for v, has in zip(values, present)]
+        except TypeError:
+            self.kind = 'object'
+            self.values = list(values)
+            self.present = np.asarray(present, dtype=bool)
+            return
+        self.kind = 'category'
+        self.codes = np.asarray(codes, dtype=np.int64)
+
+    def _encode(self, value):
+        """返回类别值的编码，新值追加到类别表末尾"""
+        code = self.category_codes.get(value)
+        if code is None:
+            code = len(self.categories)
+            self.categories.append(value)
+            self.category_codes[value] = code
+        return code
+
+    def __len__(self):
+        return len(self.codes) if self.kind == 'category' else len(self.present)
+
+    def mask(self):
+        """有此属性的行的布尔掩码"""
+        return self.codes >= 0 if self.kind == 'category' else self.present
+
+    def get(self, row):
+        """取某一行的原值"""
+        if self.kind == 'numeric':
+            return self.values[row].item()
+        if self.kind == 'category':
+            return self.categories[self.codes[row]]
+        return self.values[row]
+
+    def accepts(self, value) -> bool:
+        """该值能否原地写入本列而不改变列类型"""
+        if self.kind == 'numeric':
+            if not _is_number(value) or isinstance(value, (bool, np.bool_)):
+                return False
+            return self.values.dtype == np.float64 or isinstance(value, (int, np.integer))
+        if self.kind == 'category':
+            try:
+                hash(value)
+            except TypeError:
+                return False
+            return True
+        return True
+
+    def set(self, row, value):
+        """原地写入一行并维护哈希索引（调用前需保证 accepts(value)）"""
+        if self.index is not None:
+            self._unindex(row)
+        if self.kind == 'numeric':
+            self.values[row] = value
+            self.present[row] = True
+        elif self.kind == 'category':
+            self.codes[row] = self._encode(value)
+        else:
+            self.values[row] = value
+            self.present[row] = True
+        if self.index is not None:
+            self.index.setdefault(value, set()).add(row)
+
+    def _unindex(self, row):
+        """从哈希索引中移除某一行的旧值"""
+        if not self.mask()[row]:
+            return
+        old = self.get(row)
+        rows = self.index.get(old)
+        if rows is not None:
+            rows.discard(row)
+            if not rows:
+                del self.index[old]
+
+    def build_index(self):
+        """构建值到行号集合的哈希索引（仅数值列和类别列）"""
+        index = {}
+        if self.kind == 'category':
+            rows = np.flatnonzero(self.codes >= 0)
+            codes = self.codes[rows]
+            order = np.argsort(codes, kind='stable')
+            bounds = np.flatnonzero(np.diff(codes[order])) + 1
+            for group in np.split(rows[order], bounds):
+                if len(group):
+                    index[self.categories[self.codes[group[0]]]] = set(group.tolist())
+        elif self.kind == 'numeric':
+            rows = np.flatnonzero(self.present)
+            values, inverse = np.unique(self.values[rows], return_inverse=True)
+            order = np.argsort(inverse, kind='stable')
+            bounds = np.flatnonzero(np.diff(inverse[order])) + 1
+            for value, group in zip(values.tolist(), np.split(rows[order], bounds)):
+                if len(group):
+                    index[value] = set(group.tolist())
+        self.index = index
+
+    def counts(self) -> Counter:
+        """值的出现次数"""
+        if self.kind == 'category':
+            valid = self.codes[self.codes >= 0]
+            counts = np.bincount(valid, minlength=len(self.categories))
+            return Counter({self.categories[code]: int(n) for code, n in enumerate(counts) if n})
+        if self.kind == 'numeric':
+            values, counts = np.unique(self.values[self.present], return_counts=True)
+            return Counter(dict(zip(values.tolist(), counts.tolist())))
+        return Counter(value for value, has in zip(self.values, self.present) if has)
+
+    def numeric_values(self) -> np.ndarray:
+        """列中所有数值型取值组成的数组（用于统计摘要）"""
+        if self.kind == 'numeric':
+            return self.values[self.present]
+        if self.kind == 'category':
+            numeric = np.array([_is_number(v) for v in self.categories], dtype=bool)
+            if not numeric.any():
+                return np.empty(0)
+            lookup = np.array([v if ok else 0 for v, ok in zip(self.categories, numeric)], dtype=np.float64)
+            valid = self.codes[self.codes >= 0]
+            return lookup[valid[numeric[valid]]]
+        return np.array([v for v, has in zip(self.values, self.present) if has and _is_number(v)],
+                        dtype=np.float64)
+
+
+class AttributeStore:
+    """
+    节点或边属性的列式存储
+
+    每一行对应一个节点（或一条边），行号按插入顺序分配；每个属性一列，
+    数值属性（有功P/kW、length、Resistor 等）存为 NumPy 数组，
+    字符串等离散属性（type、which_substation、分段开关 等）存为类别编码。
+    等值查询使用按需构建、随更新增量维护的哈希索引，统计使用向量化运算。
+
+    原始的属性字典仍然是数据源：本类是从中派生的只读视图，
+    通过 UndirectedGraph 的属性更新方法修改时会同步更新，绕过这些方法直接修改字典后需要重建。
+    """
+
+    def __init__(self, records):
+        """
+        参数:
+            records: 可迭代对象，元素为 (键, 属性字典)，键为节点ID或边元组
+        """
+        records = list(records)
+        self.keys = [key for key, _ in records]
+        # 通过属性字典对象本身定位行，同一条边在不同位置出现时也不会混淆
+        self._row_of = {id(info): row for row, (_, info) in enumerate(records)}
+        self._infos = [info for _, info in records]
+
+        names = {}
+        for _, info in records:
+            for name in info:
+                names.setdefault(name, None)
+        self.columns = {}
+        for name in names:
+            present = [name in info for info in self._infos]
+            values = [info.get(name) for info in self._infos]
+            self.columns[name] = _Column(values, present)
+        logger.info(f"构建列式属性存储: {len(self.keys)} 行, {len(self.columns)} 列")
+
+    def __len__(self):
+        return len(self.keys)
+
+    def row_of(self, info):
+        """属性字典对应的行号，不存在时返回 None"""
+        return self._row_of.get(id(info))
+
+    def set(self, info, attribute, value):
+        """
+        同步一次属性更新
+
+        参数:
+            info: 已更新的属性字典
+            attribute: 属性名
+            value: 新的属性值
+        """
+        row = self._row_of.get(id(info))
+        if row is None:
+            return
+        column = self.columns.get(attribute)
+        if column is None:
+            present = [False] * len(self.keys)
+            present[row] = True
+            values = [None] * len(self.keys)
+            values[row] = value
+            self.columns[attribute] = _Column(values, present)
+        elif column.accepts(value):
+            column.set(row, value)
+        else:
+            # 值的类型与列不符（如数值列中写入字符串），从原始字典重建该列
+            present = [attribute in item for item in self._infos]
+            values = [item.get(attribute) for item in self._infos]
+            self.columns[attribute] = _Column(values, present)
+
+    def find(self, attribute, value) -> list:
+        """
+        查找属性等于给定值的所有行的键，按行号顺序返回
+
+        参数:
+            attribute: 属性名
+            value: 属性值
+        """
+        column = self.columns.get(attribute)
+        if column is None:
+            return []
+        if column.kind == 'object':
+            return [self.keys[row] for row in range(len(self.keys))
+                    if column.present[row] and column.values[row] == value]
+        if column.index is None:
+            column.build_index()
+        try:
+            rows = column.index.get(value, ())
+        except TypeError:
+            return []
+        return [self.keys[row] for row in sorted(rows)]
+
+    def counts(self, attribute) -> Counter:
+        """属性值的出现次数"""
+        column = self.columns.get(attribute)
+        return column.counts() if column is not None else Counter()
+
+    def attributes(self) -> list:
+        """所有属性名（按首次出现的顺序）"""
+        return list(self.columns)
+
+    def numeric_values(self, attribute) -> np.ndarray:
+        """属性的所有数值型取值"""
+        column = self.columns.get(attribute)
+        return column.numeric_values() if column is not None else np.empty(0)
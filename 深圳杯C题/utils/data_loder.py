@@ -8,10 +8,11 @@ import numpy as np
 import matplotlib.pyplot as plt  
 from collections import deque 
 import json 
+import os
 from loguru import logger
 
-edges_file = '深圳杯C题\\data_file\\edges_info.json'
-nodes_file = '深圳杯C题\\data_file\\nodes_info.json'
+edges_file = os.path.join('深圳杯C题', 'data_file', 'edges_info.json')
+nodes_file = os.path.join('深圳杯C题', 'data_file', 'nodes_info.json')
 
 try:
     logger.info(f"Opening edges file: {edges_file}")
@@ -0,0 +1,133 @@
+from loguru import logger
+
+
+# loguru 内置日志级别对应的数值
+_LEVELS = {
+    'TRACE': 5,
+    'DEBUG': 10,
+    'INFO': 20,
+    'SUCCESS': 25,
+    'WARNING': 30,
+    'ERROR': 40,
+    'CRITICAL': 50,
+}
+
+
+class HotPathLog:
+    """
+    热路径日志
+
+    UndirectedGraph 的查询方法（neighbors、get_edge、get_edge_attribute 等）和 RiskAnalyzer
+    的逐边/逐节点计算在扫描中会被调用成千上万次。默认模式下行为与直接使用 loguru 相同：
+    每条日志都格式化后交给 logger，查询方法出错时同时 print 到控制台。
+
+    开启快速模式后：
+        - 低于 level 的日志直接跳过，不会格式化消息、也不会进入 loguru 的分发流程；
+        - 查询方法不再 print；
+        - 可选的采样跟踪通道：被跳过的日志每 trace_every 条采样一条，
+          交给 trace_sink（可调用对象，参数为格式化后的消息），
+          未指定 trace_sink 时以 DEBUG 级别写入 loguru，并带有 extra['channel'] = 'hot_path_trace'，
+          可通过 logger.add(..., filter=lambda r: r['extra'].get('channel') == 'hot_path_trace') 单独收集。
+
+    消息以 str.format 模板加参数的形式传入，只有在确实需要输出时才格式化。
+    """
+
+    TRACE_CHANNEL = 'hot_path_trace'
+
+    def __init__(self):
+        self.fast = False
+        self.threshold = 0
+        self.trace_every = 0
+        self.trace_sink = None
+        self._skipped = 0
+
+    def enable(self, level: str = 'WARNING', trace_every: int = 0, trace_sink=None):
+        """
+        开启快速模式
+
+        参数:
+            level: 输出的最低日志级别，应与 loguru 处理器的级别一致
+            trace_every: 采样间隔，被跳过的日志每 trace_every 条输出一条，0 表示不采样
+            trace_sink: 采样日志的接收函数，为 None 时写入 loguru 的跟踪通道
+        """
+        self.fast = True
+        self.threshold = _LEVELS[level.upper()]
+        self.trace_every = int(trace_every)
+        self.trace_sink = trace_sink
+        self._skipped = 0
+
+    def disable(self):
+        """关闭快速模式，恢复默认行为"""
+        self.fast = False
+        self.threshold = 0
+        self.trace_every = 0
+        self.trace_sink = None
+
+    def enabled(self, level: str) -> bool:
+        """判断该级别的日志是否会被输出，用于在调用方跳过昂贵的消息参数计算"""
+        return not self.fast or _LEVELS[level] >= self.threshold
+
+    def log(self, level: str, message: str, *args):
+        """
+        按级别输出日志
+
+        参数:
+            level: 日志级别名（大写）
+            message: 消息模板，使用 {} 占位
+            args: 模板参数，仅在输出时格式化
+        """
+        if self.fast and _LEVELS[level] < self.threshold:
+            if self.trace_every:
+                self._sample(message, args)
+            return
+        logger.opt(depth=2).log(level, message.format(*args) if args else message)
+
+    def _sample(self, message, args):
+        """采样跟踪通道：每 trace_every 条被跳过的日志输出一条"""
+        self._skipped += 1
+        if self._skipped < self.trace_every:
+            return
+        self._skipped = 0
+        text = message.format(*args) if args else message
+        if self.trace_sink is not None:
+            self.trace_sink(text)
+        else:
+            logger.opt(depth=3).bind(channel=self.TRACE_CHANNEL).debug(text)
+
+    def debug(self, message: str, *args):
+        self.log('DEBUG', message, *args)
+
+    def info(self, message: str, *args):
+        self.log('INFO', message, *args)
+
+    def warning(self, message: str, *args):
+        self.log('WARNING', message, *args)
+
+    def error(self, message: str, *args):
+        self.log('ERROR', message, *args)
+
+    def echo(self, message: str, *args):
+        """查询方法中的控制台输出，快速模式下不输出"""
+        if not self.fast:
+            print(message.format(*args) if args else message)
+
+
+# 全局共享的热路径日志对象
+hot_log = HotPathLog()
+
+
+def enable_fast_logging(level: str = 'WARNING', trace_every: int = 0, trace_sink=None):
+    """
+    开启热路径快速日志模式，参数见 HotPathLog.enable
+
+    示例:
+        logger.remove()
+        logger.add(sys.stderr, level="WARNING")
+        enable_fast_logging("WARNING", trace_every=1000)
+    """
+    hot_log.enable(level, trace_every, trace_sink)
+
+
+def disable_fast_logging():
+    """关闭热路径快速日志模式"""
+    hot_log.disable()
@@ -0,0 +1,778 @@
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.util import Finalize
+
+from utils.topology import CSRTopology
+from utils.shared_topology import SharedTopology, attach
+from utils.hot_log import hot_log
+
+
+# 自动选择求解算法的阈值：节点数不超过该值时使用 Edmonds-Karp
+AUTO_SMALL_NODES = 200
+# 平均度（弧数/节点数）低于该值时视为辐射状（树状）网络，使用 Edmonds-Karp
+AUTO_RADIAL_DEGREE = 2.5
+
+
+class ResidualNetwork:
+    """
+    编译好的残量网络，供反复求解最大流使用
+
+    网络结构直接复用 CSRTopology 的邻接槽位：槽位 s 是一条有向弧，
+    arc_reverse[s] 为其反向弧。每条无向边两个方向的初始容量相同（capacity[arc_edge[s]]），
+    被屏蔽的边（如不启用联络线时的联络线）预先标记在 blocked 数组中。
+    每次求解前原地把剩余容量恢复为初始容量，不再重新查询边属性、重新计算容量。
+    纯 Python 的求解循环通过 memoryview 逐元素访问拓扑数组，不复制为 Python 列表：
+    拓扑挂载自共享内存时（见 parallel_max_flow_table），工作进程直接读取共享数组，
+    每个网络只额外持有按槽位的初始容量、屏蔽标记和剩余容量三个紧凑数组。
+
+    提供三种求解算法，通过 max_flow 的 method 参数（或 self.method）选择：
+        'edmonds_karp': Edmonds-Karp，O(VE^2)，实现最简单，作为参考实现
+        'dinic': Dinic 分层图阻塞流，O(V^2 E)，适合大规模稀疏网络（如辐射状馈线）
+        'push_relabel': 最高标号推流重标记（含间隙优化），O(V^2 sqrt(E))，适合稠密网络
+        'auto': 按网络规模和密度自动选择（见 select_method）
+    parity 为 True 时每次求解都用 Edmonds-Karp 复核结果，不一致时记录错误并返回参考结果。
+    """
+
+    METHODS = ('edmonds_karp', 'dinic', 'push_relabel')
+
+    def __init__(self, topology: CSRTopology, edge_capacity, blocked_edges=None,
+                 method: str = 'auto', parity: bool = False):
+        """
+        参数:
+            topology: CSR 拓扑
+            edge_capacity: 按边编号的容量数组
+            blocked_edges: 按边编号的布尔数组，True 表示求解时可选择屏蔽该边；None 表示没有
+            method: 默认的求解算法，可选 'auto'、'edmonds_karp'、'dinic'、'push_relabel'
+            parity: 是否用 Edmonds-Karp 复核每次求解的结果
+        """
+        self.topology = topology
+        self.method = method
+        self.parity = parity
+        self.edge_capacity = np.asarray(edge_capacity, dtype=np.float64)
+        # 每个槽位的初始容量
+        self.arc_capacity = self.edge_capacity[topology.arc_edge]
+        if blocked_edges is None:
+            blocked_edges = np.zeros(topology.num_edges, dtype=bool)
+        self.blocked_edges = np.asarray(blocked_edges, dtype=bool)
+        self.blocked = self.blocked_edges[topology.arc_edge]
+        self._residual = self.arc_capacity.copy()
+        self._seen = [0] * topology.num_nodes
+        self._stamp = 0
+        # 每个槽位是否为其边的正方向弧（edge_u -> edge_v），用于在按边编号的流量和各弧的剩余容量之间换算
+        tails = np.repeat(np.arange(topology.num_nodes), np.diff(topology.indptr))
+        self._forward = tails == topology.edge_u[topology.arc_edge]
+        self._bind_views()
+
+    def _bind_views(self):
+        """
+        建立求解循环使用的 memoryview：逐元素访问与 Python 列表相近，
+        但直接引用底层数组（包括只读的共享内存数组）而不复制；切片仍是视图，需要可写副本时用 tolist()。
+        residual 是可写的剩余容量视图
+        """
+        topology = self.topology
+        # 结构视图只读：误写（如对切片赋值）会直接报错，而不是悄悄改动拓扑
+        self._indptr = memoryview(np.ascontiguousarray(topology.indptr)).toreadonly()
+        self._indices = memoryview(np.ascontiguousarray(topology.indices)).toreadonly()
+        self._arc_reverse = memoryview(np.ascontiguousarray(topology.arc_reverse)).toreadonly()
+        self._blocked = memoryview(self.blocked).toreadonly()
+        self.residual = memoryview(self._residual)
+
+    def __getstate__(self):
+        """memoryview 不能序列化和深复制，复制时去掉，恢复后重新建立"""
+        state = self.__dict__.copy()
+        for name in ('_indptr', '_indices', '_arc_reverse', '_blocked', 'residual'):
+            del state[name]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._bind_views()
+
+    def reset(self):
+        """原地把剩余容量恢复为初始容量"""
+        np.copyto(self._residual, self.arc_capacity)
+
+    def _start(self, s: int, t: int, use_blocked: bool, initial_flow) -> float:
+        """求解前初始化剩余容量：从零流开始，或载入给定的可行流（热启动），返回初始流值"""
+        self.reset()
+        if initial_flow is None or s == t:
+            return 0.0
+        value = self.flow_value(initial_flow, s, t, use_blocked)
+        if value is None:
+            hot_log.debug("热启动流不可行，从零流开始求解 {} -> {}", s, t)
+            return 0.0
+        arc_flow = np.asarray(initial_flow, dtype=np.float64)[self.topology.arc_edge]
+        residual = self.arc_capacity - np.where(self._forward, arc_flow, -arc_flow)
+        np.maximum(residual, 0.0, out=self._residual)
+        return value
+
+    def flow_value(self, flow, s: int, t: int, use_blocked: bool = False):
+        """
+        检查按边编号的流量是否为本网络中 s 到 t 的可行流（满足容量约束和流量守恒）
+
+        参数:
+            flow: 按边编号的流量数组，正值表示从 edge_u 流向 edge_v
+            s, t: 源点和汇点的节点索引
+            use_blocked: 是否允许使用被屏蔽的边
+
+        返回:
+            可行时返回流值（s 的净流出量），否则返回 None
+        """
+        topology = self.topology
+        flow = np.asarray(flow, dtype=np.float64)
+        tol = 1e-9 * max(1.0, float(np.abs(self.edge_capacity).max(initial=0.0)))
+        if np.any(np.abs(flow) > self.edge_capacity + tol):
+            return None
+        if not use_blocked and np.any(flow[self.blocked_edges] != 0):
+            return None
+        n = topology.num_nodes
+        net = np.bincount(topology.edge_u, flow, n) - np.bincount(topology.edge_v, flow, n)
+        value = float(net[s])
+        net[[s, t]] = 0.0
+        if np.any(np.abs(net) > tol):
+            return None
+        return value
+
+    def edge_flow(self, s: int, t: int):
+        """
+        上一次求解得到的各边流量
+
+        参数:
+            s, t: 上一次求解的源点和汇点
+
+        返回:
+            按边编号的流量数组，正值表示从 edge_u 流向 edge_v；
+            上一次求解得到的不是可行流时（推流重标记只求出最大预流）返回 None
+        """
+        arc_flow = self.arc_capacity - self._residual
+        flow = np.zeros(self.topology.num_edges)
+        flow[self.topology.arc_edge[self._forward]] = arc_flow[self._forward]
+        if self.flow_value(flow, s, t, use_blocked=True) is None:
+            return None
+        return flow
+
+    def map_flow(self, sparse_flow):
+        """
+        把以端点表示的流量映射为本网络按边编号的流量数组，用于把其他网络（如修改前的网络）上求得的流作为热启动
+
+        参数:
+            sparse_flow: (起点索引数组, 终点索引数组, 流量数组)，表示各对端点之间的流量；可以为 None
+
+        返回:
+            按边编号的流量数组；sparse_flow 为 None 或某对端点之间没有边时返回 None
+        """
+        if sparse_flow is None:
+            return None
+        topology = self.topology
+        edge_u = topology.edge_u
+        flow = np.zeros(topology.num_edges)
+        for u, v, value in zip(*(array.tolist() for array in sparse_flow)):
+            e = topology.edge_between(u, v)
+            if e is None:
+                return None
+            flow[e] += value if edge_u[e] == u else -value
+        return flow
+
+    def set_capacity(self, edge_capacity):
+        """
+        替换各边的初始容量，网络结构和屏蔽标记不变（用于参数化求解）
+
+        参数:
+            edge_capacity: 按边编号的容量数组
+        """
+        self.edge_capacity = np.asarray(edge_capacity, dtype=np.float64)
+        self.arc_capacity = self.edge_capacity[self.topology.arc_edge]
+        self.reset()
+
+    def select_method(self) -> str:
+        """
+        自动选择求解算法
+
+        实测（纯 Python 实现）：小规模网络各算法差别不大，Edmonds-Karp 常数最小；
+        辐射状馈线（平均度约为2，增广路径少）上 Edmonds-Karp 最快，Dinic 次之；
+        有环的网格状、稠密网络上推流重标记最快，Dinic 次之，Edmonds-Karp 最慢。
+        """
+        n = self.topology.num_nodes
+        if n <= AUTO_SMALL_NODES:
+            return 'edmonds_karp'
+        if len(self._indices) / max(n, 1) < AUTO_RADIAL_DEGREE:
+            return 'edmonds_karp'
+        return 'push_relabel'
+
+    def max_flow(self, s: int, t: int, use_blocked: bool = False, method: str = None,
+                 initial_flow=None) -> float:
+        """
+        求 s 到 t 的最大流
+
+        参数:
+            s, t: 源点和汇点的节点索引
+            use_blocked: 是否允许使用被屏蔽的边
+            method: 求解算法，None 表示使用 self.method
+            initial_flow: 热启动的初始流（按边编号的流量数组，见 edge_flow），从它出发继续增广；
+                          不是本网络中的可行流时从零流开始。推流重标记不支持热启动，此时改用 Dinic
+
+        返回:
+            最大流值
+        """
+        method = method or self.method
+        if method == 'auto':
+            method = self.select_method()
+        if method not in self.METHODS:
+            raise ValueError(f"不支持的最大流算法: {method}，可选: {list(self.METHODS) + ['auto']}")
+        if initial_flow is None:
+            flow = getattr(self, method)(s, t, use_blocked)
+        else:
+            if method == 'push_relabel':
+                method = 'dinic'
+            flow = getattr(self, method)(s, t, use_blocked, initial_flow=initial_flow)
+        if self.parity and (method != 'edmonds_karp' or initial_flow is not None):
+            reference = self.edmonds_karp(s, t, use_blocked)
+            if not np.isclose(flow, reference, rtol=1e-9, atol=1e-9):
+                hot_log.error("最大流结果不一致 {} -> {}: {} 得到 {}，Edmonds-Karp 得到 {}",
+                              s, t, method, flow, reference)
+                return reference
+        return flow
+
+    def edmonds_karp(self, s: int, t: int, use_blocked: bool = False, initial_flow=None) -> float:
+        """
+        Edmonds-Karp 算法求 s 到 t 的最大流
+
+        参数:
+            s, t: 源点和汇点的节点索引
+            use_blocked: 是否允许使用被屏蔽的边
+            initial_flow: 热启动的初始流（见 max_flow）
+
+        返回:
+            最大流值
+        """
+        max_flow = self._start(s, t, use_blocked, initial_flow)
+        if s == t:
+            return 0.0
+        indptr, indices, reverse = self._indptr, self._indices, self._arc_reverse
+        residual = self.residual
+        blocked = None if use_blocked else self._blocked
+        seen = self._seen
+        parent_arc = [-1] * len(seen)
+
+        while True:
+            # BFS 寻找增广路径，seen 用递增的时间戳标记本轮已访问的节点，无需每轮清空
+            self._stamp += 1
+            stamp = self._stamp
+            seen[s] = stamp
+            queue = [s]
+            found = False
+            for u in queue:
+                for slot in range(indptr[u], indptr[u + 1]):
+                    v = indices[slot]
+                    # 只考虑有剩余容量且未被屏蔽的弧
+                    if seen[v] != stamp and residual[slot] > 0:
+                        if blocked is not None and blocked[slot]:
+                            continue
+                        seen[v] = stamp
+                        parent_arc[v] = slot
+                        if v == t:
+                            found = True
+                            break
+                        queue.append(v)
+                if found:
+                    break
+            if not found:
+                break
+
+            # 回溯路径，找到路径上的最小剩余容量
+            path = []
+            current = t
+            while current != s:
+                slot = parent_arc[current]
+                path.append(slot)
+                current = indices[reverse[slot]]
+            path_flow = float("inf")
+            for slot in reversed(path):
+                path_flow = min(path_flow, residual[slot])
+            if path_flow == 0:
+                break
+            # 更新残量网络
+            for slot in reversed(path):
+                residual[slot] -= path_flow
+                residual[reverse[slot]] += path_flow
+            max_flow += path_flow
+
+        hot_log.debug("最大流 {} -> {}: {}", s, t, max_flow)
+        return max_flow
+
+    def dinic(self, s: int, t: int, use_blocked: bool = False, initial_flow=None) -> float:
+        """
+        Dinic 算法求 s 到 t 的最大流：BFS 构建分层图，再用当前弧指针的迭代式 DFS 求阻塞流
+
+        参数:
+            s, t: 源点和汇点的节点索引
+            use_blocked: 是否允许使用被屏蔽的边
+            initial_flow: 热启动的初始流（见 max_flow）
+
+        返回:
+            最大流值
+        """
+        max_flow = self._start(s, t, use_blocked, initial_flow)
+        if s == t:
+            return 0.0
+        indptr, indices, reverse = self._indptr, self._indices, self._arc_reverse
+        residual = self.residual
+        blocked = None if use_blocked else self._blocked
+        n = len(self._seen)
+
+        while True:
+            # BFS 构建分层图
+            level = [-1] * n
+            level[s] = 0
+            queue = [s]
+            for u in queue:
+                next_level = level[u] + 1
+                for slot in range(indptr[u], indptr[u + 1]):
+                    v = indices[slot]
+                    if level[v] < 0 and residual[slot] > 0:
+                        if blocked is not None and blocked[slot]:
+                            continue
+                        level[v] = next_level
+                        queue.append(v)
+            if level[t] < 0:
+                break
+
+            # 在分层图上反复寻找增广路径，current[u] 为节点 u 下一条待检查的弧
+            current = indptr[:n].tolist()
+            path = []
+            u = s
+            while True:
+                if u == t:
+                    path_flow = min(residual[slot] for slot in path)
+                    for slot in path:
+                        residual[slot] -= path_flow
+                        residual[reverse[slot]] += path_flow
+                    max_flow += path_flow
+                    path = []
+                    u = s
+                    continue
+                end = indptr[u + 1]
+                slot = current[u]
+                next_level = level[u] + 1
+                while slot < end:
+                    v = indices[slot]
+                    if level[v] == next_level and residual[slot] > 0 and \
+                            (blocked is None or not blocked[slot]):
+                        break
+                    slot += 1
+                current[u] = slot
+                if slot < end:
+                    path.append(slot)
+                    u = indices[slot]
+                    continue
+                # u 已无法再到达汇点，从分层图中删除并回退一步
+                if u == s:
+                    break
+                level[u] = -1
+                slot = path.pop()
+                u = indices[reverse[slot]]
+                current[u] += 1
+
+        hot_log.debug("最大流(Dinic) {} -> {}: {}", s, t, max_flow)
+        return max_flow
+
+    def push_relabel(self, s: int, t: int, use_blocked: bool = False) -> float:
+        """
+        最高标号推流重标记算法求 s 到 t 的最大流值（只执行第一阶段，求出最大预流）
+
+        高度初始化为到汇点的残量距离（全局重标记），并使用间隙优化：
+        某个高度上没有节点时，高于它的节点都无法再到达汇点，直接抬升到 n。
+
+        参数:
+            s, t: 源点和汇点的节点索引
+            use_blocked: 是否允许使用被屏蔽的边
+
+        返回:
+            最大流值
+        """
+        self.reset()
+        if s == t:
+            return 0.0
+        indptr, indices, reverse = self._indptr, self._indices, self._arc_reverse
+        residual = self.residual
+        blocked = None if use_blocked else self._blocked
+        n = len(self._seen)
+
+        # 全局重标记：从汇点出发沿反向残量弧 BFS，得到每个节点到汇点的距离
+        height = [n] * n
+        height[t] = 0
+        queue = [t]
+        for v in queue:
+            for slot in range(indptr[v], indptr[v + 1]):
+                u = indices[slot]
+                back = reverse[slot]
+                if height[u] == n and u != s and residual[back] > 0:
+                    if blocked is not None and blocked[back]:
+                        continue
+                    height[u] = height[v] + 1
+                    queue.append(u)
+        height[s] = n
+
+        count = [0] * (2 * n + 1)
+        for h in height:
+            count[h] += 1
+        excess = [0.0] * n
+        buckets = [[] for _ in range(n)]
+        highest = -1
+
+        # 从源点出发的弧全部推满
+        for slot in range(indptr[s], indptr[s + 1]):
+            if residual[slot] > 0 and (blocked is None or not blocked[slot]):
+                v = indices[slot]
+                delta = residual[slot]
+                residual[slot] = 0.0
+                residual[reverse[slot]] += delta
+                if excess[v] == 0 and v != t and height[v] < n:
+                    buckets[height[v]].append(v)
+                    highest = max(highest, height[v])
+                excess[v] += delta
+
+        current = indptr[:n].tolist()
+        while highest >= 0:
+            if not buckets[highest]:
+                highest -= 1
+                continue
+            u = buckets[highest].pop()
+            if height[u] != highest:
+                # 已被间隙优化抬升，不再活跃
+                continue
+
+            # 释放节点 u 的全部盈余
+            while excess[u] > 0:
+                slot = current[u]
+                if slot == indptr[u + 1]:
+                    # 重标记：高度抬升为可推流邻居的最小高度加一
+                    old = height[u]
+                    new = 2 * n
+                    for arc in range(indptr[u], indptr[u + 1]):
+                        if residual[arc] > 0 and (blocked is None or not blocked[arc]):
+                            new = min(new, height[indices[arc]] + 1)
+                    count[old] -= 1
+                    if count[old] == 0 and old < n:
+                        # 间隙优化
+                        for w in range(n):
+                            if old < height[w] < n:
+                                count[height[w]] -= 1
+                                height[w] = n
+                                count[n] += 1
+                        new = max(new, n)
+                    height[u] = min(new, n)
+                    count[height[u]] += 1
+                    current[u] = indptr[u]
+                    if height[u] >= n:
+                        break
+                    highest = height[u]
+                    continue
+                v = indices[slot]
+                if residual[slot] > 0 and height[u] == height[v] + 1 and \
+                        (blocked is None or not blocked[slot]):
+                    delta = min(excess[u], residual[slot])
+                    residual[slot] -= delta
+                    residual[reverse[slot]] += delta
+                    excess[u] -= delta
+                    if excess[v] == 0 and v != t and v != s:
+                        buckets[height[v]].append(v)
+                    excess[v] += delta
+                else:
+                    current[u] = slot + 1
+
+        max_flow = excess[t]
+        hot_log.debug("最大流(推流重标记) {} -> {}: {}", s, t, max_flow)
+        return max_flow
+
+    def cut_side(self, t: int, use_blocked: bool = False) -> list:
+        """
+        最大流（或最大预流）求解后得到一个最小割：残量网络中能到达汇点 t 的节点为汇点一侧，其余为源点一侧
+
+        参数:
+            t: 汇点的节点索引（应与上一次求解的汇点相同）
+            use_blocked: 是否允许使用被屏蔽的边（应与上一次求解一致）
+
+        返回:
+            布尔列表（按节点索引），True 表示在源点一侧
+        """
+        indptr, indices, reverse = self._indptr, self._indices, self._arc_reverse
+        residual = self.residual
+        blocked = None if use_blocked else self._blocked
+        sink_side = [False] * len(self._seen)
+        sink_side[t] = True
+        queue = [t]
+        for v in queue:
+            for slot in range(indptr[v], indptr[v + 1]):
+                u = indices[slot]
+                back = reverse[slot]
+                # 弧 u -> v 仍有剩余容量，则 u 也能到达汇点
+                if not sink_side[u] and residual[back] > 0:
+                    if blocked is not None and blocked[back]:
+                        continue
+                    sink_side[u] = True
+                    queue.append(u)
+        return [not side for side in sink_side]
+
+
+class GomoryHuTree:
+    """
+    Gomory-Hu 割树（Gusfield 算法）
+
+    对容量对称的无向网络，只需 N-1 次最大流计算即可构建一棵树，
+    任意两点间的最大流等于树上两点路径中最小的边权；删去树边 (i, parent[i]) 后树分成的两部分
+    就是原网络中 i 与 parent[i] 之间的一个最小割，割容量为 weight[i]。
+    节点 0 为树根（parent[0] == 0），查询时沿父指针向上走到最近公共祖先，耗时 O(树深度)。
+    构建时同时保存每条树边对应的最大流，网络局部修改后 updated 据此增量更新。
+    """
+
+    def __init__(self, network: ResidualNetwork, use_blocked: bool = False):
+        """
+        参数:
+            network: 编译好的残量网络
+            use_blocked: 是否允许使用被屏蔽的边（如是否启用联络线）
+        """
+        n = network.topology.num_nodes
+        parent = [0] * n
+        weight = [0.0] * n
+        flows = [None] * n
+        for i in range(1, n):
+            # 求 i 与其当前父节点之间的最小割
+            p = parent[i]
+            weight[i] = network.max_flow(i, p, use_blocked=use_blocked)
+            flows[i] = self._sparse_flow(network, i, p)
+            side = network.cut_side(p, use_blocked=use_blocked)
+            # 与 i 同父且位于 i 一侧的节点改挂到 i 下面
+            for j in range(n):
+                if j != i and parent[j] == p and side[j]:
+                    parent[j] = i
+            # p 的父节点也在 i 一侧时，i 接替 p 挂到原来的位置，p 改挂到 i 下面
+            if side[parent[p]]:
+                parent[i] = parent[p]
+                parent[p] = i
+                weight[i], weight[p] = weight[p], weight[i]
+                # 原 p 的流不是 i 与新父节点之间的流；i 到 p 的流反过来即为 p 到其新父节点 i 的流
+                flow = flows[i]
+                flows[i] = None
+                flows[p] = None if flow is None else (flow[1], flow[0], flow[2])
+        self.use_blocked = use_blocked
+        self._set_tree(parent, weight, flows)
+
+    def _set_tree(self, parent, weight, flows):
+        """设置父指针、树边权值和各树边的流，并计算各节点的深度"""
+        n = len(parent)
+        depth = [-1] * n
+        if n:
+            depth[0] = 0
+        for i in range(n):
+            chain = []
+            j = i
+            while depth[j] < 0:
+                chain.append(j)
+                j = parent[j]
+            for j in reversed(chain):
+                depth[j] = depth[parent[j]] + 1
+        self.parent = parent
+        self.weight = weight
+        self.flows = flows
+        self.depth = depth
+
+    @staticmethod
+    def _sparse_flow(network: ResidualNetwork, s: int, t: int):
+        """上一次求解的流，只保存流量非零的边：(起点索引数组, 终点索引数组, 流量数组)；不是可行流时为 None"""
+        flow = network.edge_flow(s, t)
+        if flow is None:
+            return None
+        nonzero = np.flatnonzero(flow)
+        topology = network.topology
+        return topology.edge_u[nonzero], topology.edge_v[nonzero], flow[nonzero]
+
+    def updated(self, network: ResidualNetwork, changes):
+        """
+        网络局部修改（如开关操作增删线路）后增量更新割树，得到新网络的割树
+
+        每条树边对应一个最小割，各项修改跨过哪些割由其两个端点在树上的路径直接得到，
+        据此可以算出每个割在新网络中的容量，再按以下顺序判断它是否仍为最小割：
+        1. 割跨过了全部减少的容量、且没有跨过增加的容量：新的最大流不小于原值减去减少的总容量，
+           恰好等于割容量，无需求解；
+        2. 保存的最大流在新网络中仍可行、且流值等于割容量：无需求解；
+        3. 其余树边在新网络上重新求解最大流，保存的流仍可行时（如容量只增不减）从它出发继续增广（热启动）。
+           求得的最大流等于割容量时只更新权值，否则树的结构需要改变，在新网络上重新构建整棵树。
+
+        参数:
+            network: 修改后的残量网络，节点索引须与原网络一致
+            changes: 列表，元素为 (u, v, delta)：节点 u、v（节点索引）之间可用容量的变化量，增加为正、减少为负；
+                     对本树不可用的边（如不启用联络线时的联络线）不应计入
+
+        返回:
+            (新的割树, 统计字典)，统计字典包含:
+            certified: 无需求解即可确定的树边数
+            solved: 重新求解最大流的树边数
+            warm_started: 其中从保存的流热启动的次数
+            rebuilt: 是否在新网络上重新构建了整棵树
+        """
+        use_blocked = self.use_blocked
+        parent, depth = self.parent, self.depth
+        n = len(parent)
+        removed_across = [0.0] * n
+        added_across = [0.0] * n
+        removed_total = 0.0
+        for u, v, delta in changes:
+            if delta < 0:
+                removed_total -= delta
+            # 树上 u 到 v 路径上的每条树边，其对应的割都跨过这项修改
+            while u != v:
+                if depth[u] < depth[v]:
+                    u, v = v, u
+                if delta < 0:
+                    removed_across[u] -= delta
+                else:
+                    added_across[u] += delta
+                u = parent[u]
+
+        stats = {'certified': 0, 'solved': 0, 'warm_started': 0, 'rebuilt': False}
+        weight = list(self.weight)
+        flows = list(self.flows)
+        for i in range(n):
+            p = parent[i]
+            if p == i:
+                continue
+            cut = self.weight[i] - removed_across[i] + added_across[i]
+            if added_across[i] == 0 and np.isclose(removed_across[i], removed_total, rtol=1e-9, atol=1e-9):
+                weight[i] = cut
+                if removed_total > 0:
+                    flows[i] = None
+                stats['certified'] += 1
+                continue
+            initial_flow = network.map_flow(self.flows[i])
+            value = None if initial_flow is None else network.flow_value(initial_flow, i, p, use_blocked)
+            if value is not None and np.isclose(value, cut, rtol=1e-9, atol=1e-9):
+                weight[i] = cut
+                stats['certified'] += 1
+                continue
+            stats['solved'] += 1
+            if value is not None:
+                stats['warm_started'] += 1
+            else:
+                initial_flow = None
+            flow = network.max_flow(i, p, use_blocked=use_blocked, initial_flow=initial_flow)
+            if not np.isclose(flow, cut, rtol=1e-9, atol=1e-9):
+                # 原来的割不再是最小割，树的结构需要改变
+                hot_log.debug("割树边 {} -> {} 的最小割改变（割容量 {}，最大流 {}），重新构建", i, p, cut, flow)
+                tree = GomoryHuTree(network, use_blocked=use_blocked)
+                stats['rebuilt'] = True
+                return tree, stats
+            weight[i] = flow
+            flows[i] = self._sparse_flow(network, i, p)
+
+        tree = GomoryHuTree.__new__(GomoryHuTree)
+        tree.use_blocked = use_blocked
+        tree._set_tree(list(parent), weight, flows)
+        return tree, stats
+
+    def max_flow(self, u: int, v: int) -> float:
+        """
+        查询两点间的最大流
+
+        参数:
+            u, v: 节点索引
+
+        返回:
+            最大流值，u == v 时返回 0
+        """
+        if u == v:
+            return 0.0
+        parent, weight, depth = self.parent, self.weight, self.depth
+        flow = float("inf")
+        while u != v:
+            if depth[u] < depth[v]:
+                u, v = v, u
+            flow = min(flow, weight[u])
+            u = parent[u]
+        return flow
+
+
+def max_flow_table(network: ResidualNetwork, sources, targets, use_blocked: bool = False) -> np.ndarray:
+    """
+    逐对求解最大流，得到目标节点 × 源点的最大流表
+
+    参数:
+        network: 编译好的残量网络
+        sources: 源点的节点索引列表，元素为 None 时该列为 0
+        targets: 目标节点的节点索引列表
+        use_blocked: 是否允许使用被屏蔽的边
+
+    返回:
+        NumPy 数组，形状为 (len(targets), len(sources))，源点与目标相同时为 0
+    """
+    table = np.zeros((len(targets), len(sources)))
+    for row, t in enumerate(targets):
+        for column, s in enumerate(sources):
+            if s is not None and s != t:
+                table[row, column] = network.max_flow(s, t, use_blocked=use_blocked)
+    return table
+
+
+# 进程池工作进程中编译好的残量网络和挂载的共享内存拓扑，由初始化函数构建，每个进程只构建一次
+_worker_network = None
+_worker_shared = None
+
+
+def _init_table_worker(handle, method, parity):
+    """进程池初始化函数：挂载共享内存中的拓扑、容量和屏蔽标记（不复制），编译残量网络"""
+    global _worker_network, _worker_shared
+    _worker_shared = attach(handle)
+    columns = _worker_shared.columns
+    _worker_network = ResidualNetwork(_worker_shared.topology, columns['edge_capacity'],
+                                      blocked_edges=columns['blocked'], method=method, parity=parity)
+    Finalize(None, _close_table_worker, exitpriority=10)
+
+
+def _close_table_worker():
+    """工作进程退出时先释放对共享数组的引用，再解除映射"""
+    global _worker_network, _worker_shared
+    _worker_network = None
+    if _worker_shared is not None:
+        _worker_shared.close()
+        _worker_shared = None
+
+
+def _table_chunk(task):
+    """工作进程中求解一组目标节点的最大流表"""
+    sources, targets, use_blocked = task
+    return max_flow_table(_worker_network, sources, targets, use_blocked)
+
+
+def parallel_max_flow_table(network: ResidualNetwork, sources, use_blocked: bool = False,
+                            workers: int = 1, chunks_per_worker: int = 4) -> np.ndarray:
+    """
+    所有节点 × 源点的最大流表，按目标节点分块分发到进程池中求解
+
+    拓扑、容量和屏蔽标记在进程池存续期间发布到共享内存中，工作进程挂载只读视图（不复制），
+    残量网络直接在共享数组上求解，每个进程只另外持有按槽位的容量、屏蔽标记和剩余容量三个数组；
+    句柄不带节点ID和边元组，通过初始化函数发送给每个工作进程一次，各块只传递节点索引；
+    每个表项都由同一算法在同一容量上独立求解，按节点顺序拼接后与 workers=1 的结果逐位相同。
+
+    参数:
+        network: 编译好的残量网络（提供拓扑、容量、求解算法和复核模式）
+        sources: 源点的节点索引列表，元素为 None 时该列为 0
+        use_blocked: 是否允许使用被屏蔽的边
+        workers: 进程数，不超过 1 时在当前进程中顺序求解
+        chunks_per_worker: 每个进程平均分到的块数
+
+    返回:
+        NumPy 数组，形状为 (节点数, len(sources))
+    """
+    n = network.topology.num_nodes
+    if workers <= 1 or n <= 1:
+        return max_flow_table(network, sources, range(n), use_blocked)
+
+    parts = np.array_split(np.arange(n), min(n, workers * chunks_per_worker))
+    tasks = [(list(sources), part.tolist(), use_blocked) for part in parts]
+    columns = {'edge_capacity': network.edge_capacity, 'blocked': network.blocked_edges}
+    # 工作进程只按节点索引求解，不需要节点ID和边元组
+    with SharedTopology(network.topology, columns, with_ids=False) as shared:
+        initargs = (shared.handle, network.method, network.parity)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_table_worker, initargs=initargs) as executor:
+            blocks = list(executor.map(_table_chunk, tasks))
+    return np.vstack(blocks)
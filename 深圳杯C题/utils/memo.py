@@ -0,0 +1,158 @@
+from collections import defaultdict
+from loguru import logger
+
+
+_MISSING = object()
+
+
+def _same_value(old, new) -> bool:
+    """判断参数新旧值是否相同，相同则无需使缓存失效"""
+    if old is new:
+        return True
+    try:
+        return type(old) is type(new) and bool(old == new)
+    except (TypeError, ValueError):
+        return False
+
+
+class Param:
+    """
+    带依赖追踪的参数描述符
+
+    声明在类上（如 voltage = Param()），实例上的读写与普通属性相同；
+    重新赋值且值发生变化时，调用实例的 _memo.invalidate(参数名)，
+    只清除直接或间接依赖该参数的派生结果。首次赋值（初始化）不触发失效。
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            return instance.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+
+    def __set__(self, instance, value):
+        old = instance.__dict__.get(self.name, _MISSING)
+        instance.__dict__[self.name] = value
+        if old is not _MISSING and not _same_value(old, value):
+            instance._memo.invalidate(self.name)
+
+
+class DependencyMemo:
+    """
+    依赖追踪的派生结果缓存
+
+    每个派生结果以键（字符串或元组）存放，计算时声明它依赖的名称：
+    参数名（如 'voltage'）、数据名（如 'graph'、'node:power'）或其他派生结果的键。
+    invalidate 某个名称时，沿依赖关系逐级清除所有受影响的结果，其余结果保持不变。
+    """
+
+    def __init__(self):
+        # 键 -> 结果
+        self._values = {}
+        # 名称 -> 直接依赖它的派生结果键集合
+        self._dependents = defaultdict(set)
+        # 与其他缓存副本共享的结果键，原地修改前需先复制（见 mutable）
+        self._shared = set()
+        # 命中和重新计算的次数，便于检查缓存效果
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def get(self, key, depends_on, compute):
+        """
+        获取派生结果，不存在时调用 compute() 计算并登记依赖
+
+        参数:
+            key: 派生结果的键
+            depends_on: 可迭代对象，该结果依赖的参数名、数据名或派生结果键
+            compute: 无参可调用对象，返回计算结果
+
+        返回:
+            派生结果
+        """
+        if key in self._values:
+            self.hits += 1
+            return self._values[key]
+        self.misses += 1
+        value = compute()
+        for name in depends_on:
+            self._dependents[name].add(key)
+        self._values[key] = value
+        return value
+
+    def invalidate(self, *names, keep=()):
+        """
+        清除依赖这些名称的所有派生结果（包括间接依赖）
+
+        参数:
+            names: 参数名、数据名或派生结果键
+            keep: 调用方会自行增量更新的派生结果键，保留它们（及依赖它们的结果）和依赖登记
+        """
+        keep = set(keep)
+        stack = list(names)
+        dropped = 0
+        while stack:
+            name = stack.pop()
+            if self._values.pop(name, _MISSING) is not _MISSING:
+                dropped += 1
+                self._shared.discard(name)
+            dependents = self._dependents.pop(name, set())
+            kept = dependents & keep
+            if kept:
+                self._dependents[name] = kept
+                dependents = dependents - kept
+            stack.extend(dependents)
+        if dropped:
+            logger.debug(f"依赖 {names} 变化，清除 {dropped} 项派生结果")
+
+    def copy(self) -> 'DependencyMemo':
+        """
+        复制缓存（结果对象本身共享，不复制），用于派生场景：
+        副本之后的失效和重新计算不影响原缓存，原地修改共享的结果前会先各自复制（见 mutable）
+        """
+        memo = DependencyMemo()
+        memo._values = dict(self._values)
+        for name, dependents in self._dependents.items():
+            memo._dependents[name] = set(dependents)
+        self._shared.update(self._values)
+        memo._shared = set(self._values)
+        return memo
+
+    def mutable(self, key, copier):
+        """
+        获取可以原地修改的派生结果（用于增量更新），依赖登记保持不变
+
+        参数:
+            key: 派生结果的键
+            copier: 复制结果的函数，结果与其他缓存副本共享时先复制一份，避免影响其他副本
+
+        返回:
+            派生结果，不存在时返回 None
+        """
+        value = self._values.get(key, _MISSING)
+        if value is _MISSING:
+            return None
+        if key in self._shared:
+            value = copier(value)
+            self._values[key] = value
+            self._shared.discard(key)
+        return value
+
+    def replace(self, key, value):
+        """替换已存在的派生结果（用于增量更新），依赖登记保持不变；不存在时忽略"""
+        if key in self._values:
+            self._values[key] = value
+            self._shared.discard(key)
+
+    def clear(self):
+        """清除全部派生结果"""
+        self._values.clear()
+        self._dependents.clear()
+        self._shared.clear()
@@ -0,0 +1,210 @@
+import numpy as np
+
+from utils.maxflow import ResidualNetwork
+
+
+# 判断斜率相同、点在直线上时使用的相对误差
+_RTOL = 1e-9
+
+
+def _close(a, b) -> bool:
+    return abs(a - b) <= _RTOL * max(1.0, abs(a), abs(b))
+
+
+class PiecewiseLinear:
+    """
+    定义在区间 [xs[0], xs[-1]] 上的连续分段线性函数
+
+    由严格递增的节点 xs 和对应的函数值 ys 表示，相邻节点之间线性插值。
+    支持与常数或同一区间上的分段线性函数做加减、数乘、逐点取最大/最小，
+    结果仍为精确的分段线性函数（取最大/最小时在交点处插入新的节点），共线的多余节点会被合并。
+    """
+
+    def __init__(self, xs, ys):
+        """
+        参数:
+            xs: 严格递增的节点横坐标，至少两个
+            ys: 节点处的函数值
+        """
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        if xs.ndim != 1 or len(xs) < 2 or xs.shape != ys.shape:
+            raise ValueError("分段线性函数至少需要两个节点，且 xs 与 ys 长度一致")
+        if not np.all(np.diff(xs) > 0):
+            raise ValueError("分段线性函数的节点必须严格递增")
+        self.xs = xs
+        self.ys = ys
+
+    @classmethod
+    def constant(cls, lo: float, hi: float, value: float) -> 'PiecewiseLinear':
+        """区间 [lo, hi] 上的常数函数"""
+        return cls([lo, hi], [value, value])
+
+    @classmethod
+    def linear(cls, lo: float, hi: float, slope: float, intercept: float) -> 'PiecewiseLinear':
+        """区间 [lo, hi] 上的线性函数 slope * x + intercept"""
+        return cls([lo, hi], [slope * lo + intercept, slope * hi + intercept])
+
+    @property
+    def domain(self) -> tuple:
+        """定义域 (lo, hi)"""
+        return float(self.xs[0]), float(self.xs[-1])
+
+    @property
+    def breakpoints(self) -> np.ndarray:
+        """区间内部的拐点（斜率变化处）"""
+        return self.xs[1:-1]
+
+    @property
+    def slopes(self) -> np.ndarray:
+        """各线段的斜率，长度为 len(xs) - 1"""
+        return np.diff(self.ys) / np.diff(self.xs)
+
+    def __call__(self, x):
+        """计算函数值，x 可以是标量或数组（超出定义域时取端点值）"""
+        value = np.interp(x, self.xs, self.ys)
+        return float(value) if np.ndim(value) == 0 else value
+
+    def derivative(self, x, side: str = 'right'):
+        """
+        精确导数
+
+        参数:
+            x: 标量或数组
+            side: 'right' 取右导数，'left' 取左导数；拐点处二者不同，
+                  定义域左端点总是取右导数，右端点总是取左导数
+
+        返回:
+            导数值，形状与 x 相同
+        """
+        slopes = self.slopes
+        search = 'right' if side == 'right' else 'left'
+        segment = np.clip(np.searchsorted(self.xs, x, side=search) - 1, 0, len(slopes) - 1)
+        value = slopes[segment]
+        return float(value) if np.ndim(value) == 0 else value
+
+    def _coerce(self, other) -> 'PiecewiseLinear':
+        if isinstance(other, PiecewiseLinear):
+            if not (_close(other.xs[0], self.xs[0]) and _close(other.xs[-1], self.xs[-1])):
+                raise ValueError(f"定义域不同: {self.domain} 与 {other.domain}")
+            return other
+        return PiecewiseLinear.constant(self.xs[0], self.xs[-1], float(other))
+
+    def _combine(self, other, op, envelope: bool = False) -> 'PiecewiseLinear':
+        """
+        逐点组合两个分段线性函数
+
+        参数:
+            other: 分段线性函数或常数
+            op: 作用在函数值数组上的二元运算
+            envelope: op 是否为取最大/最小，是则在两函数的交点处插入节点
+        """
+        other = self._coerce(other)
+        xs = np.union1d(self.xs, other.xs)
+        if envelope:
+            diff = np.interp(xs, self.xs, self.ys) - np.interp(xs, other.xs, other.ys)
+            d0, d1 = diff[:-1], diff[1:]
+            crossing = np.flatnonzero(d0 * d1 < 0)
+            if len(crossing):
+                t = d0[crossing] / (d0[crossing] - d1[crossing])
+                xs = np.union1d(xs, xs[crossing] + t * (xs[crossing + 1] - xs[crossing]))
+        ys = op(np.interp(xs, self.xs, self.ys), np.interp(xs, other.xs, other.ys))
+        return PiecewiseLinear(xs, ys).simplify()
+
+    def simplify(self) -> 'PiecewiseLinear':
+        """合并共线的相邻线段（在误差范围内斜率相同的内部节点被移除）"""
+        if len(self.xs) <= 2:
+            return self
+        slopes = self.slopes
+        scale = np.maximum(1.0, np.maximum(np.abs(slopes[:-1]), np.abs(slopes[1:])))
+        keep = np.ones(len(self.xs), dtype=bool)
+        keep[1:-1] = np.abs(slopes[1:] - slopes[:-1]) > _RTOL * scale
+        if keep.all():
+            return self
+        return PiecewiseLinear(self.xs[keep], self.ys[keep])
+
+    def maximum(self, other) -> 'PiecewiseLinear':
+        """逐点取最大值"""
+        return self._combine(other, np.maximum, envelope=True)
+
+    def minimum(self, other) -> 'PiecewiseLinear':
+        """逐点取最小值"""
+        return self._combine(other, np.minimum, envelope=True)
+
+    def __add__(self, other):
+        return self._combine(other, np.add)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return self._combine(other, np.subtract)
+
+    def __rsub__(self, other):
+        return self._coerce(other) - self
+
+    def __neg__(self):
+        return PiecewiseLinear(self.xs, -self.ys)
+
+    def __mul__(self, factor):
+        if isinstance(factor, PiecewiseLinear):
+            raise TypeError("两个分段线性函数的乘积不是分段线性函数")
+        return PiecewiseLinear(self.xs, self.ys * float(factor))
+
+    __rmul__ = __mul__
+
+    def __repr__(self):
+        return f"PiecewiseLinear(domain={self.domain}, breakpoints={self.breakpoints.tolist()})"
+
+
+def parametric_max_flow(network: ResidualNetwork, s: int, t: int, segments, use_blocked: bool = False
+                        ) -> PiecewiseLinear:
+    """
+    参数化最大流：求 s 到 t 的最大流关于参数 λ 的精确分段线性函数
+
+    segments 把参数区间分成若干段，每段内各边容量为 alpha + beta * λ（λ 的仿射函数）。
+    每段内最大流等于所有割容量（λ 的仿射函数）的最小值，是凹的分段线性函数，
+    用 Eisner-Severance 方法求其全部拐点：在两端求最大流和对应的最小割得到两条切线，
+    在切线交点处再求一次最大流，函数值等于切线值则交点为拐点，否则以新的最小割为切线递归细分。
+    最大流计算次数与拐点数成正比。
+
+    参数:
+        network: 残量网络，求解时其容量会被原地改写
+        s, t: 源点和汇点的节点索引
+        segments: 列表，元素为 (a, b, alpha, beta)，各段首尾相接、覆盖整个参数区间，
+                  alpha、beta 为按边编号的数组
+        use_blocked: 是否允许使用被屏蔽的边
+
+    返回:
+        PiecewiseLinear，定义域为参数区间
+    """
+    topology = network.topology
+    allowed = np.ones(topology.num_edges, dtype=bool) if use_blocked else ~network.blocked_edges
+
+    points = {}
+    for a, b, alpha, beta in segments:
+        def evaluate(lam):
+            """在 λ 处求最大流，返回 (最大流, 最小割容量的截距, 斜率)"""
+            network.set_capacity(alpha + beta * lam)
+            flow = network.max_flow(s, t, use_blocked=use_blocked)
+            side = np.asarray(network.cut_side(t, use_blocked=use_blocked), dtype=bool)
+            cut = (side[topology.edge_u] != side[topology.edge_v]) & allowed
+            points[lam] = flow
+            return float(alpha[cut].sum()), float(beta[cut].sum())
+
+        stack = [(a, evaluate(a), b, evaluate(b))]
+        while stack:
+            x0, (c0, k0), x1, (c1, k1) = stack.pop()
+            # 两条切线斜率相同（同一个割）时函数在 [x0, x1] 上为线性
+            if _close(k0, k1):
+                continue
+            x = (c1 - c0) / (k0 - k1)
+            if not x0 < x < x1 or _close(x, x0) or _close(x, x1):
+                continue
+            line = evaluate(x)
+            if _close(points[x], c0 + k0 * x):
+                continue
+            stack.append((x0, (c0, k0), x, line))
+            stack.append((x, line, x1, (c1, k1)))
+
+    xs = sorted(points)
+    return PiecewiseLinear(xs, [points[x] for x in xs]).simplify()
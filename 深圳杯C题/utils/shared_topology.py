@@ -0,0 +1,207 @@
+import numpy as np
+from multiprocessing import shared_memory
+from loguru import logger
+
+from utils.topology import CSRTopology
+
+
+def _attach_segment(name: str) -> shared_memory.SharedMemory:
+    """按名称挂载共享内存块；Python 3.13 起不再向资源跟踪进程登记，由发布方负责释放"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+class SharedTopologyHandle:
+    """
+    共享内存拓扑的句柄，可序列化后发送给工作进程
+
+    只包含各共享内存块的名称、dtype 和形状，以及节点ID、边元组等元数据，不包含数组数据本身；
+    发布时 with_ids=False 则不带节点ID和边元组（均为None）。
+    """
+
+    def __init__(self, topology_blocks, column_blocks, node_ids, edge_keys, categories):
+        """
+        参数:
+            topology_blocks: 字典，拓扑数组名 -> (共享内存块名, dtype 字符串, 形状)
+            column_blocks: 字典，属性列名 -> (共享内存块名, dtype 字符串, 形状)
+            node_ids: 节点ID列表，可以为None
+            edge_keys: 边元组列表，可以为None
+            categories: 字典，类别编码列名 -> 编码到原值的列表
+        """
+        self.topology_blocks = topology_blocks
+        self.column_blocks = column_blocks
+        self.node_ids = node_ids
+        self.edge_keys = edge_keys
+        self.categories = categories
+
+
+class SharedTopology:
+    """
+    把 CSR 拓扑和属性列发布到 multiprocessing.shared_memory 中（发布方）
+
+    作为上下文管理器使用，退出时关闭并删除全部共享内存块（/dev/shm 中不残留）：
+
+        with SharedTopology.from_analyzer(analyzer) as shared:
+            with ProcessPoolExecutor(initializer=init, initargs=(shared.handle,)) as executor:
+                ...
+
+    工作进程用 attach(handle) 挂载只读视图，数组直接映射共享内存，不复制。
+    工作进程须在发布方退出上下文之前完成工作。
+    """
+
+    def __init__(self, topology: CSRTopology, columns=None, categories=None, with_ids: bool = True):
+        """
+        参数:
+            topology: CSR 拓扑
+            columns: 字典，属性列名 -> NumPy 数组（如按节点索引对齐的负荷、按边编号对齐的容量）
+            categories: 字典，类别编码列名 -> 编码到原值的列表，随句柄一起发送
+            with_ids: 是否随句柄发送节点ID和边元组；工作进程只按索引计算时（如最大流表）可以不发送，
+                      省去每个进程反序列化ID列表和建立查找字典的开销，挂载后节点ID即节点索引
+        """
+        self._segments = []
+        try:
+            topology_blocks = {name: self._publish(getattr(topology, name)) for name in CSRTopology.ARRAY_FIELDS}
+            column_blocks = {name: self._publish(values) for name, values in (columns or {}).items()}
+        except Exception:
+            self.close()
+            raise
+        node_ids = list(topology.node_ids) if with_ids else None
+        edge_keys = list(topology.edge_keys) if with_ids else None
+        self.handle = SharedTopologyHandle(topology_blocks, column_blocks, node_ids, edge_keys,
+                                           dict(categories or {}))
+        size = sum(segment.size for segment in self._segments)
+        logger.info(f"发布共享内存拓扑: {len(self._segments)} 个数据块, 共 {size} 字节")
+
+    @classmethod
+    def from_analyzer(cls, analyzer) -> 'SharedTopology':
+        """
+        发布 RiskAnalyzer 的拓扑和常用属性列
+
+        属性列（按节点索引或边编号对齐）:
+            power: 节点负荷 (kW)
+            DG: 节点是否含分布式能源
+            type: 节点用户类型编码，编码到原值的列表见 handle.categories['type']
+            edge_capacity: 最大流所用的线路容量 (kW)
+        """
+        topology = analyzer.topology
+        power = np.zeros(topology.num_nodes)
+        node_type = np.full(topology.num_nodes, -1, dtype=np.int64)
+        type_names = []
+        type_codes = {}
+        for node_id, info in analyzer.nodes_info.items():
+            index = topology.index_of(node_id)
+            if index is None:
+                continue
+            power[index] = info.get('power', 0) or 0
+            name = info.get('type')
+            if name is not None:
+                if name not in type_codes:
+                    type_codes[name] = len(type_names)
+                    type_names.append(name)
+                node_type[index] = type_codes[name]
+        columns = {
+            'power': power,
+            'DG': analyzer._node_dg_mask(),
+            'type': node_type,
+            'edge_capacity': analyzer.edge_capacities(),
+        }
+        return cls(topology, columns, categories={'type': type_names})
+
+    def _publish(self, array) -> tuple:
+        """把数组复制到新建的共享内存块中，返回 (块名, dtype 字符串, 形状)"""
+        array = np.ascontiguousarray(array)
+        # 共享内存块大小不能为 0
+        segment = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        self._segments.append(segment)
+        view = np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)
+        view[...] = array
+        del view
+        return segment.name, array.dtype.str, array.shape
+
+    @property
+    def segment_names(self) -> list:
+        """全部共享内存块的名称"""
+        return [segment.name for segment in self._segments]
+
+    def close(self):
+        """关闭并删除全部共享内存块，可重复调用"""
+        for segment in self._segments:
+            segment.close()
+            try:
+                segment.unlink()
+            except FileNotFoundError:
+                pass
+        if self._segments:
+            logger.info(f"释放共享内存拓扑: {len(self._segments)} 个数据块")
+        self._segments = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+class AttachedTopology:
+    """
+    在工作进程中挂载的共享内存拓扑（只读、不复制）
+
+    topology 为数组直接映射共享内存的 CSRTopology，columns 为属性列，数组均不可写。
+    用完后调用 close（或作为上下文管理器使用）；共享内存块由发布方删除。
+    """
+
+    def __init__(self, handle: SharedTopologyHandle):
+        """
+        参数:
+            handle: SharedTopology.handle
+        """
+        self._segments = []
+        self.categories = handle.categories
+        arrays = self._map(handle.topology_blocks)
+        self.columns = self._map(handle.column_blocks)
+        self.topology = CSRTopology.from_arrays(handle.node_ids, handle.edge_keys, arrays)
+
+    def _map(self, blocks) -> dict:
+        """挂载一组共享内存块，返回只读数组"""
+        arrays = {}
+        for name, (segment_name, dtype, shape) in blocks.items():
+            segment = _attach_segment(segment_name)
+            self._segments.append(segment)
+            array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=segment.buf)
+            array.flags.writeable = False
+            arrays[name] = array
+        return arrays
+
+    def close(self):
+        """解除映射，可重复调用；仍有外部引用指向这些数组时保留映射，直到进程退出"""
+        self.topology = None
+        self.columns = {}
+        for segment in self._segments:
+            try:
+                segment.close()
+            except BufferError:
+                logger.warning(f"共享内存块 {segment.name} 仍被引用，进程退出时释放")
+        self._segments = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+def attach(handle: SharedTopologyHandle) -> AttachedTopology:
+    """
+    在当前进程中挂载共享内存拓扑
+
+    参数:
+        handle: SharedTopology.handle
+
+    返回:
+        AttachedTopology 对象
+    """
+    return AttachedTopology(handle)
@@ -2,10 +2,19 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import pandas as pd
 import numpy as np
-from collections import Counter
+from collections import Counter, deque
+import time
+import bisect
+from contextlib import contextmanager
 import networkx as nx
 from loguru import logger
 from typing import Union, Optional
+from utils.topology import CSRTopology, UnionFind
+from utils.attribute_store import AttributeStore
+from utils.hot_log import hot_log
+
+# 迭代器耗尽的哨兵值
+_EXHAUSTED = object()
 
 class UndirectedGraph:
     """
@@ -24,6 +33,24 @@ class UndirectedGraph:
         self.graph_edges = graph_edges
         # 构建邻接表，用于路径查找和连通性检查
         self.adjacency_list = self._build_adjacency_list()
+        # 构建边索引，键为标准化的 (较小节点, 较大节点)，用于 O(1) 查找边
+        self._edge_index = self._build_edge_index()
+        # 最近一次计算的最短路径树缓存 (源点, 前驱字典, 距离字典)，拓扑变化时清空
+        self._path_tree_cache = None
+        # 连通分量索引（并查集），加边时增量合并，删边/删点后置为None，下次查询时重建
+        self._connectivity = None
+        # 图版本号：每次通过本类方法修改节点/边（含属性）时加一，派生结果按版本号缓存
+        self._version = 0
+        # 派生结果缓存，名称 -> (版本号, 结果)
+        self._derived_cache = {}
+        # 列式属性存储，首次查询时构建，拓扑变化时失效
+        self._node_store = None
+        self._edge_store = None
+        # 批量事务状态，不在事务中时为None（见 batch 方法）
+        self._batch = None
+        # 边字典在 graph_edges 中的位置索引（见 _edge_position），首次逐条删除边时构建
+        self._edge_positions = None
+        self._removed_positions = []
         
     def _build_adjacency_list(self):
         """构建邻接表，用于快速查找相邻节点"""
@@ -48,6 +75,164 @@ class UndirectedGraph:
         logger.info("邻接表构建完成")
         return adjacency_list
     
+    @staticmethod
+    def _edge_key(node1, node2):
+        """返回边的标准化键（较小节点ID在前）"""
+        if node1 > node2:
+            return (node2, node1)
+        return (node1, node2)
+    
+    @property
+    def version(self) -> int:
+        """图版本号，每次修改节点或边（含属性）后递增"""
+        return self._version
+    
+    def _bump_version(self):
+        """节点或边（含属性）发生变化时调用，使按版本号缓存的派生结果失效"""
+        self._version += 1
+        self._derived_cache.clear()
+    
+    def _topology_changed(self):
+        """拓扑（节点或边）发生变化时调用，清空依赖拓扑的缓存"""
+        if self._batch is not None:
+            # 记录事务中发生过拓扑变化，提交时才需要重建邻接表和索引
+            self._batch['topology_changed'] = True
+        self._path_tree_cache = None
+        self._node_store = None
+        self._edge_store = None
+        self._bump_version()
+    
+    def _attribute_store(self, attribute_type="node"):
+        """
+        获取节点或边的列式属性存储，必要时重建
+        
+        参数:
+            attribute_type: "node" 或 "edge"
+        """
+        if attribute_type == "node":
+            if self._node_store is None:
+                self._node_store = AttributeStore(self.node_info.items())
+            return self._node_store
+        if self._edge_store is None:
+            self._edge_store = AttributeStore((edge, info) for edge_dict in self.graph_edges
+                                              for edge, info in edge_dict.items())
+        return self._edge_store
+    
+    def _sync_attributes(self, attribute_type, info, attributes):
+        """属性通过本类方法更新后，同步到已构建的列式存储"""
+        store = self._node_store if attribute_type == "node" else self._edge_store
+        if store is not None:
+            for attribute, value in attributes.items():
+                store.set(info, attribute, value)
+    
+    def _cached(self, name, compute):
+        """
+        按图版本号缓存派生结果：版本未变时直接返回上次的结果
+        
+        参数:
+            name: 缓存名称
+            compute: 无参函数，缓存失效时调用以重新计算结果
+        """
+        entry = self._derived_cache.get(name)
+        if entry is not None and entry[0] == self._version:
+            return entry[1]
+        value = compute()
+        self._derived_cache[name] = (self._version, value)
+        return value
+    
+    def refresh(self):
+        """
+        绕过本类方法直接修改了 node_info 或 graph_edges 后调用，
+        重建邻接表和索引，并使所有缓存失效
+        """
+        logger.info("刷新图的邻接表、索引和缓存")
+        self.adjacency_list = self._build_adjacency_list()
+        self._edge_index = self._build_edge_index()
+        self._edge_positions = None
+        self._connectivity = None
+        self._topology_changed()
+    
+    def _node_key(self, node):
+        """
+        连通分量索引中使用的统一节点ID
+        
+        数据中节点信息的键为字符串（如 '1'）而边的端点为整数（如 1），
+        与 CSRTopology 一样按 str(端点) 与节点ID对齐，二者视为同一个节点；不在节点信息中的端点保持原样
+        """
+        if node in self.node_info:
+            return node
+        key = str(node)
+        return key if key in self.node_info else node
+    
+    @staticmethod
+    def _node_forms(node):
+        """同一节点可能出现的ID形式：原值、字符串和整数"""
+        forms = [node, str(node)]
+        try:
+            forms.append(int(node))
+        except (TypeError, ValueError):
+            pass
+        return forms
+    
+    def _adjacency_node(self, node):
+        """节点在邻接表中带有邻居的ID形式（字符串或整数），用于沿邻接表查找路径"""
+        for form in self._node_forms(node):
+            if self.adjacency_list.get(form):
+                return form
+        return node
+    
+    def _get_connectivity(self):
+        """获取连通分量索引（元素为统一后的节点ID，见 _node_key），必要时由邻接表和边索引重建"""
+        if self._connectivity is None:
+            logger.info("构建连通分量索引")
+            connectivity = UnionFind(self._node_key(node) for node in self.adjacency_list)
+            for node1, node2 in self._edge_index:
+                connectivity.union(self._node_key(node1), self._node_key(node2))
+            self._connectivity = connectivity
+        return self._connectivity
+    
+    def _build_edge_index(self):
+        """
+        构建边索引，用于快速查找边
+        
+        返回:
+            字典，键为标准化的边元组，值为 (所在的边字典, 边字典中的原始键)
+        """
+        edge_index = {}
+        for edge_dict in self.graph_edges:
+            for edge in edge_dict:
+                # 重复的边只保留第一次出现的记录，与线性扫描的查找结果一致
+                edge_index.setdefault(self._edge_key(*edge), (edge_dict, edge))
+        return edge_index
+    
+    def _reset_edge_positions(self):
+        """重建边字典的位置索引：id(边字典) -> 在 graph_edges 中的位置"""
+        self._edge_positions = {id(edge_dict): i for i, edge_dict in enumerate(self.graph_edges)}
+        self._removed_positions = []
+    
+    def _edge_position(self, edge_dict):
+        """
+        查找边字典在 graph_edges 中的当前位置，不逐条扫描边列表
+        
+        位置索引记录建立索引时各边字典的位置，之后删除的位置按序记录在 _removed_positions 中，
+        当前位置 = 记录的位置 - 在它之前被删除的边数，查找耗时 O(log k)（k 为索引建立后删除的边数）。
+        删除的边数超过列表长度的 1/8 或索引与列表不一致（如绕过本类方法修改了列表）时重建索引，均摊 O(1)。
+        
+        返回:
+            (当前位置, 记录的位置)，边字典不在列表中时返回 None
+        """
+        if self._edge_positions is None or len(self._removed_positions) > 64 + len(self.graph_edges) // 8:
+            self._reset_edge_positions()
+        for attempt in range(2):
+            original = self._edge_positions.get(id(edge_dict))
+            if original is not None:
+                position = original - bisect.bisect_left(self._removed_positions, original)
+                if position < len(self.graph_edges) and self.graph_edges[position] is edge_dict:
+                    return position, original
+            if attempt == 0:
+                self._reset_edge_positions()
+        return None
+    
     def neighbors(self, node_id: int) -> list[int]:
         """
         获取指定节点的所有邻居节点
@@ -59,11 +244,11 @@ class UndirectedGraph:
             邻居节点ID列表
         """
         if node_id not in self.adjacency_list:
-            logger.error(f"节点 {node_id} 不存在")
-            print(f"节点 {node_id} 不存在")
+            hot_log.error("节点 {} 不存在", node_id)
+            hot_log.echo("节点 {} 不存在", node_id)
             return []
         
-        logger.info(f"获取节点 {node_id} 的邻居: {self.adjacency_list[node_id]}")
+        hot_log.info("获取节点 {} 的邻居: {}", node_id, self.adjacency_list[node_id])
         return self.adjacency_list[node_id]
     
     def get_node_attribute(self, node_id:str, attribute=None):
@@ -79,19 +264,19 @@ class UndirectedGraph:
             如果节点不存在或属性不存在，返回None
         """
         if node_id not in self.node_info:
-            logger.error(f"节点 {node_id} 不存在")
-            print(f"节点 {node_id} 不存在")
+            hot_log.error("节点 {} 不存在", node_id)
+            hot_log.echo("节点 {} 不存在", node_id)
             return None
             
         if attribute is None:
-            logger.info(f"获取节点 {node_id} 的所有属性: {self.node_info[node_id]}")
+            hot_log.info("获取节点 {} 的所有属性: {}", node_id, self.node_info[node_id])
             return self.node_info[node_id]
         elif attribute in self.node_info[node_id]:
-            logger.info(f"获取节点 {node_id} 的属性 '{attribute}': {self.node_info[node_id][attribute]}")
+            hot_log.info("获取节点 {} 的属性 '{}': {}", node_id, attribute, self.node_info[node_id][attribute])
             return self.node_info[node_id][attribute]
         else:
-            logger.error(f"节点 {node_id} 没有属性 '{attribute}'")
-            print(f"节点 {node_id} 没有属性 '{attribute}'")
+            hot_log.error("节点 {} 没有属性 '{}'", node_id, attribute)
+            hot_log.echo("节点 {} 没有属性 '{}'", node_id, attribute)
             return None
     
     def get_edge(self, node1:int, node2:int) -> dict:
@@ -105,16 +290,16 @@ class UndirectedGraph:
             边信息字典，如果边不存在则返回空字典
         """
         # 确保node1 <= node2，因为我们的存储规则是较小节点ID在前
-        if node1 > node2:
-            node1, node2 = node2, node1
+        node1, node2 = self._edge_key(node1, node2)
             
-        # 查询边信息
-        for edge_dict in self.graph_edges:
-            if (node1, node2) in edge_dict:
-                logger.info(f"获取边 ({node1}, {node2}) 信息: {edge_dict[(node1, node2)]}")
-                return edge_dict[(node1, node2)]
+        # 通过边索引查询边信息
+        entry = self._edge_index.get((node1, node2))
+        if entry is not None:
+            edge_dict, edge = entry
+            hot_log.info("获取边 ({}, {}) 信息: {}", node1, node2, edge_dict[edge])
+            return edge_dict[edge]
                 
-        logger.error(f"边 ({node1}, {node2}) 不存在")
+        hot_log.error("边 ({}, {}) 不存在", node1, node2)
         return {}
     
     def get_edge_attribute(self, node1:int, node2:int, attribute=None):
@@ -132,17 +317,17 @@ class UndirectedGraph:
         edge_info = self.get_edge(node1, node2)
         
         if not edge_info:
-            logger.error(f"节点 {node1} 和节点 {node2} 之间没有边")
+            hot_log.error("节点 {} 和节点 {} 之间没有边", node1, node2)
             return None
             
         if attribute is None:
-            logger.info(f"获取边 ({node1}, {node2}) 的所有属性: {edge_info}")
+            hot_log.info("获取边 ({}, {}) 的所有属性: {}", node1, node2, edge_info)
             return edge_info
         elif attribute in edge_info:
-            logger.info(f"获取边 ({node1}, {node2}) 的属性 '{attribute}': {edge_info[attribute]}")
+            hot_log.info("获取边 ({}, {}) 的属性 '{}': {}", node1, node2, attribute, edge_info[attribute])
             return edge_info[attribute]
         else:
-            logger.error(f"边 ({node1}, {node2}) 没有属性 '{attribute}'")
+            hot_log.error("边 ({}, {}) 没有属性 '{}'", node1, node2, attribute)
             return None
     
     def has_edge(self, node1, node2):
@@ -155,8 +340,8 @@ class UndirectedGraph:
         返回:
             布尔值，表示是否存在边
         """
-        result = self.get_edge(node1, node2) != {}
-        logger.info(f"检查边 ({node1}, {node2}) 是否存在: {result}")
+        result = self._edge_key(node1, node2) in self._edge_index
+        hot_log.info("检查边 ({}, {}) 是否存在: {}", node1, node2, result)
         return result
     
     def find_path(self, start_node, end_node):
@@ -171,57 +356,184 @@ class UndirectedGraph:
             如果存在路径，返回节点ID列表；否则返回None
         """
         if start_node not in self.adjacency_list or end_node not in self.adjacency_list:
-            logger.error(f"节点 {start_node} 或节点 {end_node} 不存在")
+            hot_log.error("节点 {} 或节点 {} 不存在", start_node, end_node)
             return None
             
         if start_node == end_node:
-            logger.info(f"起点和终点相同: {start_node}")
+            hot_log.info("起点和终点相同: {}", start_node)
             return [start_node]
             
-        # 广度优先搜索
-        visited = set()
-        queue = [(start_node, [start_node])]  # (当前节点, 路径)
+        # 广度优先搜索，只记录每个节点的前驱，找到终点后沿前驱回溯路径
+        parent = {start_node: None}
+        queue = deque([start_node])
         
         while queue:
-            current, path = queue.pop(0)
-            
-            if current == end_node:
-                logger.info(f"找到路径: {path}")
-                return path
-                
-            if current in visited:
-                continue
-                
-            visited.add(current)
+            current = queue.popleft()
             
             for neighbor in self.adjacency_list[current]:
-                if neighbor not in visited:
-                    queue.append((neighbor, path + [neighbor]))
+                if neighbor not in parent:
+                    parent[neighbor] = current
+                    if neighbor == end_node:
+                        path = self.path_from_tree(parent, end_node)
+                        hot_log.info("找到路径: {}", path)
+                        return path
+                    queue.append(neighbor)
                     
-        logger.error(f"节点 {start_node} 和节点 {end_node} 之间不连通")
+        hot_log.error("节点 {} 和节点 {} 之间不连通", start_node, end_node)
         return None
     
-    def is_connected(self, node1, node2):
+    def shortest_path_tree(self, source):
+        """
+        从源点出发进行一次广度优先搜索，得到到所有可达节点的最短路径树
+        
+        参数:
+            source: 源点ID
+            
+        返回:
+            元组 (predecessors, distances)：
+            predecessors 为字典，键为可达节点ID，值为最短路径上的前驱节点（源点为None）；
+            distances 为字典，键为可达节点ID，值为到源点的跳数。不可达节点不出现在字典中。
+            源点不存在时返回两个空字典
+        """
+        if source not in self.adjacency_list:
+            hot_log.error("节点 {} 不存在", source)
+            return {}, {}
+        
+        cache = self._path_tree_cache
+        if cache is not None and cache[0] == source:
+            return cache[1], cache[2]
+        
+        predecessors = {source: None}
+        distances = {source: 0}
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            next_distance = distances[current] + 1
+            for neighbor in self.adjacency_list[current]:
+                if neighbor not in distances:
+                    predecessors[neighbor] = current
+                    distances[neighbor] = next_distance
+                    queue.append(neighbor)
+        
+        self._path_tree_cache = (source, predecessors, distances)
+        hot_log.info("计算节点 {} 的最短路径树，可达节点数: {}", source, len(distances))
+        return predecessors, distances
+    
+    @staticmethod
+    def path_from_tree(predecessors, target):
+        """
+        根据最短路径树的前驱字典回溯出从源点到目标节点的路径
+        
+        参数:
+            predecessors: shortest_path_tree 返回的前驱字典
+            target: 目标节点ID
+            
+        返回:
+            节点ID列表（从源点到目标节点），目标不可达时返回None
+        """
+        if target not in predecessors:
+            return None
+        path = [target]
+        while predecessors[path[-1]] is not None:
+            path.append(predecessors[path[-1]])
+        path.reverse()
+        return path
+    
+    def is_connected(self, node1, node2, show_path=True):
         """
         检查两个节点是否连通，并打印路径
         
         参数:
             node1, node2: 两个节点的ID
+            show_path: 是否查找并打印连通路径；为False时只查询连通分量索引，复杂度为 O(α(n))
             
         返回:
             布尔值，表示两个节点是否连通
         """
-        path = self.find_path(node1, node2)
+        connectivity = self._get_connectivity()
+        key1, key2 = self._node_key(node1), self._node_key(node2)
+        if key1 not in connectivity or key2 not in connectivity:
+            hot_log.error("节点 {} 或节点 {} 不存在", node1, node2)
+            connected = False
+        else:
+            connected = connectivity.connected(key1, key2)
+        
+        if connected and show_path:
+            # 复用同一源点的最短路径树，对同一源点的多次查询只需一次遍历；
+            # 路径沿邻接表查找，使用节点在边中出现的ID形式
+            predecessors, _ = self.shortest_path_tree(self._adjacency_node(node1))
+            path = self.path_from_tree(predecessors, self._adjacency_node(node2))
+            hot_log.info("节点 {} 和节点 {} 连通，路径: {}", node1, node2, path)
+            hot_log.echo("节点 {} 和节点 {} 连通", node1, node2)
+            hot_log.echo("路径: {}", ' -> '.join(map(str, path)))
+        elif connected:
+            hot_log.info("节点 {} 和节点 {} 连通", node1, node2)
+        else:
+            hot_log.info("节点 {} 和节点 {} 不连通", node1, node2)
+            hot_log.echo("节点 {} 和节点 {} 不连通", node1, node2)
+        return connected
+    
+    def components(self):
+        """
+        获取图的所有连通分量（基于并查集索引）
         
-        if path:
-            logger.info(f"节点 {node1} 和节点 {node2} 连通，路径: {path}")
-            print(f"节点 {node1} 和节点 {node2} 连通")
-            print(f"路径: {' -> '.join(map(str, path))}")
-            return True
+        返回:
+            列表，每个元素是一个连通分量的节点ID列表（字符串键和整数端点表示的同一节点只出现一次，见 _node_key）
+        """
+        components = self._cached('components', lambda: self._get_connectivity().groups())
+        hot_log.info("连通分量数: {}", len(components))
+        return components
+    
+    def islands(self, sources):
+        """
+        列出不包含任何电源节点的孤岛（失电的连通分量）
+        
+        参数:
+            sources: 电源节点ID列表，如变电站节点 [1, 23, 43] 或 ['1', '23', '43']
+        
+        返回:
+            列表，每个元素是一个孤岛的节点ID列表
+        """
+        sources = {self._node_key(source) for source in sources}
+        islands = [comp for comp in self.components() if sources.isdisjoint(comp)]
+        hot_log.info("孤岛数: {}", len(islands))
+        return islands
+    
+    def energized_mask(self, sources, nodes=None):
+        """
+        向量化判断节点是否与任一电源节点连通（是否带电）
+        
+        参数:
+            sources: 电源节点ID列表，如变电站节点 [1, 23, 43] 或 ['1', '23', '43']
+            nodes: 要查询的节点ID列表，为None时查询所有节点（按连通分量索引中的顺序，见 energized_nodes）
+        
+        返回:
+            NumPy 布尔数组，与 nodes 一一对应
+        """
+        connectivity = self._get_connectivity()
+        labels = connectivity.labels()
+        index = connectivity.index
+        source_labels = [labels[index[key]] for key in map(self._node_key, sources) if key in index]
+        if nodes is None:
+            node_labels = labels
         else:
-            logger.info(f"节点 {node1} 和节点 {node2} 不连通")
-            print(f"节点 {node1} 和节点 {node2} 不连通")
-            return False
+            node_labels = np.array([labels[index[key]] if key in index else -1
+                                    for key in map(self._node_key, nodes)], dtype=np.int64)
+        return np.isin(node_labels, source_labels)
+    
+    def energized_nodes(self, sources):
+        """
+        获取与任一电源节点连通的所有节点
+        
+        参数:
+            sources: 电源节点ID列表，如变电站节点 [1, 23, 43] 或 ['1', '23', '43']
+        
+        返回:
+            节点ID列表（统一后的节点ID，见 _node_key）
+        """
+        nodes = self._get_connectivity().items
+        mask = self.energized_mask(sources)
+        return [node for node, energized in zip(nodes, mask.tolist()) if energized]
     
     def print_graph(self):
         """打印整个图的结构：节点属性和边信息"""
@@ -266,13 +578,10 @@ class UndirectedGraph:
         返回:
             节点ID列表
         """
-        matching_nodes = []
-        
-        for node_id, info in self.node_info.items():
-            if attribute in info and info[attribute] == value:
-                matching_nodes.append(node_id)
+        # 由列式存储的哈希索引直接查出，无需扫描所有节点
+        matching_nodes = self._attribute_store("node").find(attribute, value)
                 
-        logger.info(f"查找属性 {attribute}={value} 的节点: {matching_nodes}")
+        hot_log.info("查找属性 {}={} 的节点: {}", attribute, value, matching_nodes)
         return matching_nodes
     
     def find_edges_by_attribute(self, attribute: str, value):
@@ -286,14 +595,9 @@ class UndirectedGraph:
         返回:
             边元组列表 [(node1, node2), ...]
         """
-        matching_edges = []
-        
-        for edge_dict in self.graph_edges:
-            for edge, info in edge_dict.items():
-                if attribute in info and info[attribute] == value:
-                    matching_edges.append(edge)
+        matching_edges = self._attribute_store("edge").find(attribute, value)
                     
-        logger.info(f"查找属性 {attribute}={value} 的边: {matching_edges}")
+        hot_log.info("查找属性 {}={} 的边: {}", attribute, value, matching_edges)
         return matching_edges
     
     def get_all_paths(self, start_node, end_node, max_depth=10):
@@ -309,32 +613,187 @@ class UndirectedGraph:
             路径列表，每个路径是节点ID的列表
         """
         if start_node not in self.adjacency_list or end_node not in self.adjacency_list:
-            logger.error(f"节点 {start_node} 或节点 {end_node} 不存在")
-            print(f"节点 {start_node} 或节点 {end_node} 不存在")
+            hot_log.error("节点 {} 或节点 {} 不存在", start_node, end_node)
+            hot_log.echo("节点 {} 或节点 {} 不存在", start_node, end_node)
             return []
             
-        paths = []
+        paths = list(self.iter_all_paths(start_node, end_node, max_depth=max_depth))
+        hot_log.info("所有路径从 {} 到 {}: {}", start_node, end_node, paths)
+        return paths
+    
+    def iter_all_paths(self, start_node, end_node, max_depth=10, max_paths=None,
+                       max_length=None, time_budget=None, weight='length'):
+        """
+        逐条生成两个节点之间的所有简单路径（迭代式深度优先搜索，不受递归深度限制）
         
-        def dfs(current, path, depth):
-            if depth > max_depth:
-                return
-                
-            if current == end_node:
-                paths.append(path[:])
-                return
-                
-            for neighbor in self.adjacency_list[current]:
-                if neighbor not in path:  # 避免环路
-                    path.append(neighbor)
-                    dfs(neighbor, path, depth + 1)
-                    path.pop()  # 回溯
+        路径按需生成，不会一次性保存全部路径，适合在环网（闭合联络线）中流式枚举候选路径。
         
-        dfs(start_node, [start_node], 0)
-        logger.info(f"所有路径从 {start_node} 到 {end_node}: {paths}")
-        return paths
+        参数:
+            start_node: 起始节点ID
+            end_node: 目标节点ID
+            max_depth: 最大搜索深度（路径边数上限），为None时不限制
+            max_paths: 最多生成的路径条数，为None时不限制
+            max_length: 路径总长度上限（按边属性weight累加），为None时不限制
+            time_budget: 枚举时间上限（秒），超时后停止生成，为None时不限制
+            weight: 计算路径总长度所用的边属性名，缺失时按0计
+            
+        生成:
+            路径（节点ID列表），按深度优先顺序依次生成
+        """
+        if start_node not in self.adjacency_list or end_node not in self.adjacency_list:
+            hot_log.error("节点 {} 或节点 {} 不存在", start_node, end_node)
+            return
+        if max_paths is not None and max_paths <= 0:
+            return
+        
+        if start_node == end_node:
+            yield [start_node]
+            return
+        
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+        count = 0
+        path = [start_node]
+        on_path = {start_node}              # 当前路径上的节点集合，O(1) 判断是否成环
+        path_lengths = [0.0]                # 与 path 对齐的累计长度
+        stack = [iter(self.adjacency_list[start_node])]
+        
+        while stack:
+            if deadline is not None and time.perf_counter() > deadline:
+                hot_log.warning("枚举 {} 到 {} 的路径超过时间上限 {}s，已生成 {} 条", start_node, end_node, time_budget, count)
+                return
+            
+            neighbor = next(stack[-1], _EXHAUSTED)
+            if neighbor is _EXHAUSTED:
+                # 当前节点的邻居已遍历完，回溯
+                stack.pop()
+                on_path.discard(path.pop())
+                path_lengths.pop()
+                continue
+            
+            if neighbor in on_path:
+                continue
+            
+            depth = len(path)               # 加入 neighbor 后的路径边数
+            if max_depth is not None and depth > max_depth:
+                continue
+            
+            total_length = path_lengths[-1]
+            if max_length is not None:
+                entry = self._edge_index.get(self._edge_key(path[-1], neighbor))
+                edge_length = entry[0][entry[1]].get(weight, 0) if entry is not None else 0
+                total_length += edge_length or 0
+                if total_length > max_length:
+                    continue
+            
+            if neighbor == end_node:
+                yield path + [neighbor]
+                count += 1
+                if max_paths is not None and count >= max_paths:
+                    return
+                continue
+            
+            if max_depth is not None and depth == max_depth:
+                # 再向下扩展必然超过最大深度
+                continue
+            
+            path.append(neighbor)
+            on_path.add(neighbor)
+            path_lengths.append(total_length)
+            stack.append(iter(self.adjacency_list[neighbor]))
     
     # =============== 新增功能 ===============
     
+    @contextmanager
+    def batch(self, rollback=True):
+        """
+        批量修改事务，用法: with graph.batch(): ...
+        
+        事务中的删除操作只从边索引中移除边并做记录，不再逐条扫描边列表和邻接表；
+        提交时一次性过滤边列表、重建邻接表和连通分量索引，k 次删除的总代价为 O(k + N + E)。
+        事务中没有增删节点或边（只修改属性）时，提交只更新版本号，邻接表、索引和列式属性存储保持不变。
+        事务中邻接表里已删除的边要到提交时才会移除，边的查询（get_edge、has_edge 等）始终是最新的。
+        嵌套调用时并入最外层事务。
+        
+        参数:
+            rollback: 事务中抛出异常时是否回滚到事务开始前的状态（需要在开始时保存一份快照）；
+                      为False时保留已完成的修改并正常提交
+        """
+        if self._batch is not None:
+            yield self
+            return
+        
+        self._batch = {
+            'removed_edges': set(),
+            'topology_changed': False,
+            'snapshot': self._snapshot() if rollback else None,
+        }
+        try:
+            yield self
+        except BaseException:
+            state, self._batch = self._batch, None
+            if state['snapshot'] is not None:
+                logger.warning("批量修改出错，回滚到事务开始前的状态")
+                self._restore(state['snapshot'])
+            else:
+                self._commit_batch(state)
+            raise
+        else:
+            state, self._batch = self._batch, None
+            self._commit_batch(state)
+    
+    def _commit_batch(self, state):
+        """提交事务：统一过滤边列表，重建邻接表和索引；事务中只修改了属性时只更新版本号"""
+        removed = state['removed_edges']
+        if not removed and not state['topology_changed']:
+            # 没有增删节点或边，邻接表、连通分量索引和列式属性存储都仍然有效
+            self._bump_version()
+            logger.info("提交批量修改，拓扑未变化")
+            return
+        if removed:
+            # 原地过滤，保证与其他对象共享的边列表同步更新
+            self.graph_edges[:] = [edge_dict for edge_dict in self.graph_edges
+                                   if id(edge_dict) not in removed]
+            self._edge_positions = None
+        adjacency_list = self._build_adjacency_list()
+        # 与逐条删除保持一致：边全部被删掉的端点仍保留空的邻接表条目
+        for node_id in self.adjacency_list:
+            adjacency_list.setdefault(node_id, [])
+        self.adjacency_list = adjacency_list
+        self._connectivity = None
+        self._topology_changed()
+        logger.info(f"提交批量修改，删除边数: {len(removed)}")
+    
+    def _snapshot(self):
+        """保存节点和边（含属性字典内容）的快照，用于事务回滚"""
+        nodes = [(node_id, attrs, dict(attrs)) for node_id, attrs in self.node_info.items()]
+        edges = [(edge_dict, [(edge, attrs, dict(attrs)) for edge, attrs in edge_dict.items()])
+                 for edge_dict in self.graph_edges]
+        return nodes, edges
+    
+    def _restore(self, snapshot):
+        """
+        恢复快照：原地还原 node_info、graph_edges 及其中的属性字典，
+        保证与其他对象共享的字典和列表仍然是同一个对象
+        """
+        nodes, edges = snapshot
+        self.node_info.clear()
+        for node_id, attrs, saved in nodes:
+            attrs.clear()
+            attrs.update(saved)
+            self.node_info[node_id] = attrs
+        for edge_dict, items in edges:
+            edge_dict.clear()
+            for edge, attrs, saved in items:
+                attrs.clear()
+                attrs.update(saved)
+                edge_dict[edge] = attrs
+        self.graph_edges[:] = [edge_dict for edge_dict, _ in edges]
+        self._edge_positions = None
+        self.adjacency_list = self._build_adjacency_list()
+        self._edge_index = self._build_edge_index()
+        self._connectivity = None
+        self._topology_changed()
+    
     def add_node(self, node_id, attributes=None):
         """
         添加新节点
@@ -351,8 +810,15 @@ class UndirectedGraph:
             print(f"节点 {node_id} 已存在")
             return False
         
+        if self._connectivity is not None:
+            if any(form in self.adjacency_list for form in self._node_forms(node_id)):
+                # 覆盖了已有的邻接表条目，或与已有的端点表示同一节点，增量维护不再可靠，改为重建
+                self._connectivity = None
+            else:
+                self._connectivity.add(node_id)
         self.node_info[node_id] = attributes or {}
         self.adjacency_list[node_id] = []
+        self._topology_changed()
         logger.info(f"添加节点 {node_id}，属性: {attributes}")
         return True
     
@@ -367,9 +833,11 @@ class UndirectedGraph:
             成功添加的节点数量
         """
         count = 0
-        for node_id, attributes in nodes_dict.items():
-            if self.add_node(node_id, attributes):
-                count += 1
+        # 在事务中执行，边列表过滤、邻接表和索引重建在结束时统一进行一次
+        with self.batch(rollback=False):
+            for node_id, attributes in nodes_dict.items():
+                if self.add_node(node_id, attributes):
+                    count += 1
         
         logger.info(f"批量添加节点，成功数量: {count}")
         print(f"成功添加 {count} 个节点")
@@ -409,10 +877,17 @@ class UndirectedGraph:
         # 添加边信息
         edge_dict = {(node1, node2): attributes or {}}
         self.graph_edges.append(edge_dict)
+        if self._edge_positions is not None:
+            # 记录的位置在所有已记录（含已删除）的位置之后
+            self._edge_positions[id(edge_dict)] = len(self.graph_edges) - 1 + len(self._removed_positions)
+        self._edge_index[(node1, node2)] = (edge_dict, (node1, node2))
         
         # 更新邻接表
         self.adjacency_list[node1].append(node2)
         self.adjacency_list[node2].append(node1)
+        if self._connectivity is not None:
+            self._connectivity.union(self._node_key(node1), self._node_key(node2))
+        self._topology_changed()
         
         logger.info(f"添加边 ({node1}, {node2})，属性: {attributes}")
         return True
@@ -428,15 +903,17 @@ class UndirectedGraph:
             成功添加的边数量
         """
         count = 0
-        for edge in edges_list:
-            if len(edge) == 2:
-                node1, node2 = edge
-                attributes = {}
-            else:
-                node1, node2, attributes = edge
+        # 在事务中执行，边列表过滤、邻接表和索引重建在结束时统一进行一次
+        with self.batch(rollback=False):
+            for edge in edges_list:
+                if len(edge) == 2:
+                    node1, node2 = edge
+                    attributes = {}
+                else:
+                    node1, node2, attributes = edge
             
-            if self.add_edge(node1, node2, attributes):
-                count += 1
+                if self.add_edge(node1, node2, attributes):
+                    count += 1
         
         logger.info(f"批量添加边，成功数量: {count}")
         print(f"成功添加 {count} 条边")
@@ -457,23 +934,33 @@ class UndirectedGraph:
             print(f"节点 {node_id} 不存在")
             return False
         
-        # 删除与该节点相关的所有边
-        edges_to_remove = []
-        for edge_dict in self.graph_edges:
-            for (n1, n2) in edge_dict.keys():
-                if n1 == node_id or n2 == node_id:
-                    edges_to_remove.append(edge_dict)
-        
-        for edge_dict in edges_to_remove:
-            self.graph_edges.remove(edge_dict)
+        # 通过邻接表和边索引找到与该节点相关的所有边并删除
+        edges_to_remove = set()
+        for neighbor in self.adjacency_list.get(node_id, []):
+            entry = self._edge_index.pop(self._edge_key(node_id, neighbor), None)
+            if entry is not None:
+                edges_to_remove.add(id(entry[0]))
         
-        # 从所有邻居的邻接表中删除该节点
-        for neighbor in self.adjacency_list[node_id]:
-            self.adjacency_list[neighbor].remove(node_id)
+        if self._batch is not None:
+            # 事务中只记录待删除的边，提交时统一过滤边列表并重建邻接表
+            self._batch['removed_edges'].update(edges_to_remove)
+        else:
+            if edges_to_remove:
+                # 原地过滤，保证与其他对象共享的边列表同步更新
+                self.graph_edges[:] = [edge_dict for edge_dict in self.graph_edges
+                                       if id(edge_dict) not in edges_to_remove]
+                self._edge_positions = None
+            
+            # 从所有邻居的邻接表中删除该节点
+            for neighbor in self.adjacency_list[node_id]:
+                self.adjacency_list[neighbor].remove(node_id)
         
         # 删除节点信息和邻接表条目
         del self.node_info[node_id]
         del self.adjacency_list[node_id]
+        # 并查集不支持拆分，删除后下次查询时重建
+        self._connectivity = None
+        self._topology_changed()
         
         logger.info(f"删除节点 {node_id} 及其相关边")
         return True
@@ -489,9 +976,11 @@ class UndirectedGraph:
             成功删除的节点数量
         """
         count = 0
-        for node_id in node_ids:
-            if self.remove_node(node_id):
-                count += 1
+        # 在事务中执行，边列表过滤、邻接表和索引重建在结束时统一进行一次
+        with self.batch(rollback=False):
+            for node_id in node_ids:
+                if self.remove_node(node_id):
+                    count += 1
         
         logger.info(f"批量删除节点，成功数量: {count}")
         print(f"成功删除 {count} 个节点")
@@ -508,26 +997,34 @@ class UndirectedGraph:
             布尔值，表示是否成功删除
         """
         # 确保node1 <= node2
-        if node1 > node2:
-            node1, node2 = node2, node1
+        node1, node2 = self._edge_key(node1, node2)
         
-        # 查找并删除边信息
-        edge_dict_to_remove = None
-        for edge_dict in self.graph_edges:
-            if (node1, node2) in edge_dict:
-                edge_dict_to_remove = edge_dict
-                break
-        
-        if edge_dict_to_remove is None:
+        # 通过边索引查找并删除边信息
+        entry = self._edge_index.pop((node1, node2), None)
+        if entry is None:
             logger.error(f"边 ({node1}, {node2}) 不存在")
             print(f"边 ({node1}, {node2}) 不存在")
             return False
         
-        self.graph_edges.remove(edge_dict_to_remove)
-        
-        # 更新邻接表
-        self.adjacency_list[node1].remove(node2)
-        self.adjacency_list[node2].remove(node1)
+        edge_dict_to_remove = entry[0]
+        if self._batch is not None:
+            # 事务中只记录待删除的边，提交时统一过滤边列表并重建邻接表
+            self._batch['removed_edges'].add(id(edge_dict_to_remove))
+        else:
+            # 通过位置索引定位边字典，不逐条扫描边列表
+            found = self._edge_position(edge_dict_to_remove)
+            if found is not None:
+                position, original = found
+                del self.graph_edges[position]
+                del self._edge_positions[id(edge_dict_to_remove)]
+                bisect.insort(self._removed_positions, original)
+            
+            # 更新邻接表（只扫描两个端点的邻居，O(度数)）
+            self.adjacency_list[node1].remove(node2)
+            self.adjacency_list[node2].remove(node1)
+        # 并查集不支持拆分，删除后下次查询时重建
+        self._connectivity = None
+        self._topology_changed()
         
         logger.info(f"删除边 ({node1}, {node2})")
         return True
@@ -543,9 +1040,11 @@ class UndirectedGraph:
             成功删除的边数量
         """
         count = 0
-        for node1, node2 in edges_list:
-            if self.remove_edge(node1, node2):
-                count += 1
+        # 在事务中执行，边列表过滤、邻接表和索引重建在结束时统一进行一次
+        with self.batch(rollback=False):
+            for node1, node2 in edges_list:
+                if self.remove_edge(node1, node2):
+                    count += 1
         
         logger.info(f"批量删除边，成功数量: {count}")
         print(f"成功删除 {count} 条边")
@@ -569,6 +1068,8 @@ class UndirectedGraph:
             return False
         
         self.node_info[node_id][attribute] = value
+        self._sync_attributes("node", self.node_info[node_id], {attribute: value})
+        self._bump_version()
         logger.info(f"更新节点 {node_id} 的属性 {attribute}={value}")
         return True
     
@@ -589,6 +1090,8 @@ class UndirectedGraph:
             return False
         
         self.node_info[node_id].update(attributes)
+        self._sync_attributes("node", self.node_info[node_id], attributes)
+        self._bump_version()
         logger.info(f"批量更新节点 {node_id} 的属性: {attributes}")
         return True
     
@@ -603,9 +1106,11 @@ class UndirectedGraph:
             成功更新的节点数量
         """
         count = 0
-        for node_id, attributes in updates.items():
-            if self.update_node_attributes(node_id, attributes):
-                count += 1
+        # 在事务中执行，只修改属性时提交不重建邻接表和索引，只更新一次版本号
+        with self.batch(rollback=False):
+            for node_id, attributes in updates.items():
+                if self.update_node_attributes(node_id, attributes):
+                    count += 1
         
         logger.info(f"批量更新多个节点属性，成功数量: {count}")
         print(f"成功更新 {count} 个节点的属性")
@@ -624,15 +1129,17 @@ class UndirectedGraph:
             布尔值，表示是否成功更新
         """
         # 确保node1 <= node2
-        if node1 > node2:
-            node1, node2 = node2, node1
-        
-        # 查找边信息
-        for edge_dict in self.graph_edges:
-            if (node1, node2) in edge_dict:
-                edge_dict[(node1, node2)][attribute] = value
-                logger.info(f"更新边 ({node1}, {node2}) 的属性 {attribute}={value}")
-                return True
+        node1, node2 = self._edge_key(node1, node2)
+        
+        # 通过边索引查找边信息
+        entry = self._edge_index.get((node1, node2))
+        if entry is not None:
+            edge_dict, edge = entry
+            edge_dict[edge][attribute] = value
+            self._sync_attributes("edge", edge_dict[edge], {attribute: value})
+            self._bump_version()
+            logger.info(f"更新边 ({node1}, {node2}) 的属性 {attribute}={value}")
+            return True
         
         logger.error(f"边 ({node1}, {node2}) 不存在")
         print(f"边 ({node1}, {node2}) 不存在")
@@ -650,15 +1157,17 @@ class UndirectedGraph:
             布尔值，表示是否成功更新
         """
         # 确保node1 <= node2
-        if node1 > node2:
-            node1, node2 = node2, node1
-        
-        # 查找边信息
-        for edge_dict in self.graph_edges:
-            if (node1, node2) in edge_dict:
-                edge_dict[(node1, node2)].update(attributes)
-                logger.info(f"批量更新边 ({node1}, {node2}) 的属性: {attributes}")
-                return True
+        node1, node2 = self._edge_key(node1, node2)
+        
+        # 通过边索引查找边信息
+        entry = self._edge_index.get((node1, node2))
+        if entry is not None:
+            edge_dict, edge = entry
+            edge_dict[edge].update(attributes)
+            self._sync_attributes("edge", edge_dict[edge], attributes)
+            self._bump_version()
+            logger.info(f"批量更新边 ({node1}, {node2}) 的属性: {attributes}")
+            return True
         
         logger.error(f"边 ({node1}, {node2}) 不存在")
         print(f"边 ({node1}, {node2}) 不存在")
@@ -675,10 +1184,12 @@ class UndirectedGraph:
             成功更新的边数量
         """
         count = 0
-        for update in updates:
-            node1, node2, attributes = update
-            if self.update_edge_attributes(node1, node2, attributes):
-                count += 1
+        # 在事务中执行，只修改属性时提交不重建邻接表和索引，只更新一次版本号
+        with self.batch(rollback=False):
+            for update in updates:
+                node1, node2, attributes = update
+                if self.update_edge_attributes(node1, node2, attributes):
+                    count += 1
         
         logger.info(f"批量更新多条边属性，成功数量: {count}")
         print(f"成功更新 {count} 条边的属性")
@@ -695,12 +1206,12 @@ class UndirectedGraph:
             度数（整数）
         """
         if node_id not in self.adjacency_list:
-            logger.error(f"节点 {node_id} 不存在")
-            print(f"节点 {node_id} 不存在")
+            hot_log.error("节点 {} 不存在", node_id)
+            hot_log.echo("节点 {} 不存在", node_id)
             return 0
         else:
-            logger.info(f"节点 {node_id} 的度: {len(self.adjacency_list[node_id])}")
-            print(f"节点 {node_id} 的度: {len(self.adjacency_list[node_id])}")
+            hot_log.info("节点 {} 的度: {}", node_id, len(self.adjacency_list[node_id]))
+            hot_log.echo("节点 {} 的度: {}", node_id, len(self.adjacency_list[node_id]))
         
         return len(self.adjacency_list[node_id])
     
@@ -711,8 +1222,9 @@ class UndirectedGraph:
         返回:
             字典，键为节点ID，值为度数
         """
-        logger.info("获取所有节点的度")
-        return {node: len(neighbors) for node, neighbors in self.adjacency_list.items()}
+        hot_log.info("获取所有节点的度")
+        return self._cached('degrees', lambda: {node: len(neighbors)
+                                                for node, neighbors in self.adjacency_list.items()})
     
     def get_average_degree(self):
         """
@@ -722,12 +1234,12 @@ class UndirectedGraph:
             平均度（浮点数）
         """
         if not self.node_info:
-            logger.error("节点信息为空，无法计算平均度")
+            hot_log.error("节点信息为空，无法计算平均度")
             return 0
         
         degrees = self.get_all_degrees()
         avg = sum(degrees.values()) / len(degrees)
-        logger.info(f"平均度: {avg}")
+        hot_log.info("平均度: {}", avg)
         return avg
     
     def get_node_attribute_statistics(self, attribute):
@@ -740,13 +1252,9 @@ class UndirectedGraph:
         返回:
             Counter对象，计数每个属性值的出现次数
         """
-        values = []
-        for node_id, info in self.node_info.items():
-            if attribute in info:
-                values.append(info[attribute])
-        
-        logger.info(f"节点属性 {attribute} 的统计: {Counter(values)}")
-        return Counter(values)
+        counts = self._attribute_store("node").counts(attribute)
+        hot_log.info("节点属性 {} 的统计: {}", attribute, counts)
+        return counts
     
     def get_edge_attribute_statistics(self, attribute):
         """
@@ -758,14 +1266,9 @@ class UndirectedGraph:
         返回:
             Counter对象，计数每个属性值的出现次数
         """
-        values = []
-        for edge_dict in self.graph_edges:
-            for edge, info in edge_dict.items():
-                if attribute in info:
-                    values.append(info[attribute])
-        
-        logger.info(f"边属性 {attribute} 的统计: {Counter(values)}")
-        return Counter(values)
+        counts = self._attribute_store("edge").counts(attribute)
+        hot_log.info("边属性 {} 的统计: {}", attribute, counts)
+        return counts
     
     def get_attribute_summary(self, attribute_type="node", attribute=None):
         """
@@ -778,55 +1281,46 @@ class UndirectedGraph:
         返回:
             DataFrame，包含属性统计信息
         """
-        if attribute_type == "node":
-            items = self.node_info.items()
-        else:
-            items = [(edge, info) for edge_dict in self.graph_edges for edge, info in edge_dict.items()]
+        store = self._attribute_store("node" if attribute_type == "node" else "edge")
+        attributes = store.attributes() if attribute is None else [attribute]
         
-        # 收集所有属性名（如果attribute为None）
-        if attribute is None:
-            attributes = set()
-            for _, info in items:
-                attributes.update(info.keys())
-            attributes = list(attributes)
-        else:
-            attributes = [attribute]
-        
-        # 收集数据
+        # 在列上做向量化统计，只统计数值型的取值
         stats = []
         for attr in attributes:
-            values = []
-            for _, info in items:
-                if attr in info:
-                    value = info[attr]
-                    if isinstance(value, (int, float)):
-                        values.append(value)
-            
-            if values:
+            values = store.numeric_values(attr)
+            if len(values):
+                q25, median, q75 = np.percentile(values, [25, 50, 75])
                 stat = {
                     'attribute': attr,
                     'count': len(values),
-                    'mean': np.mean(values),
-                    'std': np.std(values),
-                    'min': np.min(values),
-                    '25%': np.percentile(values, 25),
-                    'median': np.median(values),
-                    '75%': np.percentile(values, 75),
-                    'max': np.max(values)
+                    'mean': values.mean(),
+                    'std': values.std(),
+                    'min': values.min(),
+                    '25%': q25,
+                    'median': median,
+                    '75%': q75,
+                    'max': values.max()
                 }
                 stats.append(stat)
         
         df = pd.DataFrame(stats) if stats else pd.DataFrame()
-        logger.info(f"属性统计摘要: \n{df}")
+        hot_log.info("属性统计摘要: \n{}", df)
         return df
     
     def to_networkx(self):
         """
         转换为NetworkX图对象（用于高级分析和可视化）
         
+        图未修改时（版本号不变）直接返回缓存的同一个对象，请勿直接修改返回的图；
+        如需修改，请先调用其 copy() 方法
+        
         返回:
             NetworkX Graph对象
         """
+        return self._cached('networkx', self._build_networkx)
+    
+    def _build_networkx(self):
+        """构建NetworkX图对象"""
         G = nx.Graph()
         
         # 添加节点和属性
@@ -841,6 +1335,16 @@ class UndirectedGraph:
         logger.info("转换为NetworkX图对象")
         return G
     
+    def to_csr(self):
+        """
+        转换为压缩稀疏行（CSR）拓扑（用于大规模网络的遍历计算）
+        
+        返回:
+            CSRTopology对象，节点为稠密整数索引，边属性按边编号存放在NumPy列中
+        """
+        logger.info("转换为CSR拓扑")
+        return CSRTopology(self.node_info, self.graph_edges)
+    
     def visualize(self, figsize=(10, 8), node_size=300, node_color="skyblue", 
                   edge_color="gray", font_size=10, with_labels=True, 
                   node_attribute=None, edge_attribute=None, title=None):
@@ -1023,14 +1527,15 @@ class UndirectedGraph:
         """
         logger.info("可视化图的各种度量指标")
         G = self.to_networkx()
-        metrics = {}
         
-        # 计算各种中心性指标
+        # 计算各种中心性指标（图未修改时复用上次的计算结果）
         try:
-            metrics['度中心性'] = nx.degree_centrality(G)
-            metrics['介数中心性'] = nx.betweenness_centrality(G)
-            metrics['接近中心性'] = nx.closeness_centrality(G)
-            metrics['特征向量中心性'] = nx.eigenvector_centrality(G, max_iter=1000)
+            metrics = self._cached('centrality', lambda: {
+                '度中心性': nx.degree_centrality(G),
+                '介数中心性': nx.betweenness_centrality(G),
+                '接近中心性': nx.closeness_centrality(G),
+                '特征向量中心性': nx.eigenvector_centrality(G, max_iter=1000),
+            })
             
             # 准备绘图数据
             df = pd.DataFrame(metrics)
@@ -1168,11 +1673,11 @@ class UndirectedGraph:
             return
         
         G = self.to_networkx()
+        # 一次遍历得到起始节点到所有节点的最短路径树，所有目标节点的路径都从中回溯
+        predecessors, path_lengths = self.shortest_path_tree(start_node)
         
         # 如果没有指定目标节点，选择距离最远的几个节点
         if end_nodes is None:
-            # 计算从起始节点到所有其他节点的最短路径长度
-            path_lengths = nx.single_source_shortest_path_length(G, start_node)
             # 按照路径长度排序，选择最远的5个节点（或更少）
             sorted_lengths = sorted(path_lengths.items(), key=lambda x: x[1], reverse=True)
             end_nodes = [node for node, _ in sorted_lengths[:5]]
@@ -1193,14 +1698,14 @@ class UndirectedGraph:
         
         for end_node in end_nodes:
             if end_node in self.node_info and end_node != start_node:
-                try:
-                    path = nx.shortest_path(G, source=start_node, target=end_node)
+                path = self.path_from_tree(predecessors, end_node)
+                if path is not None:
                     paths.append(path)
                     
                     # 收集路径中的边
                     for i in range(len(path) - 1):
                         path_edges.append((path[i], path[i + 1]))
-                except nx.NetworkXNoPath:
+                else:
                     logger.error(f"节点 {start_node} 和节点 {end_node} 之间不连通")
                     print(f"节点 {start_node} 和节点 {end_node} 之间不连通")
         
@@ -1296,14 +1801,23 @@ class UndirectedGraph:
         print(f"节点数据已导出到 {nodes_file}")
         print(f"边数据已导出到 {edges_file}")
     
-    def compute_all_metrics(self):
+    def compute_all_metrics(self, weight=None):
         """
         计算图的所有重要指标，返回分析报告
         
+        参数:
+            weight: 计算直径、半径和平均最短路径长度所用的边权属性名（如 'length'），
+                    为None时按跳数计
+        
         返回:
             字典，包含各种图指标
         """
         logger.info("计算图的所有重要指标")
+        # 图未修改时复用上次的计算结果
+        return dict(self._cached(('metrics', weight), lambda: self._compute_all_metrics(weight)))
+    
+    def _compute_all_metrics(self, weight=None):
+        """计算图的所有重要指标（compute_all_metrics 的实际计算部分）"""
         G = self.to_networkx()
         metrics = {}
         
@@ -1326,27 +1840,12 @@ class UndirectedGraph:
             metrics['平均聚类系数'] = nx.average_clustering(G)
             metrics['图密度'] = nx.density(G)
             
-            # 尝试计算可能会失败的指标
-            try:
-                try:
-                    metrics['直径'] = nx.diameter(G)
-                except nx.NetworkXError:
-                    # If the graph is not connected, calculate the diameter of the largest connected component
-                    largest_cc = max(nx.connected_components(G), key=len)
-                    subgraph = G.subgraph(largest_cc)
-                    metrics['直径 (最大连通分量)'] = nx.diameter(subgraph)
-            except nx.NetworkXError:
-                # 图不连通时会出错
-                largest_cc = max(nx.connected_components(G), key=len)
-                subgraph = G.subgraph(largest_cc)
-                metrics['直径 (最大连通分量)'] = nx.diameter(subgraph)
-            
-            try:
-                metrics['平均最短路径长度'] = nx.average_shortest_path_length(G)
-            except nx.NetworkXError:
-                largest_cc = max(nx.connected_components(G), key=len)
-                subgraph = G.subgraph(largest_cc)
-                metrics['平均最短路径长度 (最大连通分量)'] = nx.average_shortest_path_length(subgraph)
+            # 距离类指标由一次全源距离计算同时得到；图不连通时只针对最大连通分量计算
+            distance_metrics = self.distance_metrics(weight)
+            suffix = '' if metrics['连通分量数'] == 1 else ' (最大连通分量)'
+            metrics['直径' + suffix] = distance_metrics['diameter']
+            metrics['半径' + suffix] = distance_metrics['radius']
+            metrics['平均最短路径长度' + suffix] = distance_metrics['average_path_length']
         
         except Exception as e:
             logger.error(f"计算部分图指标时出错: {e}")
@@ -1354,6 +1853,37 @@ class UndirectedGraph:
         
         return metrics
     
+    def distance_metrics(self, weight=None, chunk_size=256):
+        """
+        计算最大连通分量上的距离类指标：离心率、直径、半径和平均最短路径长度
+        
+        所有指标由一次按源点分块的全源距离计算得到（见 CSRTopology.distance_summary），
+        内存占用随 chunk_size 而不是节点数的平方增长
+        
+        参数:
+            weight: 边权属性名（'length'、'Resistor'、'Reactance'），为None时按跳数计
+            chunk_size: 每块的源点数
+        
+        返回:
+            字典，包含 'eccentricity'（节点ID -> 离心率）、'diameter'、'radius'、'average_path_length'
+        """
+        def compute():
+            # 以邻接表的键为节点集合，与 to_networkx 的节点完全一致
+            topology = CSRTopology(self.adjacency_list, self.graph_edges)
+            labels = topology.component_labels()
+            nodes = np.flatnonzero(labels == np.bincount(labels).argmax())
+            summary = topology.distance_summary(nodes, weight=weight, chunk_size=chunk_size)
+            return {
+                'eccentricity': {topology.node_ids[i]: value for i, value in
+                                 zip(nodes.tolist(), summary['eccentricity'].tolist())},
+                'diameter': summary['diameter'].item(),
+                'radius': summary['radius'].item(),
+                'average_path_length': float(summary['average_path_length']),
+            }
+        
+        logger.info(f"计算距离类指标，边权: {weight}")
+        return self._cached(('distance_metrics', weight), compute)
+    
     def print_metrics_report(self):
         """
         打印图的完整分析报告
@@ -1387,6 +1917,11 @@ class UndirectedGraph:
         elif '直径 (最大连通分量)' in metrics:
             print(f"直径 (最大连通分量): {metrics['直径 (最大连通分量)']}")
         
+        if '半径' in metrics:
+            print(f"半径: {metrics['半径']}")
+        elif '半径 (最大连通分量)' in metrics:
+            print(f"半径 (最大连通分量): {metrics['半径 (最大连通分量)']}")
+        
         if '平均最短路径长度' in metrics:
             print(f"平均最短路径长度: {metrics['平均最短路径长度']:.4f}")
         elif '平均最短路径长度 (最大连通分量)' in metrics:
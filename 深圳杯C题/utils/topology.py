@@ -0,0 +1,669 @@
+import heapq
+import numpy as np
+from collections import deque
+from loguru import logger
+
+
+def _to_float(value) -> float:
+    """将属性值转换为浮点数，无法转换时返回 NaN"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _has_switch(value) -> bool:
+    """判断开关字段是否表示存在开关（数据中用 None / 'None' / '' 表示无开关）"""
+    return value not in [None, 'None', '']
+
+
+class CSRTopology:
+    """
+    压缩稀疏行（CSR）格式的无向图拓扑，适用于大规模配电网的遍历计算
+
+    节点映射为稠密整数索引 0..n-1，邻接关系存放在 NumPy 数组 indptr/indices 中，
+    节点 i 的邻居为 indices[indptr[i]:indptr[i+1]]。每条无向边有一个边编号，
+    边属性按边编号存放在列数组中（length、Resistor、Reactance、开关标记、联络线标记）。
+    每个邻接槽位 s 表示一条有向弧 tail -> indices[s]，arc_edge[s] 为其边编号，
+    arc_reverse[s] 为反向弧的槽位，便于在其上直接实现最大流等残量网络算法。
+    """
+
+    TIE_LINE_TYPE = "馈线间联络线"
+
+    # 构成拓扑的全部 NumPy 数组（边属性列和 CSR 数组），from_arrays 按这些名称接收
+    ARRAY_FIELDS = ('edge_u', 'edge_v', 'length', 'resistor', 'reactance', 'sectional_switch', 'tie_switch',
+                    'tie_line', 'indptr', 'indices', 'arc_edge', 'arc_reverse')
+
+    def __init__(self, node_info, graph_edges):
+        """
+        由节点信息和边信息构建 CSR 拓扑
+
+        参数:
+            node_info: 字典，键为节点ID，值为节点属性字典
+            graph_edges: 列表，包含边信息字典，格式为[{(from_node,to_node):{边信息}}]
+
+        说明:
+            数据中节点信息的键为字符串（如 '1'），而边的端点为整数（如 1），
+            构建时按 str(端点) 与节点ID对齐，两者映射到同一个整数索引。
+        """
+        self.node_ids = list(node_info)
+        self.node_index = {node_id: i for i, node_id in enumerate(self.node_ids)}
+
+        edge_keys = []
+        edge_u = []
+        edge_v = []
+        length = []
+        resistor = []
+        reactance = []
+        sectional_switch = []
+        tie_switch = []
+        tie_line = []
+        for edge_dict in graph_edges:
+            for edge, info in edge_dict.items():
+                node1, node2 = edge
+                edge_keys.append(edge)
+                edge_u.append(self._resolve(node1))
+                edge_v.append(self._resolve(node2))
+                length.append(_to_float(info.get('length')))
+                resistor.append(_to_float(info.get('Resistor')))
+                reactance.append(_to_float(info.get('Reactance')))
+                sectional_switch.append(_has_switch(info.get('分段开关')))
+                tie_switch.append(_has_switch(info.get('联络开关')))
+                tie_line.append(info.get('type') == self.TIE_LINE_TYPE)
+
+        # ---------- 边属性列（按边编号对齐） ----------
+        self.edge_keys = edge_keys
+        self.edge_u = np.asarray(edge_u, dtype=np.int64)
+        self.edge_v = np.asarray(edge_v, dtype=np.int64)
+        self.length = np.asarray(length, dtype=np.float64)
+        self.resistor = np.asarray(resistor, dtype=np.float64)
+        self.reactance = np.asarray(reactance, dtype=np.float64)
+        self.sectional_switch = np.asarray(sectional_switch, dtype=bool)
+        self.tie_switch = np.asarray(tie_switch, dtype=bool)
+        self.tie_line = np.asarray(tie_line, dtype=bool)
+
+        self._build_csr()
+        self._build_edge_lookup()
+
+        logger.info(f"构建CSR拓扑，节点数: {self.num_nodes}, 边数: {self.num_edges}")
+
+    @classmethod
+    def from_arrays(cls, node_ids, edge_keys, arrays) -> 'CSRTopology':
+        """
+        由已编译好的数组构建拓扑，数组不复制（用于挂载共享内存中的拓扑，见 utils.shared_topology）
+
+        参数:
+            node_ids: 节点ID列表，按节点索引排列；为None时节点ID就是节点索引（只按索引使用的拓扑，不建立ID字典）
+            edge_keys: 边元组列表，按边编号排列；为None时为边编号的 range
+            arrays: 字典，包含 ARRAY_FIELDS 中的全部数组
+
+        返回:
+            CSRTopology对象
+        """
+        topology = cls.__new__(cls)
+        for name in cls.ARRAY_FIELDS:
+            setattr(topology, name, arrays[name])
+        if node_ids is None:
+            topology.node_ids = range(len(topology.indptr) - 1)
+            topology.node_index = None
+        else:
+            topology.node_ids = list(node_ids)
+            topology.node_index = {node_id: i for i, node_id in enumerate(topology.node_ids)}
+        topology.edge_keys = range(len(topology.edge_u)) if edge_keys is None else list(edge_keys)
+        topology._lists = None
+        # 边查找字典在第一次按端点查边时才建立
+        topology._edge_lookup = None
+        return topology
+
+    def _build_edge_lookup(self):
+        """标准化的 (较小索引, 较大索引) -> 边编号，重复边保留第一次出现的记录"""
+        self._edge_lookup = {}
+        for e, (u, v) in enumerate(zip(self.edge_u.tolist(), self.edge_v.tolist())):
+            self._edge_lookup.setdefault((u, v) if u <= v else (v, u), e)
+
+    def _resolve(self, node) -> int:
+        """将边端点映射为节点索引，未出现在节点信息中的端点追加为新节点"""
+        index = self.index_of(node)
+        if index is None:
+            index = len(self.node_ids)
+            self.node_ids.append(node)
+            self.node_index[node] = index
+        return index
+
+    def _build_csr(self):
+        """根据边端点数组构建 indptr/indices/arc_edge/arc_reverse"""
+        n = len(self.node_ids)
+        m = len(self.edge_keys)
+        # 每条无向边拆成两条有向弧：弧 2e 为 u->v，弧 2e+1 为 v->u
+        tails = np.empty(2 * m, dtype=np.int64)
+        heads = np.empty(2 * m, dtype=np.int64)
+        tails[0::2], tails[1::2] = self.edge_u, self.edge_v
+        heads[0::2], heads[1::2] = self.edge_v, self.edge_u
+        # 稳定排序保证每个节点的邻居顺序与边的输入顺序一致（与邻接表相同）
+        order = np.argsort(tails, kind='stable')
+        slot_of_arc = np.empty(2 * m, dtype=np.int64)
+        slot_of_arc[order] = np.arange(2 * m, dtype=np.int64)
+
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(tails, minlength=n), out=self.indptr[1:])
+        self.indices = heads[order]
+        self.arc_edge = order // 2
+        self.arc_reverse = slot_of_arc[order ^ 1]
+        self._lists = None
+
+    @property
+    def num_nodes(self) -> int:
+        """节点数"""
+        return len(self.node_ids)
+
+    @property
+    def num_edges(self) -> int:
+        """边数"""
+        return len(self.edge_keys)
+
+    def as_lists(self):
+        """
+        返回 (indptr, indices, arc_edge, arc_reverse) 的 Python 列表副本，
+        供逐元素访问的纯 Python 循环使用（比逐个索引 NumPy 数组快）
+        """
+        if self._lists is None:
+            self._lists = (self.indptr.tolist(), self.indices.tolist(),
+                           self.arc_edge.tolist(), self.arc_reverse.tolist())
+        return self._lists
+
+    def index_of(self, node):
+        """
+        获取节点ID对应的整数索引
+
+        参数:
+            node: 节点ID（字符串或整数均可）
+
+        返回:
+            整数索引，节点不存在时返回None
+        """
+        if self.node_index is None:
+            return node if isinstance(node, (int, np.integer)) and 0 <= node < self.num_nodes else None
+        index = self.node_index.get(node)
+        if index is None:
+            index = self.node_index.get(str(node))
+        return index
+
+    def edge_id(self, node1, node2):
+        """
+        获取两个节点之间边的编号
+
+        参数:
+            node1, node2: 两个节点的ID
+
+        返回:
+            边编号，边不存在时返回None
+        """
+        u, v = self.index_of(node1), self.index_of(node2)
+        if u is None or v is None:
+            return None
+        return self.edge_between(u, v)
+
+    def edge_between(self, u: int, v: int):
+        """
+        按节点索引获取两点之间边的编号（重复边取第一次出现的记录）
+
+        参数:
+            u, v: 两个节点的索引
+
+        返回:
+            边编号，边不存在时返回None
+        """
+        if self._edge_lookup is None:
+            self._build_edge_lookup()
+        return self._edge_lookup.get((u, v) if u <= v else (v, u))
+
+    def neighbor_indices(self, index: int) -> np.ndarray:
+        """获取节点索引的所有邻居索引（数组视图）"""
+        return self.indices[self.indptr[index]:self.indptr[index + 1]]
+
+    def neighbors(self, node_id) -> list:
+        """
+        获取指定节点的所有邻居节点
+
+        参数:
+            node_id: 节点ID
+
+        返回:
+            邻居节点ID列表
+        """
+        index = self.index_of(node_id)
+        if index is None:
+            logger.error(f"节点 {node_id} 不存在")
+            return []
+        return [self.node_ids[i] for i in self.neighbor_indices(index).tolist()]
+
+    def find_path(self, start_node, end_node):
+        """
+        查找两个节点之间的路径（使用广度优先搜索）
+
+        参数:
+            start_node: 起始节点ID
+            end_node: 目标节点ID
+
+        返回:
+            如果存在路径，返回节点ID列表；否则返回None
+        """
+        start, end = self.index_of(start_node), self.index_of(end_node)
+        if start is None or end is None:
+            logger.error(f"节点 {start_node} 或节点 {end_node} 不存在")
+            return None
+
+        indptr, indices, _, _ = self.as_lists()
+        parent = [-1] * self.num_nodes
+        parent[start] = start
+        queue = deque([start])
+        while queue:
+            current = queue.popleft()
+            if current == end:
+                path = [end]
+                while path[-1] != start:
+                    path.append(parent[path[-1]])
+                return [self.node_ids[i] for i in reversed(path)]
+            for s in range(indptr[current], indptr[current + 1]):
+                neighbor = indices[s]
+                if parent[neighbor] == -1:
+                    parent[neighbor] = current
+                    queue.append(neighbor)
+
+        logger.error(f"节点 {start_node} 和节点 {end_node} 之间不连通")
+        return None
+
+    def shortest_path_tree(self, source):
+        """
+        从源点出发进行一次广度优先搜索，得到到所有节点的最短路径树
+
+        参数:
+            source: 源点ID
+
+        返回:
+            元组 (predecessors, distances)，均为长度为节点数的 NumPy 整数数组（按节点索引）：
+            predecessors[i] 为节点 i 在最短路径上的前驱索引（源点的前驱为其自身），
+            distances[i] 为跳数；不可达节点的前驱和距离均为 -1
+        """
+        start = self.index_of(source)
+        n = self.num_nodes
+        predecessors = np.full(n, -1, dtype=np.int64)
+        distances = np.full(n, -1, dtype=np.int64)
+        if start is None:
+            logger.error(f"节点 {source} 不存在")
+            return predecessors, distances
+
+        indptr, indices, _, _ = self.as_lists()
+        pred = [-1] * n
+        dist = [-1] * n
+        pred[start] = start
+        dist[start] = 0
+        queue = deque([start])
+        while queue:
+            current = queue.popleft()
+            next_distance = dist[current] + 1
+            for s in range(indptr[current], indptr[current + 1]):
+                neighbor = indices[s]
+                if dist[neighbor] == -1:
+                    pred[neighbor] = current
+                    dist[neighbor] = next_distance
+                    queue.append(neighbor)
+
+        predecessors[:] = pred
+        distances[:] = dist
+        return predecessors, distances
+
+    def path_from_tree(self, predecessors, target):
+        """
+        根据最短路径树的前驱数组回溯出从源点到目标节点的路径
+
+        参数:
+            predecessors: shortest_path_tree 返回的前驱数组
+            target: 目标节点ID
+
+        返回:
+            节点ID列表（从源点到目标节点），目标不可达时返回None
+        """
+        index = self.index_of(target)
+        if index is None or predecessors[index] == -1:
+            return None
+        path = [index]
+        while predecessors[path[-1]] != path[-1]:
+            path.append(int(predecessors[path[-1]]))
+        return [self.node_ids[i] for i in reversed(path)]
+
+    def multi_source_dijkstra(self, sources, weight='length'):
+        """
+        从多个源点同时出发进行一次 Dijkstra 搜索，得到最短路径森林
+
+        每个节点被划归到距离最近的源点，森林中每棵树以一个源点为根。
+        距离相同时按堆中 (距离, 节点索引) 的顺序确定，结果是确定的。
+
+        参数:
+            sources: 源点ID列表（如所有变电站），不存在的源点会被忽略
+            weight: 边权属性名，None 表示按跳数计
+
+        返回:
+            元组 (nearest, distances, predecessors, predecessor_edges)，均为按节点索引的 NumPy 数组：
+            nearest[i] 为最近源点的索引，distances[i] 为到该源点的最短距离，
+            predecessors[i] 为最短路径上的前驱索引（源点的前驱为其自身），
+            predecessor_edges[i] 为连接前驱的边编号（源点为 -1）；
+            不可达节点的 nearest、predecessors 为 -1，distances 为 inf
+        """
+        n = self.num_nodes
+        column = self._weight_column(weight)
+        weights = column.tolist() if column is not None else [1.0] * self.num_edges
+        indptr, indices, arc_edge, _ = self.as_lists()
+
+        nearest = [-1] * n
+        dist = [float('inf')] * n
+        pred = [-1] * n
+        pred_edge = [-1] * n
+        done = [False] * n
+        heap = []
+        for source in sources:
+            index = self.index_of(source)
+            if index is None:
+                logger.warning(f"源点 {source} 不存在，已忽略")
+                continue
+            if nearest[index] == -1:
+                nearest[index] = index
+                dist[index] = 0.0
+                pred[index] = index
+                heap.append((0.0, index))
+        heapq.heapify(heap)
+
+        while heap:
+            d, current = heapq.heappop(heap)
+            if done[current]:
+                continue
+            done[current] = True
+            root = nearest[current]
+            for s in range(indptr[current], indptr[current + 1]):
+                neighbor = indices[s]
+                if done[neighbor]:
+                    continue
+                edge = arc_edge[s]
+                candidate = d + weights[edge]
+                if candidate < dist[neighbor]:
+                    dist[neighbor] = candidate
+                    nearest[neighbor] = root
+                    pred[neighbor] = current
+                    pred_edge[neighbor] = edge
+                    heapq.heappush(heap, (candidate, neighbor))
+
+        return (np.asarray(nearest, dtype=np.int64), np.asarray(dist, dtype=np.float64),
+                np.asarray(pred, dtype=np.int64), np.asarray(pred_edge, dtype=np.int64))
+
+    @staticmethod
+    def tree_depths(predecessors) -> np.ndarray:
+        """
+        计算最短路径树（森林）中每个节点到树根的跳数
+
+        使用指针跳跃（list ranking），每轮所有节点的祖先指针同时跳两倍距离，
+        共 O(log 深度) 轮向量化运算。
+
+        参数:
+            predecessors: 前驱数组（树根的前驱为其自身，不在树中的节点为 -1）
+
+        返回:
+            NumPy 整数数组，树根为 0，不在树中的节点为 -1
+        """
+        predecessors = np.asarray(predecessors, dtype=np.int64)
+        in_tree = predecessors >= 0
+        index = np.arange(len(predecessors))
+        jump = np.where(in_tree, predecessors, index)
+        depth = (jump != index).astype(np.int64)
+        while True:
+            next_jump = jump[jump]
+            if np.array_equal(next_jump, jump):
+                break
+            depth += depth[jump]
+            jump = next_jump
+        depth[~in_tree] = -1
+        return depth
+
+    @staticmethod
+    def subtree_sums(predecessors, values) -> np.ndarray:
+        """
+        计算最短路径树（森林）中每个节点子树内 values 的总和
+
+        按深度从深到浅逐层把子树和累加到前驱上（逆拓扑序），总工作量 O(N)。
+
+        参数:
+            predecessors: 前驱数组（树根的前驱为其自身，不在树中的节点为 -1）
+            values: 按节点索引的数值数组
+
+        返回:
+            NumPy 浮点数组，不在树中的节点保持其自身的值
+        """
+        predecessors = np.asarray(predecessors, dtype=np.int64)
+        sums = np.array(values, dtype=np.float64)
+        depth = CSRTopology.tree_depths(predecessors)
+        nodes = np.flatnonzero(depth > 0)
+        if len(nodes) == 0:
+            return sums
+        order = nodes[np.argsort(-depth[nodes], kind='stable')]
+        bounds = np.flatnonzero(np.diff(depth[order])) + 1
+        for level in np.split(order, bounds):
+            np.add.at(sums, predecessors[level], sums[level])
+        return sums
+
+    def component_labels(self) -> np.ndarray:
+        """
+        计算每个节点所属连通分量的标签
+
+        返回:
+            NumPy 整数数组（按节点索引），同一连通分量的节点标签相同
+        """
+        connectivity = UnionFind(range(self.num_nodes))
+        for u, v in zip(self.edge_u.tolist(), self.edge_v.tolist()):
+            connectivity.union(u, v)
+        return connectivity.labels()
+
+    def _weight_column(self, weight):
+        """获取距离计算所用的边权列，weight 为 None 时返回 None（按跳数计）"""
+        if weight is None:
+            return None
+        columns = {'length': self.length, 'Resistor': self.resistor, 'Reactance': self.reactance}
+        if weight not in columns:
+            raise ValueError(f"不支持的边权属性: {weight}，可选: {list(columns)}")
+        column = columns[weight]
+        if np.isnan(column).any() or (column < 0).any():
+            raise ValueError(f"边属性 {weight} 存在缺失值或负值，无法作为距离权重")
+        return column
+
+    def distance_blocks(self, sources=None, weight=None, chunk_size=256):
+        """
+        按源点分块计算全源最短距离矩阵，每次只在内存中保留 chunk_size 行
+
+        无权时按层同步的广度优先搜索在 NumPy 数组上同时推进一块源点的前沿；
+        按边权计算时使用同样按块向量化的 Bellman-Ford 松弛。
+
+        参数:
+            sources: 源点索引数组，为None时为所有节点
+            weight: 边权属性名（'length'、'Resistor'、'Reactance'），为None时按跳数计
+            chunk_size: 每块的源点数，控制内存占用（约 chunk_size × 2E 字节）
+
+        生成:
+            元组 (block_sources, block_distances)：block_distances 形状为
+            (len(block_sources), 节点数)，不可达为 np.inf
+        """
+        n = self.num_nodes
+        if sources is None:
+            sources = np.arange(n, dtype=np.int64)
+        sources = np.asarray(sources, dtype=np.int64)
+        weights = self._weight_column(weight)
+
+        # 只对有邻居的节点做分段归约：节点 v 的分段为其邻接槽位 [indptr[v], indptr[v+1])
+        has_neighbors = np.diff(self.indptr) > 0
+        targets = np.flatnonzero(has_neighbors)
+        starts = self.indptr[:-1][has_neighbors]
+        arc_weights = None if weights is None else weights[self.arc_edge]
+
+        for begin in range(0, len(sources), chunk_size):
+            block = sources[begin:begin + chunk_size]
+            rows = np.arange(len(block))
+            distances = np.full((len(block), n), np.inf)
+            distances[rows, block] = 0.0
+            if len(targets) == 0:
+                yield block, distances
+                continue
+
+            if arc_weights is None:
+                frontier = np.zeros((len(block), n), dtype=bool)
+                frontier[rows, block] = True
+                level = 0
+                while True:
+                    level += 1
+                    reached = np.zeros_like(frontier)
+                    reached[:, targets] = np.logical_or.reduceat(frontier[:, self.indices], starts, axis=1)
+                    frontier = reached & np.isinf(distances)
+                    if not frontier.any():
+                        break
+                    distances[frontier] = level
+            else:
+                while True:
+                    relaxed = np.minimum.reduceat(distances[:, self.indices] + arc_weights, starts, axis=1)
+                    improved = relaxed < distances[:, targets]
+                    if not improved.any():
+                        break
+                    distances[:, targets] = np.where(improved, relaxed, distances[:, targets])
+
+            yield block, distances
+
+    def distance_summary(self, nodes=None, weight=None, chunk_size=256):
+        """
+        一次全源距离计算同时得到离心率、直径、半径和平均最短路径长度
+
+        参数:
+            nodes: 参与统计的节点索引数组（通常为一个连通分量），为None时为所有节点；
+                   距离只在这些节点之间统计，不可达的节点对不计入
+            weight: 边权属性名，为None时按跳数计
+            chunk_size: 每块的源点数
+
+        返回:
+            字典，包含 'nodes'（节点索引数组）、'eccentricity'（与 nodes 对齐的离心率数组）、
+            'diameter'、'radius'、'average_path_length'
+        """
+        if nodes is None:
+            nodes = np.arange(self.num_nodes, dtype=np.int64)
+        nodes = np.asarray(nodes, dtype=np.int64)
+        eccentricity = np.zeros(len(nodes))
+        total = 0.0
+        pairs = 0
+        position = 0
+        for block, distances in self.distance_blocks(nodes, weight=weight, chunk_size=chunk_size):
+            sub = distances[:, nodes]
+            finite = np.isfinite(sub)
+            eccentricity[position:position + len(block)] = np.where(finite, sub, 0.0).max(axis=1, initial=0.0)
+            total += sub[finite].sum()
+            pairs += int(finite.sum()) - len(block)     # 去掉到自身的距离
+            position += len(block)
+
+        if weight is None:
+            eccentricity = eccentricity.astype(np.int64)
+        return {
+            'nodes': nodes,
+            'eccentricity': eccentricity,
+            'diameter': eccentricity.max() if len(nodes) else 0,
+            'radius': eccentricity.min() if len(nodes) else 0,
+            'average_path_length': total / pairs if pairs else 0.0,
+        }
+
+
+class UnionFind:
+    """
+    并查集（按秩合并 + 路径压缩），用于维护图的连通分量
+
+    元素可以是任意可哈希的节点ID，内部映射为稠密整数索引，
+    连通分量标签可以一次性向量化地计算出来。
+    """
+
+    def __init__(self, items=()):
+        """
+        初始化并查集
+
+        参数:
+            items: 初始元素（每个元素各自成为一个分量）
+        """
+        self.index = {}
+        self.items = []
+        self.parent = []
+        self.rank = []
+        for item in items:
+            self.add(item)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, item):
+        return item in self.index
+
+    def add(self, item) -> int:
+        """添加元素（已存在时不做任何操作），返回其整数索引"""
+        i = self.index.get(item)
+        if i is None:
+            i = len(self.items)
+            self.index[item] = i
+            self.items.append(item)
+            self.parent.append(i)
+            self.rank.append(0)
+        return i
+
+    def _find(self, i: int) -> int:
+        parent = self.parent
+        root = i
+        while parent[root] != root:
+            root = parent[root]
+        # 路径压缩
+        while parent[i] != root:
+            parent[i], i = root, parent[i]
+        return root
+
+    def find(self, item) -> int:
+        """返回元素所在分量的根索引"""
+        return self._find(self.index[item])
+
+    def union(self, a, b) -> bool:
+        """合并两个元素所在的分量，若原本已在同一分量则返回False"""
+        ra, rb = self._find(self.add(a)), self._find(self.add(b))
+        if ra == rb:
+            return False
+        if self.rank[ra] < self.rank[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        if self.rank[ra] == self.rank[rb]:
+            self.rank[ra] += 1
+        return True
+
+    def connected(self, a, b) -> bool:
+        """判断两个元素是否在同一分量中"""
+        return self.find(a) == self.find(b)
+
+    def labels(self) -> np.ndarray:
+        """
+        向量化计算所有元素的分量标签（根索引），按元素索引对齐
+
+        返回:
+            NumPy 整数数组，labels[i] 为第 i 个元素所在分量的根索引
+        """
+        labels = np.asarray(self.parent, dtype=np.int64)
+        # 指针跳跃：反复令 labels = labels[labels]，直到每个元素都直接指向根
+        while True:
+            grand = labels[labels]
+            if np.array_equal(grand, labels):
+                return labels
+            labels = grand
+
+    def groups(self) -> list:
+        """
+        返回所有分量
+
+        返回:
+            列表，每个元素是一个分量的元素列表；分量按其首个元素的加入顺序排列
+        """
+        groups = {}
+        for item, label in zip(self.items, self.labels().tolist()):
+            groups.setdefault(label, []).append(item)
+        return list(groups.values())